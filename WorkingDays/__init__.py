@@ -18,6 +18,24 @@ FUNCTIONS:
     setSortValue(str)
     dateSort(DictObj)
     dateBucketing(startDT, interval, endDT=datetime.utcnow().strftime("%Y%m%d"))
+    epoch_dates(timestamps, returns="date")
+    epoch_datetimes(timestamps)
+    epoch_split(timestamps)
+
+CLASSES:
+    BusinessCalendar(holidays=(), weekmask=None)
+    Weekmask(weekmask="1111100")
+    FiscalCalendar(**kwargs)
+
+MODULES:
+    date_utilities
+    vectorized (optional numpy batch functions)
+    adapters (optional pandas Series / pyarrow array adapters)
+    calendar_file (memory-mappable compiled calendars)
+    bulk (process-pool transform of delimited files)
+    holiday_rules (rule-based lazily generated holidays)
+    loaders (cached CSV / iCalendar / JSON holiday file loaders)
+    cli ("workingdays" console script)
 
 MISC VARIABLES:
     __version__
@@ -28,9 +46,10 @@ from ._version import version as __version__
 __all__ = ["workingdays", "_version"]
 
 
-def main():  # pragma: no cover
-    printVersion = "version: {}"
-    print(printVersion.format(__version__))
+def main(argv=None):  # pragma: no cover
+    from .cli import main as cli
+
+    return cli(argv)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,5 @@
+import sys
+
+from WorkingDays.cli import main
+
+sys.exit(main())
@@ -0,0 +1,301 @@
+"""
+    pandas Series and pyarrow array adapters of the "vectorized" workday
+    functions.
+
+    The values are converted to a datetime64[D] (int64 day) array, zero-copy
+    where the container layout allows it, run through the numpy engine and
+    returned in the same container type with the nulls preserved:
+
+        pandas.Series        -> pandas.Series (datetime64[ns] / Int64),
+                                same index and name
+        pyarrow.Array        -> pyarrow.Array (date32 / int64)
+        pyarrow.ChunkedArray -> pyarrow.ChunkedArray
+        anything else        -> numpy array (same as "vectorized")
+
+    pandas and pyarrow are optional: they are never imported by the core
+    modules and only imported here when a pandas or pyarrow value is passed.
+    Offsets and comparison dates are matched by position (no index
+    alignment); a null offset gives a null result.
+
+FUNCTIONS:
+    workday_many(values, offsets, holidays=[], weekmask=None)
+    workday_start_many(values, offsets, holidays=[], weekmask=None)
+    networkdays_many(values, comparedates, holidays=[], signed=False,
+                     weekmask=None)
+    last_workday_of_month_many(values, holidays=[], weekmask=None)
+    last_workday_of_qtr_many(values, holidays=[], weekmask=None, **kwargs)
+
+USAGE:
+    >>> from WorkingDays import adapters
+    >>> df["due"] = adapters.workday_many(df["created"], 5, holidays=cal)
+
+"""
+
+from WorkingDays import vectorized
+from WorkingDays.date_utilities import MS_PER_DAY
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# units of a pyarrow timestamp per day
+_UNITS_PER_DAY = {
+    "s": MS_PER_DAY // 1000,
+    "ms": MS_PER_DAY,
+    "us": MS_PER_DAY * 1000,
+    "ns": MS_PER_DAY * 1000000,
+}
+
+
+def _pandas():
+    import pandas
+
+    return pandas
+
+
+def _pyarrow():
+    import pyarrow
+
+    return pyarrow
+
+
+def _library(values):
+    # -------------------------------------------------------------------------
+    # "pandas", "pyarrow" or None, from the type's module so neither library
+    # is imported to check
+    # -------------------------------------------------------------------------
+    library = type(values).__module__.split(".", 1)[0]
+    return library if library in ("pandas", "pyarrow") else None
+
+
+class _Column(object):
+    # -------------------------------------------------------------------------
+    # datetime64[D] days of the input, its null mask (or None) and what is
+    # needed to rebuild the same container
+    # -------------------------------------------------------------------------
+    __slots__ = ("kind", "days", "mask", "index", "name")
+
+    def __init__(self, kind, days, mask=None, index=None, name=None):
+        self.kind = kind
+        self.days = days
+        self.mask = mask
+        self.index = index
+        self.name = name
+
+
+def _fillNulls(days, mask):
+    # null slots hold 1970-01-01 so the engine never sees NaT or garbage
+    if mask is not None:
+        days[mask] = np.datetime64(0, "D")
+    return days
+
+
+def _parseDays(values, mask):
+    # -------------------------------------------------------------------------
+    # parse the non-null values of an object/string array one by one
+    # -------------------------------------------------------------------------
+    days = np.zeros(len(values), dtype="datetime64[D]")
+    valid = slice(None) if mask is None else ~mask
+    if len(values):
+        days[valid] = vectorized.toDays(values[valid])
+    return days
+
+
+def _fromPandas(series):
+    pd = _pandas()
+    if not isinstance(series, pd.Series):
+        raise TypeError(
+            "expected a pandas Series, got {}".format(type(series).__name__)
+        )
+    mask = series.isna().to_numpy()
+    mask = mask if mask.any() else None
+    if isinstance(series.dtype, getattr(pd, "ArrowDtype", ())):
+        column = _fromArrow(_pyarrow().array(series.array))
+        days = column.days
+    elif series.dtype.kind == "M" or hasattr(series.dtype, "tz"):
+        # ---------------------------------------------------------------------
+        # datetime64 (view of the Series data) -> days; tz-aware values use
+        # their local wall-clock date
+        # ---------------------------------------------------------------------
+        if getattr(series.dtype, "tz", None) is not None:
+            series = series.dt.tz_localize(None)
+        days = _fillNulls(series.to_numpy().astype("datetime64[D]"), mask)
+    else:
+        days = _parseDays(series.to_numpy(dtype=object), mask)
+    return _Column("pandas", days, mask, series.index, series.name)
+
+
+def _fromArrow(array):
+    pa = _pyarrow()
+    kind = "arrow"
+    if isinstance(array, pa.ChunkedArray):
+        kind = "chunked"
+        array = array.combine_chunks()
+    if not isinstance(array, pa.Array):
+        raise TypeError("expected a pyarrow Array, got {}".format(type(array).__name__))
+    mask = None
+    if array.null_count:
+        mask = array.is_null().to_numpy(zero_copy_only=False)
+    arrowtype = array.type
+    if pa.types.is_date32(arrowtype):
+        # ---------------------------------------------------------------------
+        # int32 days since 1970-01-01: read the data buffer without a copy
+        # ---------------------------------------------------------------------
+        data = np.frombuffer(
+            array.buffers()[1], dtype="<i4", count=array.offset + len(array)
+        )[array.offset :]
+        days = _fillNulls(data.astype("datetime64[D]"), mask)
+    elif pa.types.is_date64(arrowtype) or pa.types.is_timestamp(arrowtype):
+        if pa.types.is_date64(arrowtype):
+            perday = MS_PER_DAY
+        else:
+            perday = _UNITS_PER_DAY[arrowtype.unit]
+            if arrowtype.tz is not None:
+                import pyarrow.compute
+
+                array = pyarrow.compute.local_timestamp(array)
+        data = array.cast(pa.int64()).fill_null(0).to_numpy()
+        days = np.floor_divide(data, perday).astype("datetime64[D]")
+    elif pa.types.is_string(arrowtype) or pa.types.is_large_string(arrowtype):
+        days = _parseDays(array.to_numpy(zero_copy_only=False), mask)
+    else:
+        raise TypeError("unsupported pyarrow type {}".format(arrowtype))
+    return _Column(kind, days, mask)
+
+
+def _toColumn(values):
+    library = _library(values)
+    if library == "pandas":
+        return _fromPandas(values)
+    if library == "pyarrow":
+        return _fromArrow(values)
+    return _Column("numpy", vectorized.toDays(values))
+
+
+def _toOffsets(offsets):
+    # -------------------------------------------------------------------------
+    # int64 offsets and their null mask (scalars and numpy pass through)
+    # -------------------------------------------------------------------------
+    library = _library(offsets)
+    if library == "pandas":
+        mask = offsets.isna().to_numpy()
+        return offsets.fillna(0).to_numpy(dtype="int64"), mask
+    if library == "pyarrow":
+        mask = offsets.is_null().to_numpy(zero_copy_only=False)
+        return offsets.fill_null(0).to_numpy(zero_copy_only=False), mask
+    return np.asarray(offsets, dtype="int64"), None
+
+
+def _nulls(*masks):
+    masks = [mask for mask in masks if mask is not None and mask.any()]
+    if not masks:
+        return None
+    return np.logical_or.reduce(np.broadcast_arrays(*masks))
+
+
+def _fromColumn(column, result, mask):
+    # -------------------------------------------------------------------------
+    # rebuild the input container: datetime64[D] results become dates,
+    # int64 results counts
+    # -------------------------------------------------------------------------
+    isdate = result.dtype.kind == "M"
+    if column.kind == "numpy":
+        return result
+    if column.kind == "pandas":
+        pd = _pandas()
+        if isdate:
+            values = result.astype("datetime64[ns]")
+            if mask is not None:
+                values[mask] = np.datetime64("NaT")
+        else:
+            if mask is None:
+                mask = np.zeros(len(result), dtype=bool)
+            values = pd.arrays.IntegerArray(result.astype("int64"), mask)
+        return pd.Series(values, index=column.index, name=column.name)
+    pa = _pyarrow()
+    if isdate:
+        values = result.astype("int64").astype("int32")
+        array = pa.array(values, mask=mask).cast(pa.date32())
+    else:
+        array = pa.array(result.astype("int64"), mask=mask)
+    if column.kind == "chunked":
+        return pa.chunked_array([array])
+    return array
+
+
+def workday_many(values, offsets, holidays=[], weekmask=None):
+    """
+    FUNCTION: workday_many
+
+    DESCRIPTION:
+        "vectorized.workday_many" of a pandas Series or pyarrow array,
+        returned in the same container with nulls preserved.
+
+    EXAMPLES:
+        >>> workday_many(pd.Series(pd.to_datetime(["2020-07-02", None])), 3)
+        0   2020-07-07
+        1          NaT
+        dtype: datetime64[ns]
+    """
+    column = _toColumn(values)
+    offsets, offsetmask = _toOffsets(offsets)
+    result = vectorized.workday_many(column.days, offsets, holidays, weekmask)
+    return _fromColumn(column, result, _nulls(column.mask, offsetmask))
+
+
+def workday_start_many(values, offsets, holidays=[], weekmask=None):
+    """
+    FUNCTION: workday_start_many
+
+    DESCRIPTION:
+        "vectorized.workday_start_many" of a pandas Series or pyarrow array.
+    """
+    column = _toColumn(values)
+    offsets, offsetmask = _toOffsets(offsets)
+    result = vectorized.workday_start_many(column.days, offsets, holidays, weekmask)
+    return _fromColumn(column, result, _nulls(column.mask, offsetmask))
+
+
+def networkdays_many(values, comparedates, holidays=[], signed=False, weekmask=None):
+    """
+    FUNCTION: networkdays_many
+
+    DESCRIPTION:
+        "vectorized.networkdays_many" of pandas Series or pyarrow arrays:
+        an Int64 Series / int64 array, null where either date is null.
+    """
+    column = _toColumn(values)
+    compare = _toColumn(comparedates)
+    result = vectorized.networkdays_many(
+        column.days, compare.days, holidays, signed=signed, weekmask=weekmask
+    )
+    return _fromColumn(column, result, _nulls(column.mask, compare.mask))
+
+
+def last_workday_of_month_many(values, holidays=[], weekmask=None):
+    """
+    FUNCTION: last_workday_of_month_many
+
+    DESCRIPTION:
+        "vectorized.last_workday_of_month_many" of a pandas Series or
+        pyarrow array.
+    """
+    column = _toColumn(values)
+    result = vectorized.last_workday_of_month_many(column.days, holidays, weekmask)
+    return _fromColumn(column, result, column.mask)
+
+
+def last_workday_of_qtr_many(values, holidays=[], weekmask=None, **kwargs):
+    """
+    FUNCTION: last_workday_of_qtr_many
+
+    DESCRIPTION:
+        "vectorized.last_workday_of_qtr_many" (same Q1-Q4 / fiscal= kwargs)
+        of a pandas Series or pyarrow array.
+    """
+    column = _toColumn(values)
+    result = vectorized.last_workday_of_qtr_many(
+        column.days, holidays, weekmask, **kwargs
+    )
+    return _fromColumn(column, result, column.mask)
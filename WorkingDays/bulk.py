@@ -0,0 +1,335 @@
+"""
+    Process-pool bulk transform of one date column of a delimited text file.
+
+    The input is split into byte ranges aligned to line boundaries, every
+    range is transformed in a ProcessPoolExecutor worker and the results are
+    written to the output in input order.
+
+    Fields are split on the delimiter as-is (no CSV quoting rules), so the
+    transformed column and the delimiter must not appear inside quotes.
+
+FUNCTIONS:
+    chunkRanges(path, chunksize, skipheader=False)
+    transformFile(inpath, outpath, column, operation="dateCleanup", **options)
+    main(argv=None)
+
+USAGE:
+    python -m WorkingDays.bulk INPUT OUTPUT --column 2 --operation workday
+        --offset 5 --holidays holidays.txt --workers 8 --chunk-size 64M
+
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from WorkingDays.date_utilities import BusinessCalendar, dateCleanup, _calendar
+from WorkingDays import loaders
+from WorkingDays.holiday_rules import RuleCalendar
+
+OPERATIONS = (
+    "dateCleanup",
+    "workday",
+    "workdayStart",
+    "lastWorkdayOfMonth",
+    "lastWorkdayOfQtr",
+)
+ERRORS = ("raise", "keep", "empty")
+
+# -----------------------------------------------------------------------------
+# per-worker state (set once by "_initWorker")
+# -----------------------------------------------------------------------------
+_workerCalendar = None
+
+
+def chunkRanges(path, chunksize, skipheader=False):
+    """
+    FUNCTION: chunkRanges
+
+    DESCRIPTION:
+        Returns [(start, end)] byte ranges of about "chunksize" bytes that
+        cover "path" and always end on a line boundary. skipheader=True
+        starts the first range after the first line.
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        start = len(f.readline()) if skipheader else 0
+        while start < size:
+            f.seek(min(start + chunksize, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _initWorker(holidays, weekmask=None, rules=None):
+    # -------------------------------------------------------------------------
+    # a RuleCalendar is rebuilt from its rules (its years are generated on
+    # demand), any other calendar from its holiday ordinals
+    # -------------------------------------------------------------------------
+    global _workerCalendar
+    if rules is not None:
+        _workerCalendar = RuleCalendar(rules, holidays, weekmask)
+    else:
+        _workerCalendar = BusinessCalendar.fromOrdinals(holidays, weekmask)
+
+
+def _workerArgs(calendar):
+    # "_initWorker" arguments of "calendar"
+    if isinstance(calendar, RuleCalendar):
+        return tuple(calendar._extra), calendar._weekmask.bits, calendar.rules
+    return tuple(calendar._holidays), calendar._weekmask.bits
+
+
+def _applyOperation(calendar, operation, value, options):
+    # -------------------------------------------------------------------------
+    # transform a single field
+    # -------------------------------------------------------------------------
+    if operation == "dateCleanup":
+        return dateCleanup(value).strftime(options.get("outformat", "%Y%m%d%H%M%S"))
+    if operation == "workday":
+        return calendar.workday(value, options.get("offset", 0))
+    if operation == "workdayStart":
+        return calendar.workdayStart(value, options.get("offset", 0))
+    if operation == "lastWorkdayOfMonth":
+        return calendar.lastWorkdayOfMonth(value)
+    if operation == "lastWorkdayOfQtr":
+        return calendar.lastWorkdayOfQtr(value)
+    raise ValueError("unknown operation {!r}".format(operation))
+
+
+def _transformChunk(task):
+    # -------------------------------------------------------------------------
+    # worker: read one byte range, transform the column, return the bytes
+    # -------------------------------------------------------------------------
+    path, start, end, column, operation, options = task
+    delimiter = options.get("delimiter", ",")
+    encoding = options.get("encoding", "utf-8")
+    errors = options.get("errors", "raise")
+    append = options.get("append", False)
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode(encoding)
+    lines = text.split("\n")
+    # the chunk ends on a newline (or EOF): the last piece is "" or a tail
+    tail = lines.pop() if lines else ""
+    if tail:
+        lines.append(tail)
+    output = []
+    for number, line in enumerate(lines):
+        ending = "\n" if number < len(lines) - 1 or not tail else ""
+        if line.endswith("\r"):
+            line, ending = line[:-1], "\r" + ending
+        if not line:
+            output.append(ending)
+            continue
+        fields = line.split(delimiter)
+        try:
+            value = _applyOperation(_workerCalendar, operation, fields[column], options)
+        except Exception as e:
+            if errors == "raise":
+                raise ValueError(
+                    "byte range {}-{}, line {}: {}".format(start, end, number + 1, e)
+                )
+            value = fields[column] if errors == "keep" and column < len(fields) else ""
+        if append:
+            fields.append(value)
+        else:
+            if column >= len(fields):
+                # short line (errors="keep"/"empty"): pad up to the column
+                fields.extend([""] * (column + 1 - len(fields)))
+            fields[column] = value
+        output.append(delimiter.join(fields) + ending)
+    return "".join(output).encode(encoding), len(lines), end - start
+
+
+def transformFile(
+    inpath,
+    outpath,
+    column,
+    operation="dateCleanup",
+    holidays=[],
+    weekmask=None,
+    chunksize=64 * 1024 * 1024,
+    workers=None,
+    header=False,
+    progress=None,
+    **options
+):
+    """
+    FUNCTION: transformFile
+
+    DESCRIPTION:
+        Applies "operation" to field "column" (0-based) of every line of
+        "inpath" with a ProcessPoolExecutor and writes the lines, in order,
+        to "outpath". Returns a dict with lines, bytes, seconds, lines_per_s
+        and mb_per_s.
+
+    ARGUMENTS:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES          | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # inpath / outpath   | string         | Input and output files.
+        # column             | int            | 0-based field to transform.
+        # operation          | string         | One of OPERATIONS. Default = dateCleanup
+        # holidays           | list           | Optional holidays (or BusinessCalendar).
+        # weekmask           | string         | Working weekdays. Default = "1111100"
+        # chunksize          | int            | Bytes per task. Default = 64MB
+        # workers            | int            | Processes. Default = os.cpu_count()
+        # header             | boolean        | Copy the first line as-is. Default = False
+        # progress           | callable       | Called with the running stats dict.
+        # **options          |                | offset, outformat, delimiter, encoding,
+        #                    |                | errors ("raise"/"keep"/"empty"), append
+        # ----------------------------------------------------------------------------------
+
+    EXAMPLES:
+        >>> transformFile("in.csv", "out.csv", 2, "workday", offset=5, workers=8)
+        {'lines': 1000000, 'bytes': 48000000, 'seconds': 3.1, ...}
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(
+            "operation must be one of {}, got {!r}".format(OPERATIONS, operation)
+        )
+    if options.get("errors", "raise") not in ERRORS:
+        raise ValueError("errors must be one of {}".format(ERRORS))
+    calendar = _calendar(holidays, weekmask)
+    ranges = chunkRanges(inpath, chunksize, skipheader=header)
+    workers = workers or os.cpu_count() or 1
+    stats = {
+        "lines": 0,
+        "bytes": 0,
+        "seconds": 0.0,
+        "total_bytes": sum(end - start for start, end in ranges),
+    }
+    started = time.perf_counter()
+    with open(outpath, "wb") as out:
+        if header:
+            with open(inpath, "rb") as f:
+                out.write(f.readline())
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initWorker,
+            initargs=_workerArgs(calendar),
+        ) as executor:
+            # -----------------------------------------------------------------
+            # keep a bounded window of chunks in flight, write them in order
+            # -----------------------------------------------------------------
+            pending = []
+            for start, end in ranges:
+                task = (inpath, start, end, column, operation, options)
+                pending.append(executor.submit(_transformChunk, task))
+                if len(pending) >= workers * 2:
+                    _writeChunk(out, pending.pop(0), stats, started, progress)
+            while pending:
+                _writeChunk(out, pending.pop(0), stats, started, progress)
+    return _throughput(stats, started)
+
+
+def _writeChunk(out, future, stats, started, progress):
+    data, lines, size = future.result()
+    out.write(data)
+    stats["lines"] += lines
+    stats["bytes"] += size
+    if progress is not None:
+        progress(_throughput(stats, started))
+
+
+def _throughput(stats, started):
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    seconds = stats["seconds"] or 1e-9
+    stats["lines_per_s"] = round(stats["lines"] / seconds, 1)
+    stats["mb_per_s"] = round(stats["bytes"] / seconds / 1e6, 3)
+    return dict(stats)
+
+
+def _parseSize(value):
+    # -------------------------------------------------------------------------
+    # "64M", "512K", "1G" or plain bytes
+    # -------------------------------------------------------------------------
+    units = {"K": 1024, "M": 1024**2, "G": 1024**3}
+    value = value.strip().upper().rstrip("B")
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def _printProgress(stats):
+    sys.stderr.write(
+        "\r{:6.1%}  {:,} lines  {:.1f} MB/s  {:,.0f} lines/s".format(
+            stats["bytes"] / (stats["total_bytes"] or 1),
+            stats["lines"],
+            stats["mb_per_s"],
+            stats["lines_per_s"],
+        )
+    )
+    sys.stderr.flush()
+
+
+def buildParser(parser=None):
+    parser = parser or argparse.ArgumentParser(
+        description="Transform one date column of a delimited file in parallel."
+    )
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--column", type=int, required=True, help="0-based field")
+    parser.add_argument("--operation", choices=OPERATIONS, default="dateCleanup")
+    parser.add_argument("--offset", type=int, default=0)
+    parser.add_argument("--outformat", default="%Y%m%d%H%M%S")
+    parser.add_argument(
+        "--holidays", help="holiday file (.csv, .ics, .json, .wdcal or one per line)"
+    )
+    parser.add_argument(
+        "--weekmask", default=None, help='working weekdays Mon..Sun, e.g. "1111001"'
+    )
+    parser.add_argument("--delimiter", default=",")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--header", action="store_true")
+    parser.add_argument("--append", action="store_true", help="add a new column")
+    parser.add_argument("--errors", choices=ERRORS, default="raise")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=_parseSize, default=64 * 1024**2)
+    parser.add_argument("--quiet", action="store_true", help="no progress output")
+    return parser
+
+
+def run(args):
+    stats = transformFile(
+        args.input,
+        args.output,
+        args.column,
+        args.operation,
+        holidays=(
+            loaders.loadHolidays(args.holidays, weekmask=args.weekmask)
+            if args.holidays
+            else []
+        ),
+        weekmask=args.weekmask,
+        chunksize=args.chunk_size,
+        workers=args.workers,
+        header=args.header,
+        progress=None if args.quiet else _printProgress,
+        offset=args.offset,
+        outformat=args.outformat,
+        delimiter=args.delimiter,
+        encoding=args.encoding,
+        errors=args.errors,
+        append=args.append,
+    )
+    if not args.quiet:
+        sys.stderr.write(
+            "\n{lines:,} lines, {bytes:,} bytes in {seconds}s "
+            "({mb_per_s} MB/s, {lines_per_s:,.0f} lines/s)\n".format(**stats)
+        )
+    return 0
+
+
+def main(argv=None):
+    return run(buildParser().parse_args(argv))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
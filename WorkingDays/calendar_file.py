@@ -0,0 +1,142 @@
+"""
+    Persistent, memory-mappable compiled calendar files.
+
+    "saveCalendar" writes a BusinessCalendar and its dense workday index to a
+    compact binary file; "loadCalendar" mmaps it and returns a
+    BusinessCalendar whose index reads the mapped pages directly (zero-copy),
+    so every process loading the same file shares them.
+
+FILE LAYOUT (little-endian, version 2):
+    header      magic, version, base ordinal, days, holidays, crc32,
+                weekmask (7 bits, bit 0 = Monday, never 0), 3 padding bytes
+    holidays    int32 * holidays        (every holiday ordinal, sorted)
+    cumulative  int32 * (days + 1)      (workdays in [base, base + i))
+
+    Whether base + i is a workday is cumulative[i + 1] - cumulative[i].
+    Version 1 files (with a workday bitmap and no weekmask) are rejected.
+
+FUNCTIONS:
+    saveCalendar(calendar, path, startyear=1990, endyear=2100)
+    loadCalendar(path, verify=True)
+
+"""
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from datetime import date
+from itertools import accumulate
+
+from WorkingDays.date_utilities import BusinessCalendar, DEFAULT_HORIZON, _calendar
+
+MAGIC = b"WDCAL\x00\x00\x00"
+VERSION = 2
+_HEADER = struct.Struct("<8sIiIIIB3x")
+
+
+class CalendarFileError(ValueError):
+    """Raised when a calendar file is not valid for this version."""
+
+
+def _int32(values):
+    values = array("i", values)
+    if sys.byteorder != "little":  # pragma: no cover
+        values.byteswap()
+    return values
+
+
+def saveCalendar(
+    calendar, path, startyear=DEFAULT_HORIZON[0], endyear=DEFAULT_HORIZON[1]
+):
+    """
+    FUNCTION: saveCalendar
+
+    DESCRIPTION:
+        Writes "calendar" (a BusinessCalendar or a holidays list) with its
+        cumulative workday index from Jan 1 "startyear" to Dec 31 "endyear"
+        to "path". The file is written next to "path" and renamed
+        into place, so readers never see a partial file. Returns "path".
+    """
+    calendar = _calendar(calendar)
+    base = date(startyear, 1, 1).toordinal()
+    days = date(endyear, 12, 31).toordinal() - base + 1
+    workdays = (calendar._isWorkday(o) for o in range(base, base + days))
+    # -------------------------------------------------------------------------
+    # payload: holidays, cumulative counts
+    # -------------------------------------------------------------------------
+    holidays = sorted(calendar._holidays)
+    payload = b"".join(
+        [
+            _int32(holidays).tobytes(),
+            _int32(accumulate(workdays, initial=0)).tobytes(),
+        ]
+    )
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        base,
+        days,
+        len(holidays),
+        zlib.crc32(payload),
+        calendar._weekmask.bits,
+    )
+    tmppath = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmppath, "wb") as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmppath, path)
+    return path
+
+
+def loadCalendar(path, verify=True):
+    """
+    FUNCTION: loadCalendar
+
+    DESCRIPTION:
+        Maps a file written by "saveCalendar" and returns a BusinessCalendar
+        whose dense index is a memoryview over the mapped pages. The magic,
+        version and sizes are always checked; verify=True also checks the
+        crc32 of the payload. Raises CalendarFileError for invalid files.
+
+    EXAMPLES:
+        >>> saveCalendar(["20200703", "20200706"], "holidays.wdcal")
+        >>> cal = loadCalendar("holidays.wdcal")
+        >>> workday("20200702", 3, holidays=cal)
+        "20200709"
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) < _HEADER.size:
+        raise CalendarFileError("{}: file too small".format(path))
+    magic, version, base, days, holidays, crc, weekmask = _HEADER.unpack_from(mapped)
+    if magic != MAGIC:
+        raise CalendarFileError("{}: not a calendar file".format(path))
+    if version != VERSION:
+        raise CalendarFileError(
+            "{}: version {} is not supported (expected {})".format(
+                path, version, VERSION
+            )
+        )
+    if not 0 < weekmask < 128:
+        raise CalendarFileError("{}: invalid weekmask {}".format(path, weekmask))
+    holidaysAt = _HEADER.size
+    indexAt = holidaysAt + 4 * holidays
+    if len(mapped) != indexAt + 4 * (days + 1):
+        raise CalendarFileError("{}: truncated or oversized file".format(path))
+    view = memoryview(mapped)
+    if verify and zlib.crc32(view[_HEADER.size :]) != crc:
+        raise CalendarFileError("{}: checksum mismatch".format(path))
+    # -------------------------------------------------------------------------
+    # zero-copy int32 views (copied only on big-endian hosts)
+    # -------------------------------------------------------------------------
+    holidayview = view[holidaysAt : holidaysAt + 4 * holidays].cast("i")
+    index = view[indexAt:].cast("i")
+    if sys.byteorder != "little":  # pragma: no cover
+        holidayview = _int32(holidayview)
+        index = _int32(index)
+    calendar = BusinessCalendar.fromOrdinals(holidayview, weekmask)
+    calendar._setIndex(index, base, source=os.fspath(path))
+    return calendar
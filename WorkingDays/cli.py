@@ -0,0 +1,177 @@
+"""
+    "workingdays" command line: streams dates from stdin through the
+    "date_utilities" functions and writes the results to stdout, loading the
+    holiday calendar once for the whole stream.
+
+USAGE:
+    workingdays workday --offset 5 --holidays holidays.txt < dates.txt
+    workingdays workday --offset 5 --weekmask 1111001 < dates.txt
+    workingdays workdayStart --offset 5 < dates.txt
+    workingdays compareWorkingDays --signed < pairs.txt
+    workingdays lastWorkdayOfMonth < dates.txt
+    workingdays lastWorkdayOfQtr < dates.txt
+    workingdays dateBucketing --interval 6 --end 20211231 < starts.txt
+    workingdays bulk INPUT OUTPUT --column 2 --operation workday --offset 5
+    workingdays --version
+
+"""
+
+import argparse
+import sys
+
+from WorkingDays._version import version as __version__
+from WorkingDays.date_utilities import BusinessCalendar, iter_buckets
+from WorkingDays import bulk, loaders
+
+COMMANDS = (
+    "workday",
+    "workdayStart",
+    "compareWorkingDays",
+    "lastWorkdayOfMonth",
+    "lastWorkdayOfQtr",
+    "dateBucketing",
+)
+ERRORS = ("raise", "skip", "empty")
+
+
+def loadHolidays(path, weekmask=None):
+    """
+    FUNCTION: loadHolidays
+
+    DESCRIPTION:
+        Returns a BusinessCalendar of "path": a holiday file in any
+        "loaders" format (csv, ics, json, compiled ".wdcal" or one holiday
+        per line). A "weekmask" must match the weekmask stored in a ".wdcal"
+        file.
+    """
+    if path is None:
+        return BusinessCalendar(weekmask=weekmask)
+    return loaders.loadHolidays(path, weekmask=weekmask)
+
+
+def _results(args, calendar, line):
+    # -------------------------------------------------------------------------
+    # results (as strings) of one input line
+    # -------------------------------------------------------------------------
+    command = args.command
+    if command == "workday":
+        return [calendar.workday(line, args.offset)]
+    if command == "workdayStart":
+        return [calendar.workdayStart(line, args.offset)]
+    if command == "lastWorkdayOfMonth":
+        return [calendar.lastWorkdayOfMonth(line)]
+    if command == "lastWorkdayOfQtr":
+        return [calendar.lastWorkdayOfQtr(line)]
+    if command == "compareWorkingDays":
+        datevalue, comparedate = line.split(args.delimiter)
+        return [
+            str(
+                calendar.compareWorkingDays(
+                    datevalue.strip(), comparedate.strip(), signed=args.signed
+                )
+            )
+        ]
+    separator = args.delimiter or "\t"
+    return [
+        separator.join(bucket)
+        for bucket in iter_buckets(
+            line, args.interval, args.end, workdays=args.workdays, holidays=calendar
+        )
+    ]
+
+
+def stream(args, stdin, stdout):
+    """
+    FUNCTION: stream
+
+    DESCRIPTION:
+        Applies the parsed "args" command to every non-empty line of "stdin"
+        and writes one result line per input (one per bucket for
+        dateBucketing) to "stdout". Returns the number of lines read.
+    """
+    calendar = loadHolidays(args.holidays, args.weekmask)
+    separator = args.delimiter or "\t"
+    # -------------------------------------------------------------------------
+    # batch the output writes instead of writing line by line
+    # -------------------------------------------------------------------------
+    buffer = []
+    count = 0
+    for count, line in enumerate(stdin, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            results = _results(args, calendar, line)
+        except Exception as e:
+            if args.errors == "raise":
+                raise ValueError("line {}: {!r}: {}".format(count, line, e))
+            if args.errors == "skip":
+                continue
+            results = [""]
+        for result in results:
+            buffer.append(line + separator + result if args.echo else result)
+        if len(buffer) >= 8192:
+            stdout.write("\n".join(buffer) + "\n")
+            buffer = []
+    if buffer:
+        stdout.write("\n".join(buffer) + "\n")
+    stdout.flush()
+    return count
+
+
+def buildParser():
+    parser = argparse.ArgumentParser(
+        prog="workingdays",
+        description="Stream dates from stdin through the workingdays functions.",
+    )
+    parser.add_argument(
+        "--version", action="version", version="version: {}".format(__version__)
+    )
+    commands = parser.add_subparsers(dest="command")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--holidays", help="holiday file (.csv, .ics, .json, .wdcal or one per line)"
+    )
+    common.add_argument(
+        "--delimiter",
+        default=None,
+        help="field separator of compareWorkingDays input and of the output "
+        "(default: whitespace in, tab out)",
+    )
+    common.add_argument(
+        "--weekmask",
+        default=None,
+        help='working weekdays Mon..Sun (default "1111100"), e.g. "1111001"',
+    )
+    common.add_argument("--echo", action="store_true", help="prefix the input line")
+    common.add_argument("--errors", choices=ERRORS, default="raise")
+    for command in COMMANDS:
+        sub = commands.add_parser(command, parents=[common])
+        if command in ("workday", "workdayStart"):
+            sub.add_argument("--offset", type=int, required=True)
+        if command == "compareWorkingDays":
+            sub.add_argument("--signed", action="store_true")
+        if command == "dateBucketing":
+            sub.add_argument("--interval", type=int, required=True)
+            sub.add_argument("--end", default=None, help="default: utcnow")
+            sub.add_argument("--workdays", action="store_true")
+    bulk.buildParser(commands.add_parser("bulk", help="parallel file transform"))
+    return parser
+
+
+def main(argv=None):
+    args = buildParser().parse_args(argv)
+    if args.command is None:
+        print("version: {}".format(__version__))
+        return 0
+    if args.command == "bulk":
+        return bulk.run(args)
+    try:
+        stream(args, sys.stdin, sys.stdout)
+    except BrokenPipeError:  # pragma: no cover
+        return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -1,189 +1,1812 @@
-from datetime import timedelta, datetime
+from datetime import timedelta, datetime, date
+from bisect import bisect_left, bisect_right
+from array import array
+from collections import OrderedDict
+from operator import itemgetter
+from itertools import accumulate, chain, islice
+import heapq
 import re
 import logging
+import math
+import threading
+import time
+import warnings
 
 from WorkingDays._version import version as __version__
 
 logs = logging.getLogger(__name__)
 
+# -----------------------------------------------------------------------------
+# compiled "dateCleanup" patterns
+# -----------------------------------------------------------------------------
+_GERMAN_DATE = re.compile(r"([0-9]{2}\.[0-9]{2}\.[0-9]{4})")
+_GERMAN_TOKENS = re.compile(r"[\w':\w':\w']+")
+_DAY_TIME_GAP = re.compile(r"(?<=[0-9]{4}\W[0-9]{2}\W[0-9]{2})(?=[^\s:])")
+_SEPARATOR = re.compile(r"\W")
+_TOKENS = re.compile(r"[\w':\w':\w.\w']+")
+_ISO_TIME = re.compile(r"([a-zA-Z][0-9]{2}:.)")
+_TIME = re.compile(r"([0-9]{2}:[0-9]{2}:[0-9])")
+_UTC_TIME = re.compile(r"(\w[0-9]{2}:[0-9]{2}:[0-9]{2}\w)")
+_DATE_SEPARATORS = frozenset("-/:")
+
+# years covered by "BusinessCalendar.buildIndex" unless told otherwise
+DEFAULT_HORIZON = (1990, 2100)
+
+# ordinal of 1970-01-01 and milliseconds per day (epoch timestamps)
+EPOCH_ORDINAL = 719163
+MS_PER_DAY = 86400000
+_EPOCH = datetime(1970, 1, 1)
+
+# result types of the date returning functions (returns=...), the largest
+# proleptic ordinal and the ints taken as ordinals (years 1000-2699, all 6
+# digits, so years, YYYYMM and 7 digit ints are never read as dates)
+RETURNS = ("str", "date", "ordinal", "int")
+_MAX_ORDINAL = date.max.toordinal()
+_INT_ORDINALS = (date(1000, 1, 1).toordinal(), date(2699, 12, 31).toordinal())
+
+# -----------------------------------------------------------------------------
+# opt-in "dateCleanup" parse cache (see "enableParseCache")
+# -----------------------------------------------------------------------------
+_parseCache = None
+
+# -----------------------------------------------------------------------------
+# opt-in instrumentation (see "enableMetrics")
+# -----------------------------------------------------------------------------
+_metrics = None
+
+
+class ParseCache(object):
+    """
+    CLASS: ParseCache
+
+    DESCRIPTION:
+        Size-bounded memo of "dateCleanup" results keyed on
+        (datevalue, epoch). When "maxsize" entries are stored the next insert
+        evicts the least recently used entry (policy="lru") or the oldest
+        inserted entry (policy="fifo"). Hits, misses and evictions are counted.
+
+    ARGUMENTS:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES          | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # maxsize            | int            | Max cached values. Default = 4096
+        # policy             | string         | "lru" or "fifo". Default = "lru"
+        # ----------------------------------------------------------------------------------
+    """
+
+    POLICIES = ("lru", "fifo")
+
+    def __init__(self, maxsize=4096, policy="lru"):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1, got {}".format(maxsize))
+        if policy not in self.POLICIES:
+            raise ValueError(
+                "policy must be one of {}, got {!r}".format(self.POLICIES, policy)
+            )
+        self.maxsize = maxsize
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """Returns the cached datetime for "key" or None."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            if self.policy == "lru":
+                self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """Returns a dict of the cache counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "policy": self.policy,
+        }
+
+
+def enableParseCache(maxsize=4096, policy="lru"):
+    """
+    FUNCTION: enableParseCache
+
+    DESCRIPTION:
+        Routes every "dateCleanup" call (and so every workday function)
+        through a new ParseCache and returns it. Repeated inputs then cost a
+        dict lookup instead of a parse.
+
+    EXAMPLES:
+        >>> cache = enableParseCache(maxsize=1024)
+        >>> workday("20200702", 3)
+        >>> parseCacheInfo()
+        {'hits': 0, 'misses': 1, 'evictions': 0, 'size': 1, ...}
+    """
+    global _parseCache
+    _parseCache = ParseCache(maxsize=maxsize, policy=policy)
+    return _parseCache
+
+
+def disableParseCache():
+    """Stops caching "dateCleanup" results and drops the cache."""
+    global _parseCache
+    _parseCache = None
+
+
+def parseCacheInfo():
+    """Returns the counters of the active ParseCache (None when disabled)."""
+    if _parseCache is None:
+        return None
+    return _parseCache.info()
+
+
+class Metrics(object):
+    """
+    CLASS: Metrics
+
+    DESCRIPTION:
+        Thread-safe collector of the instrumentation counters: per-function
+        call counts and cumulative latency, named counters (e.g. which
+        "dateCleanup" branch and format fired) and power-of-two histograms
+        (e.g. holiday "waves" per workday offset).
+
+        "hook", when given, is called as hook(kind, name, value) for every
+        record (kind is "timing", "count" or "observe") to forward the data
+        to an external metrics system. Errors raised by the hook are logged
+        and otherwise ignored.
+
+    ARGUMENTS:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES          | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # hook               | callable       | Optional hook(kind, name, value).
+        # ----------------------------------------------------------------------------------
+    """
+
+    def __init__(self, hook=None):
+        self.hook = hook
+        self.calls = {}
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def timing(self, name, seconds):
+        """Adds one call of "name" that took "seconds"."""
+        with self._lock:
+            calls = self.calls.get(name)
+            if calls is None:
+                calls = self.calls[name] = [0, 0.0]
+            calls[0] += 1
+            calls[1] += seconds
+        self._forward("timing", name, seconds)
+
+    def count(self, name, value=1):
+        """Adds "value" to the counter "name"."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        self._forward("count", name, value)
+
+    def observe(self, name, value):
+        """Adds "value" to the histogram "name" (bins 0, 1, 2-3, 4-7, ...)."""
+        if value < 1:
+            label = "0"
+        else:
+            low = 1 << (int(value).bit_length() - 1)
+            label = str(low) if low == 1 else "{}-{}".format(low, 2 * low - 1)
+        with self._lock:
+            histogram = self.histograms.setdefault(name, {})
+            histogram[label] = histogram.get(label, 0) + 1
+        self._forward("observe", name, value)
+
+    def _forward(self, kind, name, value):
+        if self.hook is None:
+            return
+        try:
+            self.hook(kind, name, value)
+        except Exception:
+            logs.warning("metrics hook failed on %s %r", kind, name, exc_info=True)
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+            self.counters.clear()
+            self.histograms.clear()
+
+    def info(self):
+        """Returns a dict with "calls", "counters" and "histograms"."""
+        with self._lock:
+            return {
+                "calls": {
+                    name: {
+                        "count": count,
+                        "seconds": seconds,
+                        "mean": seconds / count,
+                    }
+                    for name, (count, seconds) in self.calls.items()
+                },
+                "counters": dict(self.counters),
+                "histograms": {
+                    name: dict(histogram) for name, histogram in self.histograms.items()
+                },
+            }
+
+
+def enableMetrics(hook=None):
+    """
+    FUNCTION: enableMetrics
+
+    DESCRIPTION:
+        Starts collecting instrumentation into a new Metrics object and
+        returns it. While disabled (the default) every instrumented function
+        only pays for one "is None" check.
+
+    EXAMPLES:
+        >>> metrics = enableMetrics()
+        >>> workday("20200702", 3, holidays=["20200703"])
+        >>> metricsInfo()["calls"]["workday"]
+        {'count': 1, 'seconds': 1.2e-05, 'mean': 1.2e-05}
+        >>> metricsInfo()["counters"]["dateCleanup.format.%Y%m%d"]
+        2
+    """
+    global _metrics
+    _metrics = Metrics(hook=hook)
+    return _metrics
+
+
+def disableMetrics():
+    """Stops the instrumentation and drops the collected metrics."""
+    global _metrics
+    _metrics = None
+
+
+def metricsInfo():
+    """Returns the collected metrics (None when disabled)."""
+    if _metrics is None:
+        return None
+    return _metrics.info()
+
 
 def dateCleanup(datevalue, **kwargs):
     """
-    FUNCTION: dateCleanup
+    FUNCTION: dateCleanup
+
+    DESCRIPTION:
+        Returns datetime.datetime(y, m, d, h, M, s) of "datevalue".
+
+    ARGUMENT:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES              | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # datevalue          | string/int         | Date for working days.
+        # **optional epoch   | boolean            | Default = False
+
+        "datevalue" is expected to be Type string unless epoch=True,
+        Then datevalue expected to be Type Int.
+
+        Results are memoized when "enableParseCache" is active.
+
+    EXAMPLES:
+        # ---------------------------------------------------------------------
+        # Example German date format:
+        # ---------------------------------------------------------------------
+        >>> dateCleanup('07.04.2020')
+        'datetime.datetime(2020, 4, 7, 0, 0)'
+        # ---------------------------------------------------------------------
+        # Example alpha date short format:
+        # ---------------------------------------------------------------------
+        >>> dateCleanup('MAR 25 2020')
+        datetime.datetime(2020, 3, 25, 0, 0)
+        # ---------------------------------------------------------------------
+        # Example date with time format:
+        # ---------------------------------------------------------------------
+        >>> dateCleanup('2020-02-28 12:30:00')
+        datetime.datetime(2020, 2, 28, 12, 30)
+    """
+    # -------------------------------------------------------------------------
+    # check if epoch
+    # -------------------------------------------------------------------------
+    epoch = bool(kwargs.get("epoch", False))
+    if epoch:
+        datevalue = int(datevalue)
+    else:
+        datevalue = str(datevalue)
+    # -------------------------------------------------------------------------
+    # opt-in parse cache
+    # -------------------------------------------------------------------------
+    metrics = _metrics
+    if metrics is not None:
+        started = time.perf_counter()
+    cache = _parseCache
+    if cache is not None:
+        cleanupdate = cache.get((datevalue, epoch))
+        if cleanupdate is not None:
+            if metrics is not None:
+                _recordParse(metrics, "cache", datevalue, started, epoch)
+            return cleanupdate
+    # -------------------------------------------------------------------------
+    # set datevalue
+    # -------------------------------------------------------------------------
+    if epoch:
+        # integer milliseconds, no float division (exact to the millisecond)
+        cleanupdate = _EPOCH + timedelta(milliseconds=datevalue)
+        branch = "epoch"
+    else:
+        # ---------------------------------------------------------------------
+        # common shapes are sliced directly, the heuristics are the fallback
+        # ---------------------------------------------------------------------
+        cleanupdate = _fastParse(datevalue)
+        branch = "fast"
+        if cleanupdate is None:
+            cleanupdate = _heuristicParse(datevalue)
+            branch = "heuristic"
+    if cache is not None:
+        cache.put((datevalue, epoch), cleanupdate)
+    if metrics is not None:
+        _recordParse(metrics, branch, datevalue, started, epoch)
+    return cleanupdate
+
+
+def _recordParse(metrics, branch, datevalue, started, epoch=False):
+    # -------------------------------------------------------------------------
+    # "dateCleanup" latency, branch and input format (only when instrumented)
+    # -------------------------------------------------------------------------
+    metrics.timing("dateCleanup", time.perf_counter() - started)
+    metrics.count("dateCleanup.branch." + branch)
+    if epoch:
+        # epoch values are ints, also when served from the parse cache
+        dateformat = "epoch_ms"
+    else:
+        dateformat = _detectFormat(datevalue) or "other"
+    metrics.count("dateCleanup.format." + dateformat)
+
+
+def _fastParse(datevalue):
+    """
+    FUNCTION: _fastParse
+
+    DESCRIPTION:
+        Fast path of "dateCleanup". Recognizes the common shapes from their
+        length and separator positions and slices them straight into a
+        datetime. Returns None for any other shape (or an invalid date) so
+        "dateCleanup" falls back to "_heuristicParse".
+
+        # ---------------------------------------------------------------------
+        # Shapes
+        # ---------------------------------------------------------------------
+        YYYYMMDD[hh[mm[ss]]]
+        YYYY-MM-DD, YYYY/MM/DD, YYYY:MM:DD
+        YYYY-MM-DD hh:mm:ss[.ffffff], YYYY-MM-DDThh:mm:ss[Z]
+        dd.mm.yyyy, dd.mm.yyyy hh:mm:ss
+    """
+    size = len(datevalue)
+    if not datevalue.isascii():
+        return None
+    try:
+        # ---------------------------------------------------------------------
+        # datetime with no separators
+        # ---------------------------------------------------------------------
+        if 8 <= size <= 14 and datevalue.isdigit():
+            if size == 8:
+                return datetime(
+                    int(datevalue[0:4]), int(datevalue[4:6]), int(datevalue[6:8])
+                )
+            datevalue = datevalue.ljust(14, "0")
+            return datetime(
+                int(datevalue[0:4]),
+                int(datevalue[4:6]),
+                int(datevalue[6:8]),
+                int(datevalue[8:10]),
+                int(datevalue[10:12]),
+                int(datevalue[12:14]),
+            )
+        if size < 10:
+            return None
+        # ---------------------------------------------------------------------
+        # German date format (dd.mm.yyyy [hh:mm:ss])
+        # ---------------------------------------------------------------------
+        if datevalue[2] == "." and datevalue[5] == ".":
+            if size == 10 or (size == 19 and datevalue[10] == " "):
+                if not (datevalue[0:2] + datevalue[3:5]).isdigit():
+                    return None
+                if not datevalue[6:10].isdigit():
+                    return None
+                if size == 10:
+                    return datetime(
+                        int(datevalue[6:10]), int(datevalue[3:5]), int(datevalue[0:2])
+                    )
+                return _sliceTime(
+                    datevalue[11:19],
+                    int(datevalue[6:10]),
+                    int(datevalue[3:5]),
+                    int(datevalue[0:2]),
+                )
+            return None
+        # ---------------------------------------------------------------------
+        # ISO 8601 (YYYY-MM-DD[( |T)hh:mm:ss[.ffffff|Z]])
+        # ---------------------------------------------------------------------
+        separator = datevalue[4]
+        if separator not in _DATE_SEPARATORS or datevalue[7] != separator:
+            return None
+        year, month, day = datevalue[0:4], datevalue[5:7], datevalue[8:10]
+        if not (year + month + day).isdigit():
+            return None
+        if size == 10:
+            return datetime(int(year), int(month), int(day))
+        if datevalue[10] not in (" ", "T"):
+            return None
+        if size == 19 or (size == 20 and datevalue[19] == "Z"):
+            pass
+        elif size == 26 and datevalue[10] == " " and datevalue[19] == ".":
+            if not datevalue[20:26].isdigit():
+                return None
+        else:
+            return None
+        return _sliceTime(datevalue[11:19], int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+def _sliceTime(timevalue, y, m, d):
+    # -------------------------------------------------------------------------
+    # "hh:mm:ss" onto y, m, d (None when it isn't a plain time)
+    # -------------------------------------------------------------------------
+    if timevalue[2] != ":" or timevalue[5] != ":":
+        return None
+    if not (timevalue[0:2] + timevalue[3:5] + timevalue[6:8]).isdigit():
+        return None
+    return datetime(
+        y, m, d, int(timevalue[0:2]), int(timevalue[3:5]), int(timevalue[6:8])
+    )
+
+
+def _heuristicParse(datevalue):
+    # -------------------------------------------------------------------------
+    # full heuristic parser, used when "_fastParse" doesn't know the shape
+    # -------------------------------------------------------------------------
+    datelist = []
+    # -------------------------------------------------------------------------
+    # use regex to to separate datevalue into "Year, Month, and Day"
+    # -------------------------------------------------------------------------
+    # German date formats
+    # Referencing https://en.wikipedia.org/wiki/Date_format_by_country
+    # The format dd.mm.yyyy using dots (which denotes ordinal numbering).
+    # -------------------------------------------------------------------------
+    germanDateFormat = _GERMAN_DATE.match(datevalue)
+    if germanDateFormat:
+        datelist = _GERMAN_TOKENS.findall(datevalue)
+        d = int(datelist[0])
+        m = int(datelist[1])
+        y = int(datelist[2])
+        h = 0
+        M = 0
+        s = 0
+        for value in datelist:
+            # -----------------------------------------------------------------
+            # checking for time patterns
+            # -----------------------------------------------------------------
+            if _TIME.match(value):
+                h = int(value[0:2])
+                M = int(value[3:5])
+                s = int(value[6:8])
+    else:
+        # ---------------------------------------------------------------------
+        # Clean date string (adding a space between DD & hh)
+        # when pattern like 'YYYY-MM-DDhh:mm:ss' to 'YYYY-MM-DD hh:mm:ss'
+        # or
+        # when pattern like 'YYYY:MM:DDhh:mm:ss' to 'YYYY-MM-DD hh:mm:ss'
+        # ---------------------------------------------------------------------
+        datevalue = _SEPARATOR.sub("-", _DAY_TIME_GAP.sub(" ", datevalue), count=2)
+        # ---------------------------------------------------------------------
+        # Splitting patterns into a list
+        # ---------------------------------------------------------------------
+        datelist = _TOKENS.findall(datevalue)
+        # ---------------------------------------------------------------------
+        # datevalue has separators (list of numbers)
+        # ---------------------------------------------------------------------
+        m = 0
+        h = 0
+        M = 0
+        s = 0
+        if len(datelist) > 1:
+            for value in datelist:
+                # -------------------------------------------------------------
+                # checking for Months written as "alpha"
+                # then convert to number
+                # -------------------------------------------------------------
+                # example: Jan to 1 or March to 3
+                # -------------------------------------------------------------
+                if value.isalpha() is True:
+                    m = int(datetime.strptime(value[0:3].capitalize(), "%b").month)
+                # -------------------------------------------------------------
+                # checking for ISO 8601 Time patterns
+                # -------------------------------------------------------------
+                elif _ISO_TIME.match(value):
+                    h = int(value[1:3])
+                    M = int(value[4:6])
+                    s = int(value[7:9])
+                # -------------------------------------------------------------
+                # checking for Time patterns
+                # -------------------------------------------------------------
+                elif _TIME.match(value):
+                    h = int(value[0:2])
+                    M = int(value[3:5])
+                    s = int(value[6:8])
+                # -------------------------------------------------------------
+                # UTC Timezone Format
+                # -------------------------------------------------------------
+                elif _UTC_TIME.match(value):
+                    h = int(value[1:3])
+                    M = int(value[4:6])
+                    s = int(value[7:9])
+                # -------------------------------------------------------------
+                # checking for Year patterns
+                # -------------------------------------------------------------
+                elif len(value) == 4:
+                    y = int(value)
+                # -------------------------------------------------------------
+                # checking for Day patterns
+                # -------------------------------------------------------------
+                elif int(value) > 12 and int(value) <= 31:
+                    d = int(value)
+                # -------------------------------------------------------------
+                # checking if the value is <= 12, either Month or Day so if
+                # Month is not all ready defined (by alpha pattern) set it
+                # -------------------------------------------------------------
+                elif int(value) <= 12:
+                    if m != 0:
+                        d = int(value)
+                    else:
+                        m = int(value)
+        # ---------------------------------------------------------------------
+        # datevalue has no separators (string of numbers)
+        # ---------------------------------------------------------------------
+        elif len(datelist) == 1:
+            datevalue = datevalue.ljust(14, "0")
+            y = int(datevalue[0:4])
+            m = int(datevalue[4:6])
+            d = int(datevalue[6:8])
+            h = int(datevalue[8:10])
+            M = int(datevalue[10:12])
+            s = int(datevalue[12:14])
+    # -------------------------------------------------------------------------
+    # pass the datelist values to the "date" function
+    # -------------------------------------------------------------------------
+    try:
+        cleanupdate = datetime(y, m, d, h, M, s)
+    except Exception as e:
+        raise Exception(
+            "The error raised is: {0}. y = {1}, m = {2}, d = {3}, datevalue = {4}".format(
+                e, y, m, d, datevalue
+            )
+        )
+    return cleanupdate
+
+
+# -----------------------------------------------------------------------------
+# column parsing ("parse_many")
+# -----------------------------------------------------------------------------
+_DIRECTIVE_WIDTHS = {"Y": 4, "m": 2, "d": 2, "H": 2, "M": 2, "S": 2}
+_EPOCH_FORMATS = {"epoch_ms": 1, "epoch_s": 1000}
+
+
+def _detectFormat(datevalue):
+    # -------------------------------------------------------------------------
+    # name the shape "_fastParse" would slice, None for anything else
+    # -------------------------------------------------------------------------
+    size = len(datevalue)
+    if not datevalue.isascii():
+        return None
+    if datevalue.isdigit():
+        return {8: "%Y%m%d", 14: "%Y%m%d%H%M%S"}.get(size)
+    if size >= 10 and datevalue[2] == "." and datevalue[5] == ".":
+        return {10: "%d.%m.%Y", 19: "%d.%m.%Y %H:%M:%S"}.get(size)
+    if size < 10 or datevalue[4] not in _DATE_SEPARATORS:
+        return None
+    separator = datevalue[4]
+    if datevalue[7] != separator:
+        return None
+    dateformat = "%Y{0}%m{0}%d".format(separator)
+    if size == 10:
+        return dateformat
+    if size in (19, 20) and datevalue[10] in (" ", "T"):
+        dateformat += datevalue[10] + "%H:%M:%S"
+        return dateformat + "Z" if size == 20 and datevalue[19] == "Z" else dateformat
+    return None
+
+
+def _compileFormat(dateformat):
+    """
+    FUNCTION: _compileFormat
+
+    DESCRIPTION:
+        Returns a parser for a single "dateformat". Fixed-width formats made
+        of %Y %m %d %H %M %S and literal characters are compiled into slice
+        positions; any other strptime format uses "datetime.strptime".
+        "epoch_ms" / "epoch_s" parse integer epochs. The parser raises
+        ValueError for values that don't match the format.
+    """
+    if dateformat in _EPOCH_FORMATS:
+        scale = _EPOCH_FORMATS[dateformat]
+        return lambda value: dateCleanup(int(value) * scale, epoch=True)
+    fields = {}
+    literals = []
+    position = 0
+    i = 0
+    while i < len(dateformat):
+        char = dateformat[i]
+        if char == "%" and i + 1 < len(dateformat):
+            directive = dateformat[i + 1]
+            if directive not in _DIRECTIVE_WIDTHS:
+                return lambda value: datetime.strptime(str(value), dateformat)
+            width = _DIRECTIVE_WIDTHS[directive]
+            fields[directive] = (position, position + width)
+            position += width
+            i += 2
+        else:
+            literals.append((position, char))
+            position += 1
+            i += 1
+    size = position
+    slices = [fields.get(directive) for directive in "YmdHMS"]
+    if None in slices[:3]:
+        return lambda value: datetime.strptime(str(value), dateformat)
+
+    def parse(value):
+        value = str(value)
+        if len(value) != size or any(value[at] != char for at, char in literals):
+            raise ValueError("{!r} does not match {!r}".format(value, dateformat))
+        parts = ["0" if s is None else value[s[0] : s[1]] for s in slices]
+        if not all(part.isdigit() and part.isascii() for part in parts):
+            raise ValueError("{!r} does not match {!r}".format(value, dateformat))
+        return datetime(*[int(part) for part in parts])
+
+    return parse
+
+
+def inferFormat(datevalues):
+    """
+    FUNCTION: inferFormat
+
+    DESCRIPTION:
+        Returns the most common format (see "_detectFormat") of the sampled
+        "datevalues", or None when none of them has a known shape.
+    """
+    counts = {}
+    for value in datevalues:
+        dateformat = _detectFormat(str(value))
+        if dateformat is not None:
+            counts[dateformat] = counts.get(dateformat, 0) + 1
+    if not counts:
+        return None
+    return max(counts, key=counts.get)
+
+
+class ParseStream(object):
+    """
+    CLASS: ParseStream
+
+    DESCRIPTION:
+        Iterator returned by "parse_many". "format" is the hinted or inferred
+        format (None when only the heuristic parser is used) and
+        "fallback_rows" lists the (0-based) rows that did not match it and
+        went through "dateCleanup", filled in as the stream is consumed.
+    """
+
+    def __init__(self, datevalues, format=None, sample=100):
+        datevalues = iter(datevalues)
+        if format is None:
+            head = list(islice(datevalues, sample))
+            format = inferFormat(head)
+            datevalues = chain(head, datevalues)
+        self.format = format
+        self.fallback_rows = []
+        self._parser = None if format is None else _compileFormat(format)
+        self._values = enumerate(datevalues)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row, value = next(self._values)
+        if self._parser is not None:
+            try:
+                return self._parser(value)
+            except (ValueError, TypeError):
+                pass
+        self.fallback_rows.append(row)
+        return dateCleanup(value)
+
+
+def parse_many(datevalues, format=None, sample=100):
+    """
+    FUNCTION: parse_many
+
+    DESCRIPTION:
+        Parses a column of dates that share one format. The format is taken
+        from "format" (a strptime format such as "%d.%m.%Y", or "epoch_ms" /
+        "epoch_s") or inferred once from the first "sample" values, compiled
+        into a specialized parser and applied to every value. Values that
+        don't match fall back to "dateCleanup" and are reported in
+        "fallback_rows".
+
+    ARGUMENTS:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES          | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # datevalues         | iterable       | Dates to parse (streamed).
+        # format             | string         | Optional format hint.
+        # sample             | int            | Values used to infer the format.
+        # ----------------------------------------------------------------------------------
+
+    RETURNS:
+        ParseStream (iterator of datetime.datetime)
+
+    EXAMPLES:
+        >>> stream = parse_many(["20200205", "2020-02-06", "20200207"])
+        >>> [d.strftime("%Y%m%d") for d in stream]
+        ['20200205', '20200206', '20200207']
+        >>> stream.format, stream.fallback_rows
+        ('%Y%m%d', [1])
+    """
+    return ParseStream(datevalues, format=format, sample=sample)
+
+
+# -----------------------------------------------------------------------------
+# epoch batches ("epoch_dates", "epoch_datetimes", "epoch_split")
+# -----------------------------------------------------------------------------
+def epoch_split(timestamps):
+    """
+    FUNCTION: epoch_split
+
+    DESCRIPTION:
+        Splits epoch milliseconds with integer division into two lists: the
+        proleptic ordinal of each day (UTC) and the milliseconds since its
+        midnight. No date or datetime objects are created.
+
+    ARGUMENTS:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES          | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # timestamps         | iterable       | Epoch milliseconds (ints).
+        # ----------------------------------------------------------------------------------
+
+    RETURNS:
+        tuple (ordinals, milliseconds of day)
+
+    EXAMPLES:
+        >>> epoch_split([1571824800000, -1])
+        ([737355, 719162], [36000000, 86399999])
+    """
+    ordinals = []
+    times = []
+    for timestamp in timestamps:
+        days, ms = divmod(int(timestamp), MS_PER_DAY)
+        ordinals.append(days + EPOCH_ORDINAL)
+        times.append(ms)
+    return ordinals, times
+
+
+def epoch_dates(timestamps, returns="date"):
+    """
+    FUNCTION: epoch_dates
+
+    DESCRIPTION:
+        Returns the (UTC) day of each of the epoch milliseconds "timestamps"
+        as a list, using integer division only. returns="ordinal" creates no
+        objects at all; the other result types are built once per distinct
+        day, so a batch spanning a few days costs one division per value.
+
+    ARGUMENTS:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES          | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # timestamps         | iterable       | Epoch milliseconds (ints).
+        # returns            | string         | date, ordinal, str or int. Default = date
+        # ----------------------------------------------------------------------------------
+
+    EXAMPLES:
+        >>> epoch_dates([1571824800000, 1571875199999])
+        [datetime.date(2019, 10, 23), datetime.date(2019, 10, 23)]
+        >>> epoch_dates([1571824800000], returns="int")
+        [20191023]
+    """
+    if returns not in RETURNS:
+        raise ValueError("returns must be one of {}, got {!r}".format(RETURNS, returns))
+    if returns == "ordinal":
+        return [
+            int(timestamp) // MS_PER_DAY + EPOCH_ORDINAL for timestamp in timestamps
+        ]
+    days = {}
+    results = []
+    for timestamp in timestamps:
+        ordinal = int(timestamp) // MS_PER_DAY + EPOCH_ORDINAL
+        result = days.get(ordinal)
+        if result is None:
+            result = days[ordinal] = _returnDate(ordinal, returns)
+        results.append(result)
+    return results
+
+
+def epoch_datetimes(timestamps):
+    """
+    FUNCTION: epoch_datetimes
+
+    DESCRIPTION:
+        Returns the naive (UTC) datetime.datetime of each of the epoch
+        milliseconds "timestamps", exact to the millisecond (same result as
+        dateCleanup(value, epoch=True) without the per-value overhead). The
+        date part is computed once per distinct day.
+
+    EXAMPLES:
+        >>> epoch_datetimes([1571824800123])
+        [datetime.datetime(2019, 10, 23, 10, 0, 0, 123000)]
+    """
+    days = {}
+    results = []
+    for timestamp in timestamps:
+        ordinal, ms = divmod(int(timestamp), MS_PER_DAY)
+        ymd = days.get(ordinal)
+        if ymd is None:
+            day = date.fromordinal(ordinal + EPOCH_ORDINAL)
+            ymd = days[ordinal] = (day.year, day.month, day.day)
+        seconds, ms = divmod(ms, 1000)
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        results.append(datetime(*ymd, hours, minutes, seconds, ms * 1000))
+    return results
+
+
+def _toOrdinal(datevalue, epoch=False):
+    # -------------------------------------------------------------------------
+    # proleptic ordinal of a date/datetime or int (no parsing), an epoch in
+    # milliseconds (integer division) or anything "dateCleanup" accepts.
+    # ints of years 1000-2699 are ordinals, 8 digit ints are YYYYMMDD, other
+    # ints go to "dateCleanup" (which rejects them).
+    # -------------------------------------------------------------------------
+    if isinstance(datevalue, date):
+        return datevalue.toordinal()
+    if epoch:
+        return int(datevalue) // MS_PER_DAY + EPOCH_ORDINAL
+    if type(datevalue) is int:
+        if _INT_ORDINALS[0] <= datevalue <= _INT_ORDINALS[1]:
+            return datevalue
+        if 10000000 <= datevalue <= 99999999:
+            year, monthday = divmod(datevalue, 10000)
+            return date(year, *divmod(monthday, 100)).toordinal()
+    return dateCleanup(datevalue).toordinal()
+
+
+def _returnDate(ordinal, returns):
+    # -------------------------------------------------------------------------
+    # result of the date returning functions: "%Y%m%d" string (default),
+    # datetime.date, proleptic ordinal or YYYYMMDD int
+    # -------------------------------------------------------------------------
+    if returns == "str":
+        return date.fromordinal(ordinal).strftime("%Y%m%d")
+    if returns == "date":
+        return date.fromordinal(ordinal)
+    if returns == "ordinal":
+        return ordinal
+    if returns == "int":
+        result = date.fromordinal(ordinal)
+        return result.year * 10000 + result.month * 100 + result.day
+    raise ValueError("returns must be one of {}, got {!r}".format(RETURNS, returns))
+
+
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+class Weekmask(object):
+    """
+    CLASS: Weekmask
+
+    DESCRIPTION:
+        The working weekdays of a calendar compiled into a 7-bit mask (bit 0
+        = Monday) plus a prefix table of the working weekdays before each
+        weekday, so counting and indexing working weekdays stays O(1) for any
+        weekend definition.
+
+    ARGUMENTS:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES          | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # weekmask           | string         | "1111100" (Mon..Sun, 1 = working day),
+        #                    |                | "Sun Mon Tue Wed Thu" (day names),
+        #                    |                | an int bitmask (bit 0 = Monday) or a
+        #                    |                | Weekmask. Default = "1111100" (Mon-Fri)
+        # ----------------------------------------------------------------------------------
+
+    EXAMPLES:
+        >>> Weekmask("1111001").workdays    # Friday/Saturday weekend
+        ('Mon', 'Tue', 'Wed', 'Thu', 'Sun')
+        >>> str(Weekmask("Mon Tue Wed Thu Fri Sat"))
+        '1111110'
+    """
+
+    __slots__ = ("bits", "days", "_prefix", "_workdays")
+
+    def __init__(self, weekmask="1111100"):
+        bits = _weekmaskBits(weekmask)
+        if not 0 < bits < 128:
+            raise ValueError(
+                "weekmask needs at least one working day, got {!r}".format(weekmask)
+            )
+        self.bits = bits
+        self._workdays = tuple(d for d in range(7) if bits >> d & 1)
+        self.days = len(self._workdays)
+        # _prefix[d]: working weekdays before weekday d (Monday = 0)
+        self._prefix = tuple(sum(1 for w in self._workdays if w < d) for d in range(8))
+
+    def __repr__(self):
+        return "Weekmask({!r})".format(str(self))
+
+    def __str__(self):
+        return "".join("1" if self.bits >> d & 1 else "0" for d in range(7))
+
+    def __eq__(self, other):
+        if not isinstance(other, Weekmask):
+            return NotImplemented
+        return self.bits == other.bits
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    @property
+    def workdays(self):
+        """Names of the working weekdays."""
+        return tuple(WEEKDAYS[d] for d in self._workdays)
+
+    def isWorkday(self, ordinal):
+        """Returns True when the weekday of "ordinal" is a working weekday."""
+        return self.bits >> (ordinal - 1) % 7 & 1 == 1
+
+    def workdayOrdinals(self, ordinals):
+        """Sorted tuple of the "ordinals" that fall on working weekdays."""
+        bits = self.bits
+        return tuple(sorted(o for o in ordinals if bits >> (o - 1) % 7 & 1))
+
+    def countBefore(self, ordinal):
+        # ---------------------------------------------------------------------
+        # count the working weekdays in [1, ordinal). Ordinal 1 (0001-01-01)
+        # is a Monday, so every 7 days hold "days" working weekdays.
+        # ---------------------------------------------------------------------
+        weeks, day = divmod(ordinal - 1, 7)
+        return weeks * self.days + self._prefix[day]
+
+    def nthWorkday(self, index):
+        # ---------------------------------------------------------------------
+        # inverse of "countBefore": the ordinal of the working weekday that
+        # has exactly "index" working weekdays before it.
+        # ---------------------------------------------------------------------
+        weeks, day = divmod(index, self.days)
+        return 1 + weeks * 7 + self._workdays[day]
+
+
+def _weekmaskBits(weekmask):
+    # -------------------------------------------------------------------------
+    # 7-bit mask (bit 0 = Monday) of a mask string, day names or an int
+    # -------------------------------------------------------------------------
+    if isinstance(weekmask, Weekmask):
+        return weekmask.bits
+    if isinstance(weekmask, int):
+        return weekmask
+    if isinstance(weekmask, str):
+        if len(weekmask) == 7 and set(weekmask) <= set("01"):
+            return sum(1 << d for d, flag in enumerate(weekmask) if flag == "1")
+        weekmask = weekmask.replace(",", " ").split()
+    bits = 0
+    for name in weekmask:
+        day = str(name).strip()[:3].title()
+        if day not in WEEKDAYS:
+            raise ValueError("unknown weekday {!r} in weekmask".format(name))
+        bits |= 1 << WEEKDAYS.index(day)
+    return bits
+
+
+MON_FRI = Weekmask()
+_weekmasks = {None: MON_FRI, "1111100": MON_FRI, MON_FRI.bits: MON_FRI}
+
+
+def _weekmask(weekmask):
+    # -------------------------------------------------------------------------
+    # compiled Weekmask (each distinct mask is compiled once)
+    # -------------------------------------------------------------------------
+    if isinstance(weekmask, Weekmask):
+        return weekmask
+    try:
+        return _weekmasks[weekmask]
+    except KeyError:
+        compiled = _weekmasks[weekmask] = Weekmask(weekmask)
+        return compiled
+    except TypeError:  # unhashable list of day names
+        return Weekmask(weekmask)
+
+
+def _steps(offset):
+    # -------------------------------------------------------------------------
+    # number of steps the day-by-day loop took for "offset": none for
+    # offset <= 0, ceil(offset) for floats (pandas float columns, JSON)
+    # -------------------------------------------------------------------------
+    if offset <= 0:
+        return 0
+    return offset if type(offset) is int else math.ceil(offset)
+
+
+def _offsetWorkdays(ordinal, offset, holidays, weekmask=MON_FRI):
+    """
+    FUNCTION: _offsetWorkdays
+
+    DESCRIPTION:
+        Returns the ordinal of the "offset"'th working day after "ordinal"
+        (or before it when offset is negative). "ordinal" itself is never
+        counted, so weekend and holiday start dates behave exactly like the
+        day-by-day loop "workday"/"workdayStart" used to run.
+
+        With "enableMetrics" the number of holiday waves is recorded in the
+        "workday.iterations" / "workdayStart.iterations" histograms.
+
+        Whole weeks are jumped arithmetically with the "weekmask" prefix
+        tables and "holidays" (a sorted tuple of the ordinals that fall on
+        working weekdays) are skipped with a binary search, so the cost is
+        O(log(holidays)) per holiday "wave" instead of O(offset * holidays).
+    """
+    if offset == 0:
+        return ordinal
+    before = weekmask.countBefore
+    nth = weekmask.nthWorkday
+    skipped = 0
+    waves = 0
+    # -------------------------------------------------------------------------
+    # forward: the (offset + skipped)'th working weekday after ordinal
+    # -------------------------------------------------------------------------
+    if offset > 0:
+        base = before(ordinal + 1) + offset - 1
+        result = nth(base)
+        low = bisect_right(holidays, ordinal)
+        while True:
+            count = bisect_right(holidays, result) - low
+            if count == skipped:
+                if _metrics is not None:
+                    _metrics.observe("workday.iterations", waves)
+                return result
+            skipped = count
+            waves += 1
+            result = nth(base + skipped)
+    # -------------------------------------------------------------------------
+    # backward: the (offset + skipped)'th working weekday before ordinal
+    # -------------------------------------------------------------------------
+    base = before(ordinal) + offset
+    result = nth(base)
+    high = bisect_left(holidays, ordinal)
+    while True:
+        count = high - bisect_left(holidays, result)
+        if count == skipped:
+            if _metrics is not None:
+                _metrics.observe("workdayStart.iterations", waves)
+            return result
+        skipped = count
+        waves += 1
+        result = nth(base - skipped)
+
+
+def _countWorkdays(startordinal, endordinal, holidays, weekmask=MON_FRI):
+    # -------------------------------------------------------------------------
+    # count the working days in [startordinal, endordinal): working weekdays
+    # from the whole-week arithmetic minus the holidays found with bisect
+    # -------------------------------------------------------------------------
+    if startordinal >= endordinal:
+        return 0
+    weekdays = weekmask.countBefore(endordinal) - weekmask.countBefore(startordinal)
+    return weekdays - (
+        bisect_left(holidays, endordinal) - bisect_left(holidays, startordinal)
+    )
+
+
+def _checkQtrList(listobj):
+    # -------------------------------------------------------------------------
+    # checkQtrList
+    # -------------------------------------------------------------------------
+    months = [
+        "Jan",
+        "Feb",
+        "Mar",
+        "Apr",
+        "May",
+        "Jun",
+        "Jul",
+        "Aug",
+        "Sep",
+        "Oct",
+        "Nov",
+        "Dec",
+    ]
+    qtrcheck = ""
+    # -------------------------------------------------------------------------
+    if (type(listobj) is list) is True:
+        if len(listobj) == 3:
+            qtrcheck = True
+            qm = 0
+            while qm < 2:
+                if listobj[qm] in months:
+                    qtrcheck = True
+                    qm += 1
+                else:
+                    qtrcheck = False
+                    qm = 2
+        else:
+            qtrcheck = False
+    return qtrcheck
+
+
+def _qtrEndMonth(startdate, **kwargs):
+    # -------------------------------------------------------------------------
+    # move "startdate" (the 28th of its month) to the last month of its Qtr
+    # -------------------------------------------------------------------------
+    monthNumber = ""
+    items = ""
+    # -------------------------------------------------------------------------
+    # Default Qtr list (Calendar Year)
+    # -------------------------------------------------------------------------
+    Q1 = ["Jan", "Feb", "Mar"]
+    Q2 = ["Apr", "May", "Jun"]
+    Q3 = ["Jul", "Aug", "Sep"]
+    Q4 = ["Oct", "Nov", "Dec"]
+    # -------------------------------------------------------------------------
+    # Set the optional Quarter variables
+    # -------------------------------------------------------------------------
+    for key, value in kwargs.items():
+        if (type(value) is dict) is True:
+            items = value.items()
+        else:
+            items = kwargs.items()
+    for key, value in items:
+        # ---------------------------------------------------------------------
+        # Setting Q1
+        # ---------------------------------------------------------------------
+        if key == "Q1":
+            qtrcheck = _checkQtrList(value)
+            if qtrcheck is True:
+                Q1 = value
+        # ---------------------------------------------------------------------
+        # Setting Q2
+        # ---------------------------------------------------------------------
+        if key == "Q2":
+            qtrcheck = _checkQtrList(value)
+            if qtrcheck is True:
+                Q2 = value
+        # ---------------------------------------------------------------------
+        # Setting Q3
+        # ---------------------------------------------------------------------
+        if key == "Q3":
+            qtrcheck = _checkQtrList(value)
+            if qtrcheck is True:
+                Q3 = value
+        # ---------------------------------------------------------------------
+        # Setting Q4
+        # ---------------------------------------------------------------------
+        if key == "Q4":
+            qtrcheck = _checkQtrList(value)
+            if qtrcheck is True:
+                Q4 = value
+    # -------------------------------------------------------------------------
+    # Find End of Qtr Month
+    # -------------------------------------------------------------------------
+    # Q1 cutoff
+    # -------------------------------------------------------------------------
+    if startdate.strftime("%b") in Q1:
+        monthNumber = datetime.strptime(Q1[2], "%b").month
+        # ---------------------------------------------------------------------
+        # If month is in Nov or Dec, update year by 1
+        # ---------------------------------------------------------------------
+        if startdate.strftime("%b") in ("Nov", "Dec"):
+            startdate = startdate.replace(startdate.year + 1)
+        startdate = startdate.replace(month=monthNumber)
+    # -------------------------------------------------------------------------
+    # Q2 cutoff
+    # -------------------------------------------------------------------------
+    elif startdate.strftime("%b") in Q2:
+        monthNumber = datetime.strptime(Q2[2], "%b").month
+        startdate = startdate.replace(month=monthNumber)
+    # -------------------------------------------------------------------------
+    # Q3 cutoff
+    # -------------------------------------------------------------------------
+    elif startdate.strftime("%b") in Q3:
+        monthNumber = datetime.strptime(Q3[2], "%b").month
+        startdate = startdate.replace(month=monthNumber)
+    # -------------------------------------------------------------------------
+    # Q4 cutoff
+    # -------------------------------------------------------------------------
+    elif startdate.strftime("%b") in Q4:
+        monthNumber = datetime.strptime(Q4[2], "%b").month
+        startdate = startdate.replace(month=monthNumber)
+    return startdate
+
+
+def _rollBackOrdinal(lastworkday, isHoliday, weekmask=MON_FRI):
+    # -------------------------------------------------------------------------
+    # holiday
+    # -------------------------------------------------------------------------
+    if isHoliday(lastworkday):
+        while isHoliday(lastworkday):
+            lastworkday -= 1
+    # -------------------------------------------------------------------------
+    # If lastworkday is a weekend then move to the last working weekday
+    # (Saturday -> Friday, Sunday -> Friday for the default Mon-Fri mask)
+    # -------------------------------------------------------------------------
+    elif not weekmask.isWorkday(lastworkday):
+        while not weekmask.isWorkday(lastworkday):
+            lastworkday -= 1
+    return lastworkday
+
+
+def _monthEndOrdinal(year, month):
+    # -------------------------------------------------------------------------
+    # last calendar day = first day of the next month - 1
+    # -------------------------------------------------------------------------
+    if month == 12:
+        return date(year + 1, 1, 1).toordinal() - 1
+    return date(year, month + 1, 1).toordinal() - 1
+
+
+def _qtrEndTable(**kwargs):
+    # -------------------------------------------------------------------------
+    # (end month, year shift) of the Qtr of every month, resolved once with
+    # the same rules (and Q1-Q4 overrides) as "lastWorkdayOfQtr"
+    # -------------------------------------------------------------------------
+    table = []
+    for month in range(1, 13):
+        startdate = date(2001, month, 28)
+        qtrend = _qtrEndMonth(startdate, **kwargs)
+        table.append((qtrend.month, qtrend.year - startdate.year))
+    return tuple(table)
+
+
+class FiscalCalendar(object):
+    """
+    CLASS: FiscalCalendar
 
     DESCRIPTION:
-        Returns datetime.datetime(y, m, d, h, M, s) of "datevalue".
+        A quarter definition compiled once. Month based calendars keep a
+        12-entry table of (quarter end month, year rollover) so resolving the
+        quarter end of a date is one index; retail (4-4-5) calendars keep the
+        12 period ends of every fiscal year they have seen.
 
-    ARGUMENT:
+        Pass it as fiscal=... to "lastWorkdayOfQtr" and "iter_period_ends".
+
+    ARGUMENTS:
         # ----------------------------------------------------------------------------------
-        # ARGUMENTS          | TYPES              | DESCRIPTION
+        # ARGUMENTS          | TYPES          | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # **kwargs           | list/dict      | Q1-Q4 month lists, same as the optional
+        #                    |                | kwargs of "lastWorkdayOfQtr".
         # ----------------------------------------------------------------------------------
-        # datevalue          | string/int         | Date for working days.
-        # **optional epoch   | boolean            | Default = False
-
-        "datevalue" is expected to be Type string unless epoch=True,
-        Then datevalue expected to be Type Int.
 
     EXAMPLES:
+        >>> fy = FiscalCalendar(Q1=["Nov", "Dec", "Jan"], Q2=["Feb", "Mar", "Apr"])
+        >>> lastWorkdayOfQtr("20200213", fiscal=fy)
+        '20200430'
+        >>> fy = FiscalCalendar.fromStartMonth("Oct")
+        >>> fy.quarterEnd("20201115")
+        datetime.date(2020, 12, 31)
+        >>> retail = FiscalCalendar.retail(yearEndMonth=1, weekday=5, method="nearest")
+        >>> retail.quarterEnd("20200315")
+        datetime.date(2020, 5, 2)
+    """
+
+    __slots__ = ("_table", "_retail", "_years")
+
+    PATTERNS = ((4, 4, 5), (4, 5, 4), (5, 4, 4))
+    METHODS = ("last", "nearest")
+
+    def __init__(self, **kwargs):
+        self._table = _qtrEndTable(**kwargs)
+        self._retail = None
+        self._years = None
+
+    @classmethod
+    def fromStartMonth(cls, month):
+        """
+        Fiscal year of three month quarters starting in "month" (1-12 or
+        "%b", e.g. "Oct"). Quarters ending in the next calendar year always
+        roll the year over (the Q1-Q4 kwargs only do so for Nov/Dec in Q1).
+        """
+        if isinstance(month, str):
+            month = datetime.strptime(month, "%b").month
+        if not 1 <= month <= 12:
+            raise ValueError("month must be 1-12, got {}".format(month))
+        calendar = cls()
+        table = []
+        for m in range(1, 13):
+            endmonth = m + 2 - (m - month) % 3
+            table.append((endmonth - 12, 1) if endmonth > 12 else (endmonth, 0))
+        calendar._table = tuple(table)
+        return calendar
+
+    @classmethod
+    def retail(cls, yearEndMonth=12, weekday=5, method="last", pattern=(4, 4, 5)):
+        """
+        52/53-week retail calendar. The fiscal year ends on the last
+        "weekday" (0=Monday .. 6=Sunday) of "yearEndMonth" (method="last") or
+        on the "weekday" nearest to its last day (method="nearest"). Quarters
+        are 13 weeks split into periods by "pattern"; the 53rd week of a long
+        year is added to the last period.
+        """
+        pattern = tuple(pattern)
+        if pattern not in cls.PATTERNS:
+            raise ValueError("pattern must be one of {}".format(cls.PATTERNS))
+        if method not in cls.METHODS:
+            raise ValueError("method must be one of {}".format(cls.METHODS))
+        if not 1 <= yearEndMonth <= 12 or not 0 <= weekday <= 6:
+            raise ValueError("yearEndMonth must be 1-12 and weekday 0-6")
+        calendar = cls()
+        calendar._table = None
+        calendar._retail = (yearEndMonth, weekday, method, pattern)
+        calendar._years = {}
+        return calendar
+
+    def __repr__(self):
+        if self._retail is not None:
+            return (
+                "FiscalCalendar.retail(yearEndMonth={}, weekday={}, "
+                "method={!r}, pattern={})".format(*self._retail)
+            )
+        return "FiscalCalendar(<quarter ends {}>)".format(
+            [month for month, _ in sorted(set(self._table))]
+        )
+
+    # -------------------------------------------------------------------------
+    # retail years
+    # -------------------------------------------------------------------------
+    def _yearEnd(self, year):
+        yearEndMonth, weekday, method, _ = self._retail
+        lastday = _monthEndOrdinal(year, yearEndMonth)
+        if method == "last":
+            return lastday - ((lastday - 1) % 7 - weekday) % 7
+        delta = (weekday - (lastday - 1) % 7) % 7
+        return lastday + (delta - 7 if delta > 3 else delta)
+
+    def _periodEnds(self, year):
         # ---------------------------------------------------------------------
-        # Example German date format:
-        # ---------------------------------------------------------------------
-        >>> dateCleanup('07.04.2020')
-        'datetime.datetime(2020, 4, 7, 0, 0)'
-        # ---------------------------------------------------------------------
-        # Example alpha date short format:
+        # the 12 period end ordinals of fiscal "year" (the year it ends in)
         # ---------------------------------------------------------------------
-        >>> dateCleanup('MAR 25 2020')
-        datetime.datetime(2020, 3, 25, 0, 0)
+        periods = self._years.get(year)
+        if periods is None:
+            start = self._yearEnd(year - 1)
+            weeks = list(accumulate(self._retail[3] * 4))
+            weeks[-1] = (self._yearEnd(year) - start) // 7
+            periods = self._years[year] = tuple(start + 7 * w for w in weeks)
+        return periods
+
+    def _fiscalYear(self, ordinal):
+        year = date.fromordinal(ordinal).year
+        if ordinal > self._yearEnd(year):
+            return year + 1
+        if ordinal <= self._yearEnd(year - 1):
+            return year - 1
+        return year
+
+    # -------------------------------------------------------------------------
+    # ordinal engine
+    # -------------------------------------------------------------------------
+    def _quarterEndOrdinal(self, ordinal):
+        if self._retail is None:
+            startdate = date.fromordinal(ordinal)
+            endmonth, shift = self._table[startdate.month - 1]
+            return _monthEndOrdinal(startdate.year + shift, endmonth)
+        periods = self._periodEnds(self._fiscalYear(ordinal))
+        return periods[2 + 3 * (bisect_left(periods, ordinal) // 3)]
+
+    def _quarterEnds(self, startordinal, endordinal):
         # ---------------------------------------------------------------------
-        # Example date with time format:
+        # every quarter end (each once) of the quarters that overlap the range
         # ---------------------------------------------------------------------
-        >>> dateCleanup('2020-02-28 12:30:00')
-        datetime.datetime(2020, 2, 28, 12, 30)
-    """
+        if self._retail is not None:
+            lastday = self._quarterEndOrdinal(startordinal)
+            while True:
+                yield lastday
+                if lastday >= endordinal:
+                    return
+                lastday = self._quarterEndOrdinal(lastday + 1)
+        start = date.fromordinal(startordinal)
+        end = date.fromordinal(endordinal)
+        year, month = start.year, start.month
+        seen = set()
+        while (year, month) <= (end.year, end.month):
+            endmonth, shift = self._table[month - 1]
+            lastday = _monthEndOrdinal(year + shift, endmonth)
+            if lastday not in seen:
+                seen.add(lastday)
+                yield lastday
+            month += 1
+            if month > 12:
+                year, month = year + 1, 1
+
+    def quarterEnd(self, datevalue):
+        """Returns the last calendar day (datetime.date) of the fiscal quarter."""
+        ordinal = _toOrdinal(datevalue)
+        return date.fromordinal(self._quarterEndOrdinal(ordinal))
+
+    def periodEnd(self, datevalue):
+        """
+        Returns the last calendar day (datetime.date) of the fiscal period:
+        the calendar month, or the 4/5 week period of a retail calendar.
+        """
+        ordinal = _toOrdinal(datevalue)
+        if self._retail is None:
+            startdate = date.fromordinal(ordinal)
+            return date.fromordinal(_monthEndOrdinal(startdate.year, startdate.month))
+        periods = self._periodEnds(self._fiscalYear(ordinal))
+        return date.fromordinal(periods[bisect_left(periods, ordinal)])
+
+    def lastWorkdayOfQtr(self, datevalue, holidays=[], weekmask=None, returns="str"):
+        """Same as "lastWorkdayOfQtr(datevalue, holidays, fiscal=self)"."""
+        return _calendar(holidays, weekmask).lastWorkdayOfQtr(
+            datevalue, returns=returns, fiscal=self
+        )
+
+
+# calendar year quarters and plain months (one month per "quarter")
+_CALENDAR_YEAR = FiscalCalendar()
+_MONTHS = FiscalCalendar()
+_MONTHS._table = tuple((month, 0) for month in range(1, 13))
+_fiscalCache = {}
+
+
+def _fiscal(kwargs):
     # -------------------------------------------------------------------------
-    # Set the Variables
+    # FiscalCalendar of the "lastWorkdayOfQtr" kwargs (fiscal=..., Q1-Q4 or
+    # none for the precompiled calendar year)
     # -------------------------------------------------------------------------
-    datelist = []
-    epoch = False
+    fiscal = kwargs.get("fiscal")
+    if fiscal is not None:
+        return fiscal
+    if not kwargs:
+        return _CALENDAR_YEAR
     # -------------------------------------------------------------------------
-    # check if epoch
+    # Q1-Q4 kwargs are compiled once per distinct definition
     # -------------------------------------------------------------------------
-    for key, value in kwargs.items():
-        if key == "epoch":
-            epoch = value
+    try:
+        key = _freeze(kwargs)
+        return _fiscalCache[key]
+    except TypeError:  # unhashable month names
+        return FiscalCalendar(**kwargs)
+    except KeyError:
+        pass
+    if len(_fiscalCache) >= 64:
+        _fiscalCache.clear()
+    fiscal = _fiscalCache[key] = FiscalCalendar(**kwargs)
+    return fiscal
+
+
+def _freeze(value):
+    # hashable cache key; lists keep their type ("_checkQtrList" only takes
+    # lists, so Q1=[...] and Q1=(...) compile to different calendars)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return (list, tuple(_freeze(v) for v in value))
+    return value
+
+
+class BusinessCalendar(object):
+    """
+    CLASS: BusinessCalendar
+
+    DESCRIPTION:
+        A holiday calendar compiled once and reused for every workday
+        calculation. "holidays" pass through "dateCleanup" a single time and
+        are kept as a frozenset of ordinals (membership tests) plus a sorted
+        tuple of the weekday ordinals (binary searches), so repeated calls
+        don't pay to re-parse the holiday list.
+
+        The module-level workday functions are thin wrappers around this
+        class and also accept a BusinessCalendar as their "holidays".
+
+    ARGUMENTS:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES          | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # holidays           | iterable       | Optional holidays to skip for workdays.
+        # weekmask           | string         | Working weekdays (see Weekmask).
+        #                    |                | Default = "1111100" (Mon-Fri)
+        # ----------------------------------------------------------------------------------
+
+    EXAMPLES:
+        # ----------------------------------------------------------------------------------
+        # compile the holidays once, then reuse the calendar
+        # ----------------------------------------------------------------------------------
+        >>> cal = BusinessCalendar(["20200703", "20200706"])
+        >>> cal.workday("20200702", 3)
+        "20200709"
+        >>> workday("20200702", 3, holidays=cal)
+        "20200709"
+        # ----------------------------------------------------------------------------------
+        # Friday/Saturday weekend
+        # ----------------------------------------------------------------------------------
+        >>> BusinessCalendar(weekmask="1111001").workday("20200702", 1)
+        "20200705"
+    """
+
+    __slots__ = (
+        "_holidays",
+        "_ordinals",
+        "_weekmask",
+        "_index",
+        "_indexBase",
+        "_indexInfo",
+    )
+
+    def __init__(self, holidays=(), weekmask=None):
+        # ---------------------------------------------------------------------
+        # pass all holidays to "dateCleanup" function (once)
+        # ---------------------------------------------------------------------
+        metrics = _metrics
+        if metrics is not None:
+            started = time.perf_counter()
+        ordinals = frozenset(_toOrdinal(dates) for dates in holidays)
+        if metrics is not None:
+            metrics.timing("holidays", time.perf_counter() - started)
+            metrics.count("holidays.parsed", len(ordinals))
+        self._weekmask = weekmask = _weekmask(weekmask)
+        self._holidays = ordinals
+        self._ordinals = weekmask.workdayOrdinals(ordinals)
+        self._index = None
+        self._indexBase = None
+        self._indexInfo = None
+
+    @classmethod
+    def fromOrdinals(cls, ordinals, weekmask=None):
+        """Returns a BusinessCalendar of already parsed holiday ordinals."""
+        calendar = cls(weekmask=weekmask)
+        weekmask = calendar._weekmask
+        ordinals = frozenset(int(o) for o in ordinals)
+        calendar._holidays = ordinals
+        calendar._ordinals = weekmask.workdayOrdinals(ordinals)
+        return calendar
+
+    def __repr__(self):
+        if self._weekmask == MON_FRI:
+            return "BusinessCalendar(<{} holidays>)".format(len(self._holidays))
+        return "BusinessCalendar(<{} holidays>, weekmask={!r})".format(
+            len(self._holidays), str(self._weekmask)
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, BusinessCalendar):
+            return NotImplemented
+        return (self._holidays, self._weekmask) == (other._holidays, other._weekmask)
+
+    def __hash__(self):
+        return hash((self._holidays, self._weekmask))
+
+    @property
+    def weekmask(self):
+        """The compiled Weekmask of the working weekdays."""
+        return self._weekmask
+
+    @property
+    def holidays(self):
+        """Sorted tuple of the compiled holidays (datetime.date)."""
+        return tuple(date.fromordinal(o) for o in sorted(self._holidays))
+
+    def isHoliday(self, datevalue):
+        """Returns True when "datevalue" is one of the compiled holidays."""
+        return self._isHoliday(_toOrdinal(datevalue))
+
+    def isWorkday(self, datevalue):
+        """Returns True when "datevalue" is a working weekday and not a holiday."""
+        return self._isWorkday(_toOrdinal(datevalue))
+
     # -------------------------------------------------------------------------
-    # set datevalue
+    # ordinal engine (every method goes through these)
     # -------------------------------------------------------------------------
-    if epoch:
-        datevalue = int(datevalue)
-        cleanupdate = datetime.utcfromtimestamp(datevalue / 1000)
-    else:
-        datevalue = str(datevalue)
-        # ---------------------------------------------------------------------
-        # use regex to to separate datevalue into "Year, Month, and Day"
-        # ---------------------------------------------------------------------
-        # German date formats
-        # Referencing https://en.wikipedia.org/wiki/Date_format_by_country
-        # The format dd.mm.yyyy using dots (which denotes ordinal numbering).
-        # ---------------------------------------------------------------------
-        germanDateFormat = re.match(r"([0-9]{2}\.[0-9]{2}\.[0-9]{4})", datevalue)
-        if germanDateFormat:
-            datelist = re.findall(r"[\w':\w':\w']+", datevalue)
-            d = int(datelist[0])
-            m = int(datelist[1])
-            y = int(datelist[2])
-            h = 0
-            M = 0
-            s = 0
-            for value in datelist:
-                # -------------------------------------------------------------
-                # checking for time patterns
-                # -------------------------------------------------------------
-                if re.match(r"([0-9]{2}:[0-9]{2}:[0-9])", value):
-                    h = int(value[0:2])
-                    M = int(value[3:5])
-                    s = int(value[6:8])
-        else:
-            # -----------------------------------------------------------------
-            # Clean date string (adding a space between DD & hh)
-            # when pattern like 'YYYY-MM-DDhh:mm:ss' to 'YYYY-MM-DD hh:mm:ss'
-            # or
-            # when pattern like 'YYYY:MM:DDhh:mm:ss' to 'YYYY-MM-DD hh:mm:ss'
-            # -----------------------------------------------------------------
-            datevalue = re.sub(
-                r"\W",
-                "-",
-                re.sub(r"(?<=[0-9]{4}\W[0-9]{2}\W[0-9]{2})(?=[^\s:])", r" ", datevalue),
-                count=2,
-            )
-            # -----------------------------------------------------------------
-            # Splitting patterns into a list
-            # -----------------------------------------------------------------
-            datelist = re.findall(r"[\w':\w':\w.\w']+", datevalue)
-            # -----------------------------------------------------------------
-            # datevalue has separators (list of numbers)
-            # -----------------------------------------------------------------
-            m = 0
-            h = 0
-            M = 0
-            s = 0
-            if len(datelist) > 1:
-                for value in datelist:
-                    # ---------------------------------------------------------
-                    # checking for Months written as "alpha"
-                    # then convert to number
-                    # ---------------------------------------------------------
-                    # example: Jan to 1 or March to 3
-                    # ---------------------------------------------------------
-                    if value.isalpha() is True:
-                        m = int(datetime.strptime(value[0:3].capitalize(), "%b").month)
-                    # ---------------------------------------------------------
-                    # checking for ISO 8601 Time patterns
-                    # ---------------------------------------------------------
-                    elif re.match(r"([a-zA-Z][0-9]{2}:.)", value):
-                        h = int(value[1:3])
-                        M = int(value[4:6])
-                        s = int(value[7:9])
-                    # ---------------------------------------------------------
-                    # checking for Time patterns
-                    # ---------------------------------------------------------
-                    elif re.match(r"([0-9]{2}:[0-9]{2}:[0-9])", value):
-                        h = int(value[0:2])
-                        M = int(value[3:5])
-                        s = int(value[6:8])
-                    # ---------------------------------------------------------
-                    # UTC Timezone Format
-                    # ---------------------------------------------------------
-                    elif re.match(r"(\w[0-9]{2}:[0-9]{2}:[0-9]{2}\w)", value):
-                        h = int(value[1:3])
-                        M = int(value[4:6])
-                        s = int(value[7:9])
-                    # ---------------------------------------------------------
-                    # checking for Year patterns
-                    # ---------------------------------------------------------
-                    elif len(value) == 4:
-                        y = int(value)
-                    # ---------------------------------------------------------
-                    # checking for Day patterns
-                    # ---------------------------------------------------------
-                    elif int(value) > 12 and int(value) <= 31:
-                        d = int(value)
-                    # ---------------------------------------------------------
-                    # checking if the value is <= 12, either Month or Day so if
-                    # Month is not all ready defined (by alpha pattern) set it
-                    # ---------------------------------------------------------
-                    elif int(value) <= 12:
-                        if m != 0:
-                            d = int(value)
-                        else:
-                            m = int(value)
+    def _isHoliday(self, ordinal):
+        return ordinal in self._holidays
+
+    def _isWorkday(self, ordinal):
+        return (
+            self._weekmask.bits >> (ordinal - 1) % 7 & 1 == 1
+            and ordinal not in self._holidays
+        )
+
+    def _offset(self, ordinal, offset):
+        index = self._index
+        if index is not None and offset:
             # -----------------------------------------------------------------
-            # datevalue has no separators (string of numbers)
+            # index lookup: index[i] is the working days in [base, base + i)
             # -----------------------------------------------------------------
-            elif len(datelist) == 1:
-                datevalue = datevalue.ljust(14, "0")
-                y = int(datevalue[0:4])
-                m = int(datevalue[4:6])
-                d = int(datevalue[6:8])
-                h = int(datevalue[8:10])
-                M = int(datevalue[10:12])
-                s = int(datevalue[12:14])
+            i = ordinal - self._indexBase
+            if offset > 0 and 0 <= i < len(index) - 1:
+                j = bisect_left(index, index[i + 1] + offset, i + 1)
+                if j < len(index):
+                    if _metrics is not None:
+                        _metrics.count("index.hits")
+                    return self._indexBase + j - 1
+            elif offset < 0 and 0 <= i < len(index):
+                target = index[i] + offset
+                if target >= 0:
+                    if _metrics is not None:
+                        _metrics.count("index.hits")
+                    return self._indexBase + bisect_left(index, target + 1, 0, i) - 1
+        return _offsetWorkdays(ordinal, offset, self._ordinals, self._weekmask)
+
+    def _count(self, startordinal, endordinal):
+        index = self._index
+        if index is not None and startordinal < endordinal:
+            start = startordinal - self._indexBase
+            end = endordinal - self._indexBase
+            if 0 <= start and end < len(index):
+                return index[end] - index[start]
+        return _countWorkdays(startordinal, endordinal, self._ordinals, self._weekmask)
+
+    # -------------------------------------------------------------------------
+    # optional dense index
+    # -------------------------------------------------------------------------
+    def buildIndex(self, startyear=DEFAULT_HORIZON[0], endyear=DEFAULT_HORIZON[1]):
+        """
+        Builds a dense cumulative-workday index (array('i'), one entry per
+        calendar day from Jan 1 "startyear" to Dec 31 "endyear") so
+        "workday", "workdayStart" and "compareWorkingDays" become array reads
+        plus one binary search. Dates outside the horizon fall back to the
+        arithmetic engine. Returns "indexInfo()".
+        """
+        started = time.perf_counter()
+        base = date(startyear, 1, 1).toordinal()
+        last = date(endyear, 12, 31).toordinal()
+        workdays = (self._isWorkday(o) for o in range(base, last + 1))
+        index = array("i", accumulate(chain((0,), workdays)))
+        self._setIndex(
+            index, base, build_seconds=round(time.perf_counter() - started, 6)
+        )
+        return self.indexInfo()
+
+    def _setIndex(self, index, base, **info):
+        self._index = index
+        self._indexBase = base
+        self._indexInfo = dict(
+            start=date.fromordinal(base).isoformat(),
+            end=date.fromordinal(base + len(index) - 2).isoformat(),
+            days=len(index) - 1,
+            bytes=len(index) * index.itemsize,
+            **info
+        )
+
+    def dropIndex(self):
+        """Removes the dense index (back to the arithmetic engine)."""
+        self._index = self._indexBase = self._indexInfo = None
+
+    def indexInfo(self):
+        """Returns the horizon, size and build time of the index (or None)."""
+        if self._indexInfo is None:
+            return None
+        return dict(self._indexInfo)
+
+    def workday(self, datevalue, offset, returns="str"):
+        """Same as the module-level "workday" using this calendar."""
         # ---------------------------------------------------------------------
-        # pass the datelist values to the "date" function
+        # jump to the offset'th working day after datevalue
+        # (offsets <= 0 return datevalue unchanged)
         # ---------------------------------------------------------------------
-        try:
-            cleanupdate = datetime(y, m, d, h, M, s)
-        except Exception as e:
-            raise Exception(
-                "The error raised is: {0}. y = {1}, m = {2}, d = {3}, datevalue = {4}".format(
-                    e, y, m, d, datevalue
+        metrics = _metrics
+        if metrics is not None:
+            started = time.perf_counter()
+        startdate = _toOrdinal(datevalue)
+        workdays = _returnDate(self._offset(startdate, _steps(offset)), returns)
+        if metrics is not None:
+            metrics.timing("workday", time.perf_counter() - started)
+        return workdays
+
+    def workdayStart(self, datevalue, offset, returns="str"):
+        """Same as the module-level "workdayStart" using this calendar."""
+        # ---------------------------------------------------------------------
+        # jump to the offset'th working day before datevalue
+        # (offsets <= 0 return datevalue unchanged)
+        # ---------------------------------------------------------------------
+        metrics = _metrics
+        if metrics is not None:
+            started = time.perf_counter()
+        startdate = _toOrdinal(datevalue)
+        workdaystart = _returnDate(self._offset(startdate, -_steps(offset)), returns)
+        if metrics is not None:
+            metrics.timing("workdayStart", time.perf_counter() - started)
+        return workdaystart
+
+    def compareWorkingDays(self, datevalue, comparedate, signed=False):
+        """Same as the module-level "compareWorkingDays" using this calendar."""
+        metrics = _metrics
+        if metrics is not None:
+            started = time.perf_counter()
+        startdate = _toOrdinal(datevalue)
+        comparedate = _toOrdinal(comparedate)
+        # ---------------------------------------------------------------------
+        # reversed range
+        # ---------------------------------------------------------------------
+        if comparedate < startdate:
+            networkdays = -self._count(comparedate, startdate) if signed else 0
+        else:
+            networkdays = self._count(startdate, comparedate)
+        if metrics is not None:
+            metrics.timing("compareWorkingDays", time.perf_counter() - started)
+        return networkdays
+
+    def lastWorkdayOfMonth(self, datevalue, returns="str"):
+        """Same as the module-level "lastWorkdayOfMonth" using this calendar."""
+        metrics = _metrics
+        if metrics is not None:
+            started = time.perf_counter()
+        startdate = date.fromordinal(_toOrdinal(datevalue))
+        lastworkday = _monthEndOrdinal(startdate.year, startdate.month)
+        lastworkday = _rollBackOrdinal(lastworkday, self._isHoliday, self._weekmask)
+        lastworkday = _returnDate(lastworkday, returns)
+        if metrics is not None:
+            metrics.timing("lastWorkdayOfMonth", time.perf_counter() - started)
+        return lastworkday
+
+    def lastWorkdayOfQtr(self, datevalue, returns="str", **kwargs):
+        """Same as the module-level "lastWorkdayOfQtr" using this calendar."""
+        metrics = _metrics
+        if metrics is not None:
+            started = time.perf_counter()
+        startdate = _toOrdinal(datevalue)
+        # ---------------------------------------------------------------------
+        # Set last day of qtr (compiled FiscalCalendar lookup)
+        # ---------------------------------------------------------------------
+        lastworkday = _fiscal(kwargs)._quarterEndOrdinal(startdate)
+        lastworkday = _rollBackOrdinal(lastworkday, self._isHoliday, self._weekmask)
+        lastworkday = _returnDate(lastworkday, returns)
+        if metrics is not None:
+            metrics.timing("lastWorkdayOfQtr", time.perf_counter() - started)
+        return lastworkday
+
+
+_NO_HOLIDAYS = BusinessCalendar()
+
+
+def _calendar(holidays, weekmask=None):
+    # -------------------------------------------------------------------------
+    # reuse a compiled BusinessCalendar, otherwise compile the holidays list
+    # -------------------------------------------------------------------------
+    if isinstance(holidays, BusinessCalendar):
+        if weekmask is not None and _weekmask(weekmask) != holidays._weekmask:
+            raise ValueError(
+                "weekmask {!r} conflicts with the calendar weekmask {!r}".format(
+                    str(_weekmask(weekmask)), str(holidays._weekmask)
                 )
             )
-    return cleanupdate
+        return holidays
+    if holidays is None:
+        holidays = ()
+    # no truth test: numpy arrays / pandas Series have no truth value
+    if weekmask is None and hasattr(holidays, "__len__") and len(holidays) == 0:
+        return _NO_HOLIDAYS
+    return BusinessCalendar(holidays, weekmask)
 
 
-def workday(datevalue, offset, holidays=[]):
+def workday(datevalue, offset, holidays=[], weekmask=None, returns="str"):
     """
     FUNCTION: workday
 
@@ -191,13 +1814,16 @@ def workday(datevalue, offset, holidays=[]):
         # ----------------------------------------------------------------------------------
         # ARGUMENTS          | TYPES          | DESCRIPTION
         # ----------------------------------------------------------------------------------
-        # datevalue          | string         | Date for working days.
+        # datevalue          | string         | Date for working days (or date/ordinal).
         # offset             | int            | Number of business days from datevalue.
         # holidays           | list           | Optional holidays to skip for workdays.
+        # weekmask           | string         | Working weekdays. Default = "1111100"
+        # returns            | string         | "str" (%Y%m%d), "date", "ordinal" or
+        #                    |                | "int" (YYYYMMDD). Default = "str"
         # ----------------------------------------------------------------------------------
 
     RETURNS:
-        workdays.strftime("%Y%m%d")
+        workdays.strftime("%Y%m%d") (or the "returns" type)
 
     EXAMPLES:
         # ----------------------------------------------------------------------------------
@@ -205,51 +1831,16 @@ def workday(datevalue, offset, holidays=[]):
         # ----------------------------------------------------------------------------------
         >>> start = workday('20210801', 7)
         "20210810"
+        # ----------------------------------------------------------------------------------
+        # chain calls without formatting and re-parsing the dates
+        # ----------------------------------------------------------------------------------
+        >>> lastWorkdayOfMonth(workday(date(2021, 8, 1), 7, returns="date"))
+        "20210831"
     """
-    # -------------------------------------------------------------------------
-    # Workday Function
-    # -------------------------------------------------------------------------
-    # pass datevalue to the "dateCleanup" function
-    # -------------------------------------------------------------------------
-    startdate = dateCleanup(str(datevalue)).date()
-    # -------------------------------------------------------------------------
-    # pass all holidays to "dateCleanup" function
-    # -------------------------------------------------------------------------
-    holidays = [dateCleanup(str(dates)).date() for dates in holidays]
-    i = 0
-    workdays = startdate
-    # -------------------------------------------------------------------------
-    # iterate through offset to return working days
-    # -------------------------------------------------------------------------
-    while i < offset:
-        # ---------------------------------------------------------------------
-        # holiday
-        # ---------------------------------------------------------------------
-        if workdays + timedelta(days=1) in holidays:
-            workdays += timedelta(days=1)
-            # -----------------------------------------------------------------
-            # holidays don't count for offset, so add 1
-            # -----------------------------------------------------------------
-            offset += 1
-        # ---------------------------------------------------------------------
-        # weekday
-        # ---------------------------------------------------------------------
-        elif workdays.isoweekday() < 5 or workdays.isoweekday() == 7:
-            workdays += timedelta(days=1)
-        # ---------------------------------------------------------------------
-        # weekend
-        # ---------------------------------------------------------------------
-        else:
-            workdays += timedelta(days=1)
-            # -----------------------------------------------------------------
-            # weekends don't count for offset, so add 1
-            # -----------------------------------------------------------------
-            offset += 1
-        i += 1
-    return workdays.strftime("%Y%m%d")
+    return _calendar(holidays, weekmask).workday(datevalue, offset, returns)
 
 
-def calendarDay(datevalue, offset):
+def calendarDay(datevalue, offset, returns="str"):
     """
     FUNCTION: workday
 
@@ -259,10 +1850,12 @@ def calendarDay(datevalue, offset):
         # ----------------------------------------------------------------------------------
         # datevalue          | string         | Date for calendar days.
         # offset             | int            | Number of business days from datevalue.
+        # returns            | string         | "str" (%Y%m%d), "date", "ordinal" or
+        #                    |                | "int" (YYYYMMDD). Default = "str"
         # ----------------------------------------------------------------------------------
 
     RETURNS:
-        caldays.strftime("%Y%m%d")
+        caldays.strftime("%Y%m%d") (or the "returns" type)
 
     EXAMPLES:
         # ----------------------------------------------------------------------------------
@@ -276,7 +1869,7 @@ def calendarDay(datevalue, offset):
     # -------------------------------------------------------------------------
     # pass datevalue to the "dateCleanup" function
     # -------------------------------------------------------------------------
-    startdate = dateCleanup(str(datevalue)).date()
+    startdate = date.fromordinal(_toOrdinal(datevalue))
     # -------------------------------------------------------------------------
     i = 0
     caldays = startdate
@@ -289,10 +1882,10 @@ def calendarDay(datevalue, offset):
         # ---------------------------------------------------------------------
         caldays += timedelta(days=1)
         i += 1
-    return caldays.strftime("%Y%m%d")
+    return _returnDate(caldays.toordinal(), returns)
 
 
-def workdayStart(datevalue, offset, holidays=[]):
+def workdayStart(datevalue, offset, holidays=[], weekmask=None, returns="str"):
     """
     FUNCTION: workdayStart
 
@@ -306,10 +1899,13 @@ def workdayStart(datevalue, offset, holidays=[]):
         # datevalue          | string         | Date to calculate the workdayStart from.
         # offset             | int            | Number of business days from datevalue.
         # holidays           | list           | Optional holidays to skip for workdays.
+        # weekmask           | string         | Working weekdays. Default = "1111100"
+        # returns            | string         | "str" (%Y%m%d), "date", "ordinal" or
+        #                    |                | "int" (YYYYMMDD). Default = "str"
         # ----------------------------------------------------------------------------------
 
     RETURNS:
-        workdays.strftime("%Y%m%d")
+        workdays.strftime("%Y%m%d") (or the "returns" type)
 
     EXAMPLES:
         # ----------------------------------------------------------------------------------
@@ -318,122 +1914,57 @@ def workdayStart(datevalue, offset, holidays=[]):
         >>> start = workday('20210801', 7)
         "20210722"
     """
-    # -------------------------------------------------------------------------
-    # WorkdayStart Function
-    # -------------------------------------------------------------------------
-    # pass datevalue to the "dateCleanup" function
-    # -------------------------------------------------------------------------
-    startdate = dateCleanup(str(datevalue)).date()
-    # -------------------------------------------------------------------------
-    # pass all holidays to "dateCleanup" function
-    # -------------------------------------------------------------------------
-    holidays = [dateCleanup(str(dates)).date() for dates in holidays]
-    i = 0
-    workdaystart = startdate
-    # -------------------------------------------------------------------------
-    # iterate through offset to return working days
-    # -------------------------------------------------------------------------
-    while i < offset:
-        # ---------------------------------------------------------------------
-        # holiday
-        # ---------------------------------------------------------------------
-        if workdaystart - timedelta(days=1) in holidays:
-            workdaystart -= timedelta(days=1)
-            # -----------------------------------------------------------------
-            # holidays don't count for offset, so add 1
-            # -----------------------------------------------------------------
-            offset += 1
-        # ---------------------------------------------------------------------
-        # weekday
-        # ---------------------------------------------------------------------
-        elif 1 < workdaystart.isoweekday() < 7:
-            workdaystart -= timedelta(days=1)
-        # ---------------------------------------------------------------------
-        # weekend
-        # ---------------------------------------------------------------------
-        else:
-            workdaystart -= timedelta(days=1)
-            # -----------------------------------------------------------------
-            # weekends don't count for offset, so add 1
-            # -----------------------------------------------------------------
-            offset += 1
-        i += 1
-    return workdaystart.strftime("%Y%m%d")
+    return _calendar(holidays, weekmask).workdayStart(datevalue, offset, returns)
 
 
-def compareWorkingDays(datevalue, comparedate, holidays=[]):
-    # -------------------------------------------------------------------------
-    # Compare Workday Function
-    # -------------------------------------------------------------------------
-    # pass datevalue to the "dateCleanup" function
-    startdate = dateCleanup(str(datevalue)).date()
-    comparedate = dateCleanup(str(comparedate)).date()
-    # -------------------------------------------------------------------------
-    # pass all holidays to "dateCleanup" function
-    # -------------------------------------------------------------------------
-    holidays = [dateCleanup(str(dates)).date() for dates in holidays]
-    i = 0
-    # -------------------------------------------------------------------------
-    # iterate through offset to return working days
-    # -------------------------------------------------------------------------
-    while startdate < comparedate:
-        # ---------------------------------------------------------------------
-        # holiday
-        # ---------------------------------------------------------------------
-        if startdate in holidays:
-            # holidays don't count for offset, so skip updating "i"
-            startdate += timedelta(days=1)
-        # ---------------------------------------------------------------------
-        # weekday
-        # ---------------------------------------------------------------------
-        elif startdate.isoweekday() <= 5:
-            startdate += timedelta(days=1)
-            i += 1
-        # ---------------------------------------------------------------------
-        # weekend
-        # ---------------------------------------------------------------------
-        else:
-            # -----------------------------------------------------------------
-            # weekends don't count for offset, so skip updating "i"
-            # -----------------------------------------------------------------
-            startdate += timedelta(days=1)
-    networkdays = i
-    return networkdays
+def compareWorkingDays(
+    datevalue, comparedate, holidays=[], signed=False, weekmask=None
+):
+    """
+    FUNCTION: compareWorkingDays
 
+    DESCRIPTION:
+        Returns the working days (Int) from "datevalue" up to, but not
+        including, "comparedate". A "comparedate" before "datevalue" returns 0
+        unless signed=True, then the working days of the reversed range are
+        returned as a negative number.
 
-def lastWorkdayOfMonth(datevalue, holidays=[]):
-    # -------------------------------------------------------------------------
-    # Last Workday of Month Function
-    # -------------------------------------------------------------------------
-    startdate = dateCleanup(str(datevalue)).date()
-    # -------------------------------------------------------------------------
-    # pass all holidays to "dateCleanup" function
-    # -------------------------------------------------------------------------
-    holidays = [dateCleanup(str(dates)).date() for dates in holidays]
-    nextmonth = startdate.replace(day=28) + timedelta(days=4)  # this will never fail
-    lastworkday = nextmonth - timedelta(days=nextmonth.day)
-    # -------------------------------------------------------------------------
-    # holiday
-    # -------------------------------------------------------------------------
-    if lastworkday in holidays:
-        while lastworkday in holidays:
-            lastworkday -= timedelta(days=1)
-    # -------------------------------------------------------------------------
-    # If lastworkday is a weekend then move to Friday
-    # -------------------------------------------------------------------------
-    # Saturday (subtract 1 day)
-    # -------------------------------------------------------------------------
-    elif lastworkday.isoweekday() == 6:
-        lastworkday -= timedelta(days=1)
+    ARGUMENTS:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES          | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # datevalue          | string         | Start date of the range.
+        # comparedate        | string         | End date of the range (excluded).
+        # holidays           | list           | Optional holidays to skip for workdays.
+        # signed             | boolean        | Default = False
+        # weekmask           | string         | Working weekdays. Default = "1111100"
+        # ----------------------------------------------------------------------------------
+
+    RETURNS:
+        networkdays
+
+    EXAMPLES:
+        # ----------------------------------------------------------------------------------
+        # working days between two dates (and the reversed range)
+        # ----------------------------------------------------------------------------------
+        >>> compareWorkingDays('20200408', '20200413')
+        3
+        >>> compareWorkingDays('20200413', '20200408', signed=True)
+        -3
+    """
+    return _calendar(holidays, weekmask).compareWorkingDays(
+        datevalue, comparedate, signed=signed
+    )
+
+
+def lastWorkdayOfMonth(datevalue, holidays=[], weekmask=None, returns="str"):
     # -------------------------------------------------------------------------
-    # Sunday (subtract 2 days)
+    # Last Workday of Month Function
     # -------------------------------------------------------------------------
-    elif lastworkday.isoweekday() == 7:
-        lastworkday -= timedelta(days=2)
-    return lastworkday.strftime("%Y%m%d")
+    return _calendar(holidays, weekmask).lastWorkdayOfMonth(datevalue, returns)
 
 
-def lastWorkdayOfQtr(datevalue, holidays=[], **kwargs):
+def lastWorkdayOfQtr(datevalue, holidays=[], weekmask=None, returns="str", **kwargs):
     """
     FUNCTION: lastWorkdayOfQtr
 
@@ -454,7 +1985,7 @@ def lastWorkdayOfQtr(datevalue, holidays=[], **kwargs):
         Can be a list or dict.
 
     RETURNS:
-        datestring(%Y%m%d)
+        datestring(%Y%m%d) (or the returns="date"/"ordinal"/"int" type)
 
     EXAMPLES:
         # ---------------------------------------------------------------------
@@ -473,169 +2004,149 @@ def lastWorkdayOfQtr(datevalue, holidays=[], **kwargs):
         >>>lastWorkdayOfQtr('20200213', key=quarters)
         '20200430'
     """
-    # -------------------------------------------------------------------------
-    # checkQtrList
-    # -------------------------------------------------------------------------
-    def checkQtrList(listobj):
-        months = [
-            "Jan",
-            "Feb",
-            "Mar",
-            "Apr",
-            "May",
-            "Jun",
-            "Jul",
-            "Aug",
-            "Sep",
-            "Oct",
-            "Nov",
-            "Dec",
-        ]
-        qtrcheck = ""
-        # ---------------------------------------------------------------------
-        if (type(listobj) is list) is True:
-            if len(listobj) == 3:
-                qtrcheck = True
-                qm = 0
-                while qm < 2:
-                    if listobj[qm] in months:
-                        qtrcheck = True
-                        qm += 1
-                    else:
-                        qtrcheck = False
-                        qm = 2
-            else:
-                qtrcheck = False
-        return qtrcheck
-
     # -------------------------------------------------------------------------
     # Last Workday of Qtr Function
     # -------------------------------------------------------------------------
-    startdate = dateCleanup(str(datevalue)).date()
-    startdate = startdate.replace(day=28)
-    # -------------------------------------------------------------------------
-    # pass all holidays to "dateCleanup" function
-    # -------------------------------------------------------------------------
-    holidays = [dateCleanup(str(dates)).date() for dates in holidays]
-    monthNumber = ""
-    items = ""
-    # -------------------------------------------------------------------------
-    # Default Qtr list (Calendar Year)
-    # -------------------------------------------------------------------------
-    Q1 = ["Jan", "Feb", "Mar"]
-    Q2 = ["Apr", "May", "Jun"]
-    Q3 = ["Jul", "Aug", "Sep"]
-    Q4 = ["Oct", "Nov", "Dec"]
-    # -------------------------------------------------------------------------
-    # Set the optional Quarter variables
-    # -------------------------------------------------------------------------
-    for key, value in kwargs.items():
-        if (type(value) is dict) is True:
-            items = value.items()
-        else:
-            items = kwargs.items()
-    for key, value in items:
-        # ---------------------------------------------------------------------
-        # Setting Q1
-        # ---------------------------------------------------------------------
-        if key == "Q1":
-            qtrcheck = checkQtrList(value)
-            if qtrcheck is True:
-                Q1 = value
-        # ---------------------------------------------------------------------
-        # Setting Q2
-        # ---------------------------------------------------------------------
-        if key == "Q2":
-            qtrcheck = checkQtrList(value)
-            if qtrcheck is True:
-                Q2 = value
-        # ---------------------------------------------------------------------
-        # Setting Q3
-        # ---------------------------------------------------------------------
-        if key == "Q3":
-            qtrcheck = checkQtrList(value)
-            if qtrcheck is True:
-                Q3 = value
-        # ---------------------------------------------------------------------
-        # Setting Q4
-        # ---------------------------------------------------------------------
-        if key == "Q4":
-            qtrcheck = checkQtrList(value)
-            if qtrcheck is True:
-                Q4 = value
-    # -------------------------------------------------------------------------
-    # Find End of Qtr Month
-    # -------------------------------------------------------------------------
-    # Q1 cutoff
-    # -------------------------------------------------------------------------
-    if startdate.strftime("%b") in Q1:
-        monthNumber = datetime.strptime(Q1[2], "%b").month
-        # ---------------------------------------------------------------------
-        # If month is in Nov or Dec, update year by 1
-        # ---------------------------------------------------------------------
-        if startdate.strftime("%b") in ("Nov", "Dec"):
-            startdate = startdate.replace(startdate.year + 1)
-        startdate = startdate.replace(month=monthNumber)
-    # -------------------------------------------------------------------------
-    # Q2 cutoff
-    # -------------------------------------------------------------------------
-    elif startdate.strftime("%b") in Q2:
-        monthNumber = datetime.strptime(Q2[2], "%b").month
-        startdate = startdate.replace(month=monthNumber)
-    # -------------------------------------------------------------------------
-    # Q3 cutoff
-    # -------------------------------------------------------------------------
-    elif startdate.strftime("%b") in Q3:
-        monthNumber = datetime.strptime(Q3[2], "%b").month
-        startdate = startdate.replace(month=monthNumber)
-    # -------------------------------------------------------------------------
-    # Q4 cutoff
-    # -------------------------------------------------------------------------
-    elif startdate.strftime("%b") in Q4:
-        monthNumber = datetime.strptime(Q4[2], "%b").month
-        startdate = startdate.replace(month=monthNumber)
-    # -------------------------------------------------------------------------
-    # Set last day of qtr
-    # -------------------------------------------------------------------------
-    nextmonth = startdate + timedelta(days=4)  # this will never fail
-    lastworkday = nextmonth - timedelta(days=nextmonth.day)
-    # -------------------------------------------------------------------------
-    # holiday
-    # -------------------------------------------------------------------------
-    if lastworkday in holidays:
-        while lastworkday in holidays:
-            lastworkday -= timedelta(days=1)
-    # -------------------------------------------------------------------------
-    # If lastworkday of qtr is a weekend then move to Friday
+    return _calendar(holidays, weekmask).lastWorkdayOfQtr(
+        datevalue, returns=returns, **kwargs
+    )
+
+
+def lastDayOfMonth(datevalue, returns="str"):
     # -------------------------------------------------------------------------
-    # Saturday (subtract 1 day)
+    # Last day of Month Function
     # -------------------------------------------------------------------------
-    elif lastworkday.isoweekday() == 6:
-        lastworkday -= timedelta(days=1)
+    startdate = date.fromordinal(_toOrdinal(datevalue))
+    return _returnDate(_monthEndOrdinal(startdate.year, startdate.month), returns)
+
+
+PERIODS = ("month", "quarter")
+
+
+def _periodEndOrdinals(startDT, endDT, period, calendar, **kwargs):
     # -------------------------------------------------------------------------
-    # Sunday (subtract 2 days)
+    # check the arguments and parse the range now, return the lazy walk over
+    # the months of [startDT, endDT] (each period end once)
     # -------------------------------------------------------------------------
-    elif lastworkday.isoweekday() == 7:
-        lastworkday -= timedelta(days=2)
-    return lastworkday.strftime("%Y%m%d")
+    if period not in PERIODS:
+        raise ValueError("period must be one of {}, got {!r}".format(PERIODS, period))
+    start = _toOrdinal(startDT)
+    end = _toOrdinal(endDT)
+    if period == "quarter":
+        lastdays = _fiscal(kwargs)._quarterEnds(start, end)
+    else:
+        lastdays = _MONTHS._quarterEnds(start, end)
+    return _rollBackAll(lastdays, calendar)
+
+
+def _rollBackAll(lastdays, calendar):
+    isHoliday = calendar._isHoliday
+    weekmask = calendar._weekmask
+    for lastday in lastdays:
+        yield _rollBackOrdinal(lastday, isHoliday, weekmask)
 
 
-def lastDayOfMonth(datevalue):
+def _asdateReturns(asdate, returns, choices=RETURNS):
     # -------------------------------------------------------------------------
-    # Last day of Month Function
+    # deprecated asdate=True of the period end and bucket functions ->
+    # returns="date"
     # -------------------------------------------------------------------------
-    startdate = dateCleanup(str(datevalue)).date()
-    nextmonth = startdate.replace(day=28) + timedelta(days=4)  # this will never fail
-    nextmonth = nextmonth - timedelta(days=nextmonth.day)
-    return nextmonth.strftime("%Y%m%d")
+    if asdate is not None:
+        warnings.warn(
+            'asdate is deprecated, use returns="date"', DeprecationWarning, stacklevel=3
+        )
+        if asdate:
+            returns = "date"
+    if returns not in choices:
+        raise ValueError("returns must be one of {}, got {!r}".format(choices, returns))
+    return returns
+
+
+def iter_period_ends(
+    startDT, endDT, period="month", holidays=[], asdate=None, returns="str", **kwargs
+):
+    """
+    FUNCTION: iter_period_ends
+
+    DESCRIPTION:
+        Yields the last workday of every month (period="month") or quarter
+        (period="quarter") from the month of "startDT" to the month of
+        "endDT", i.e. the distinct "lastWorkdayOfMonth"/"lastWorkdayOfQtr"
+        results of the range. The range and the holidays are parsed once and
+        every period end is rolled back with ordinal arithmetic.
+
+        The arguments are checked when it is called (a bad "period" raises
+        here, not at the first next()); the period ends are computed lazily.
+
+    ARGUMENTS:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES             | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # startDT            | string            | first date of the schedule.
+        # endDT              | string            | last date of the schedule.
+        # period             | string            | "month" or "quarter". Default = month
+        # holidays           | list              | Optional holidays (or BusinessCalendar).
+        # asdate             | boolean           | Deprecated alias of returns="date".
+        # returns            | string            | "str", "date", "ordinal" or "int"
+        #                    |                   | (YYYYMMDD). Default = "str"
+        # **kwargs           |                   | Q1-Q4 overrides of "lastWorkdayOfQtr"
+        #                    |                   | or fiscal=FiscalCalendar, weekmask.
+        # ----------------------------------------------------------------------------------
+
+    RETURNS:
+        iterator of datestring(%Y%m%d) (or the "returns" type)
+
+    EXAMPLES:
+        >>> list(iter_period_ends("20200101", "20201231", "quarter"))
+        ['20200331', '20200630', '20200930', '20201231']
+    """
+    returns = _asdateReturns(asdate, returns)
+    calendar = _calendar(holidays, kwargs.pop("weekmask", None))
+    ordinals = _periodEndOrdinals(startDT, endDT, period, calendar, **kwargs)
+    return (_returnDate(ordinal, returns) for ordinal in ordinals)
+
+
+def period_ends(
+    startDT, endDT, period="month", holidays=[], asdate=None, returns="str", **kwargs
+):
+    """List version of "iter_period_ends" (asdate is deprecated, see there)."""
+    returns = _asdateReturns(asdate, returns)
+    return list(
+        iter_period_ends(startDT, endDT, period, holidays, returns=returns, **kwargs)
+    )
+
+
+def period_end_ordinals(startDT, endDT, period="month", holidays=[], **kwargs):
+    """
+    Array version of "iter_period_ends": array('i') of the proleptic
+    ordinals (date.toordinal()) of the period ends.
+    """
+    return array(
+        "i",
+        _periodEndOrdinals(
+            startDT,
+            endDT,
+            period,
+            _calendar(holidays, kwargs.pop("weekmask", None)),
+            **kwargs
+        ),
+    )
 
 
 def setSortValue(str):
+    """
+    Sets the module-global key used by "dateSort". The key is shared by
+    every thread, see "sort_by_date" for a thread-safe alternative.
+    """
     global sortvalue  # Needed to modify global copy of SortValue
     sortvalue = str
 
 
 def dateSort(DictObj):
+    """
+    Sort key returning DictObj[sortvalue] as-is (string dates sort
+    lexically). Kept for compatibility, see "sort_by_date".
+    """
     try:
         return DictObj[sortvalue]
     except BaseException as msg:
@@ -646,7 +2157,283 @@ def dateSort(DictObj):
         print("Please pass sortvalue in setSortValue(str) function first.")
 
 
-def dateBucketing(startDT, interval, endDT=datetime.utcnow().strftime("%Y%m%d")):
+def _sortOrdinal(value, epoch=False):
+    # -------------------------------------------------------------------------
+    # microseconds since 0001-01-01 of a date, datetime or "dateCleanup" value
+    # -------------------------------------------------------------------------
+    if isinstance(value, datetime):
+        cleanupdate = value
+    elif isinstance(value, date):
+        return value.toordinal() * 86400000000
+    else:
+        cleanupdate = dateCleanup(value, epoch=epoch)
+    seconds = cleanupdate.hour * 3600 + cleanupdate.minute * 60 + cleanupdate.second
+    return (
+        cleanupdate.toordinal() * 86400 + seconds
+    ) * 1000000 + cleanupdate.microsecond
+
+
+def _dateKey(key, epoch=False, memo=True):
+    # -------------------------------------------------------------------------
+    # sort key parsing the record's date once. "memo" keeps the key of every
+    # distinct date value for the duration of one call (repeated dates are
+    # only parsed once); it is off for unbounded streams.
+    # -------------------------------------------------------------------------
+    getter = key if callable(key) else itemgetter(key)
+    if not memo:
+        return lambda record: _sortOrdinal(getter(record), epoch)
+    cache = {}
+
+    def sortKey(record):
+        value = getter(record)
+        try:
+            return cache[value]
+        except KeyError:
+            ordinal = cache[value] = _sortOrdinal(value, epoch)
+            return ordinal
+        except TypeError:  # unhashable value
+            return _sortOrdinal(value, epoch)
+
+    return sortKey
+
+
+def sort_by_date(records, key, reverse=False, epoch=False, errors="raise"):
+    """
+    FUNCTION: sort_by_date
+
+    DESCRIPTION:
+        Returns a new list of "records" sorted by the date in record[key].
+        Every date is parsed once (decorate-sort-undecorate) into an integer
+        ordinal, so string dates in any "dateCleanup" format sort by time and
+        not lexically. No module state is used, so threads can sort on
+        different keys concurrently. The sort is stable.
+
+    ARGUMENTS:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES          | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # records            | iterable       | dicts, sequences or objects to sort.
+        # key                | str/int/func   | record[key], or key(record), is the date.
+        # reverse            | boolean        | Latest first. Default = False
+        # epoch              | boolean        | dates are epoch ms. Default = False
+        # errors             | string         | "raise", or "first"/"last" to place
+        #                    |                | records without a valid date.
+        # ----------------------------------------------------------------------------------
+
+    EXAMPLES:
+        >>> records = [{"d": "2020-07-10"}, {"d": "07.04.2020"}, {"d": "20200702"}]
+        >>> sort_by_date(records, "d")
+        [{'d': '07.04.2020'}, {'d': '20200702'}, {'d': '2020-07-10'}]
+    """
+    if errors not in ("raise", "first", "last"):
+        raise ValueError('errors must be "raise", "first" or "last"')
+    records = list(records)
+    sortKey = _dateKey(key, epoch=epoch)
+    if errors == "raise":
+        keys = [sortKey(record) for record in records]
+    else:
+        # ---------------------------------------------------------------------
+        # invalid dates sort before/after everything regardless of "reverse"
+        # ---------------------------------------------------------------------
+        missing = float("inf") if (errors == "last") != reverse else float("-inf")
+        keys = []
+        for record in records:
+            try:
+                keys.append(sortKey(record))
+            except Exception:
+                keys.append(missing)
+    order = sorted(range(len(records)), key=keys.__getitem__, reverse=reverse)
+    return [records[i] for i in order]
+
+
+def top_n_by_date(records, key, n, latest=True, epoch=False, errors="raise"):
+    """
+    FUNCTION: top_n_by_date
+
+    DESCRIPTION:
+        Returns the "n" latest (or earliest with latest=False) "records" by
+        the date in record[key], newest (oldest) first. Uses a heap of size
+        "n" and no per-date memo, so "records" can be any iterable (also an
+        unbounded stream) and is never fully sorted. "errors" works as in
+        "sort_by_date": "first" keeps records without a valid date ahead of
+        the dated ones, "last" only fills up with them.
+
+    EXAMPLES:
+        >>> top_n_by_date(records, "d", 2)
+        [{'d': '2020-07-10'}, {'d': '20200702'}]
+    """
+    if errors not in ("raise", "first", "last"):
+        raise ValueError('errors must be "raise", "first" or "last"')
+    dateKey = _dateKey(key, epoch=epoch, memo=False)
+    missing = float("inf") if (errors == "last") != latest else float("-inf")
+
+    def sortKey(record):
+        # invalid dates sort before/after everything (see "sort_by_date")
+        try:
+            return dateKey(record)
+        except Exception:
+            if errors == "raise":
+                raise
+            return missing
+
+    select = heapq.nlargest if latest else heapq.nsmallest
+    return select(n, records, key=sortKey)
+
+
+def merge_by_date(*streams, key, reverse=False, epoch=False):
+    """
+    FUNCTION: merge_by_date
+
+    DESCRIPTION:
+        Lazily merges "streams" that are each already sorted by the date in
+        record[key] (e.g. outputs of "sort_by_date" or sorted files) into one
+        sorted iterator with "heapq.merge". Pass the same "reverse" the
+        streams were sorted with.
+
+    EXAMPLES:
+        >>> merged = merge_by_date(sortedPart1, sortedPart2, key="d")
+        >>> next(merged)
+        {'d': '07.04.2020'}
+    """
+    return heapq.merge(
+        *streams, key=_dateKey(key, epoch=epoch, memo=False), reverse=reverse
+    )
+
+
+def _isoBucket(bucket):
+    return (bucket[0].isoformat(), bucket[1].isoformat())
+
+
+def _bucketOutput(returns):
+    # (start, end) date tuple -> the "returns" type of "iter_buckets"
+    if returns == "iso":
+        return _isoBucket
+    if returns == "date":
+        return tuple
+    return lambda bucket: tuple(_returnDate(day.toordinal(), returns) for day in bucket)
+
+
+def _iterWorkdayBuckets(bucketStart, interval, endDT, holidays):
+    # ----------------------------------------------------------------------------------
+    # one linear pass of working-day buckets over the compiled calendar
+    # ----------------------------------------------------------------------------------
+    calendar = _calendar(holidays)
+    start = bucketStart.toordinal()
+    end = endDT.toordinal()
+    if not calendar._isWorkday(start):
+        start = calendar._offset(start, 1)
+    while start <= end:
+        bucketEnd = calendar._offset(start, interval) if interval > 0 else start
+        yield (date.fromordinal(start), date.fromordinal(min(bucketEnd, end)))
+        start = calendar._offset(bucketEnd, 1)
+
+
+def iter_buckets(
+    startDT,
+    interval,
+    endDT=None,
+    asdate=None,
+    workdays=False,
+    holidays=[],
+    returns="iso",
+):
+    """
+    FUNCTION: iter_buckets
+
+    DESCRIPTION:
+        Generator version of "dateBucketing". Buckets are produced lazily with
+        plain date arithmetic; "startDT" and "endDT" are parsed once and the
+        output is only formatted when it is yielded.
+
+    ARGUMENTS:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES             | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # startDT            | string            | start date for bucket range.
+        # interval           | int               | days between start and end dates.
+        # endDT              | string            | end date of bucket range. Default utcnow.
+        # asdate             | boolean           | Deprecated alias of returns="date".
+        # workdays           | boolean           | interval in working days. Default = False
+        # holidays           | list              | Optional holidays to skip for workdays.
+        # returns            | string            | "iso" ("%Y-%m-%d"), or "str", "date",
+        #                    |                   | "ordinal", "int". Default = "iso"
+        # ----------------------------------------------------------------------------------
+
+        With workdays=True every bucket starts on a working day and ends
+        "interval" working days later (skipping weekends and "holidays"), so
+        interval=4 gives buckets of 5 working days.
+
+        The arguments are checked and the range is parsed when it is called;
+        the buckets are produced lazily.
+
+    RETURNS:
+        iterator of (startDT, endDT) as "%Y-%m-%d" strings (or the "returns"
+        type)
+
+    EXAMPLES:
+        >>> list(iter_buckets("20210801", 6, "20210816"))
+        [('2021-08-01', '2021-08-07'), ('2021-08-08', '2021-08-14'),
+         ('2021-08-15', '2021-08-16')]
+        >>> list(iter_buckets("20210801", 4, "20210816", workdays=True))
+        [('2021-08-02', '2021-08-06'), ('2021-08-09', '2021-08-13'),
+         ('2021-08-16', '2021-08-16')]
+    """
+    # ----------------------------------------------------------------------------------
+    # parse the range once
+    # ----------------------------------------------------------------------------------
+    output = _bucketOutput(_asdateReturns(asdate, returns, ("iso",) + RETURNS))
+    bucketStart = date.fromordinal(_toOrdinal(startDT))
+    today = datetime.utcnow().date()
+    endDT = today if endDT is None else date.fromordinal(_toOrdinal(endDT))
+    return _iterBuckets(bucketStart, interval, endDT, today, output, workdays, holidays)
+
+
+def _iterBuckets(bucketStart, interval, endDT, today, output, workdays, holidays):
+    # ----------------------------------------------------------------------------------
+    # check the log level once instead of calling logs.info per bucket
+    # ----------------------------------------------------------------------------------
+    verbose = logs.isEnabledFor(logging.INFO)
+    if bucketStart == today:
+        # ------------------------------------------------------------------------------
+        # single bucket if utcnow
+        # ------------------------------------------------------------------------------
+        if verbose:
+            logs.info("startDT is '%s'. Bucketing not required.", bucketStart)
+        yield output((bucketStart, today))
+        return
+    if workdays:
+        for bucket in _iterWorkdayBuckets(bucketStart, interval, endDT, holidays):
+            if verbose:
+                logs.info("Creating buckets of '%s' - '%s'.", bucket[0], bucket[1])
+            yield output(bucket)
+        return
+    step = timedelta(days=interval)
+    oneday = timedelta(days=1)
+    # ----------------------------------------------------------------------------------
+    # loop through buckets
+    # ----------------------------------------------------------------------------------
+    while bucketStart <= endDT:
+        # ------------------------------------------------------------------------------
+        #  bucket ends on the offset, or on endDT when the offset passes it
+        # ------------------------------------------------------------------------------
+        bucketEnd = bucketStart + step
+        if bucketEnd >= endDT:
+            bucket = (bucketStart, endDT)
+        else:
+            bucket = (bucketStart, bucketEnd)
+        if verbose:
+            logs.info("Creating buckets of '%s' - '%s'.", bucket[0], bucket[1])
+        yield output(bucket)
+        bucketStart = bucketEnd + oneday
+
+
+def dateBucketing(
+    startDT,
+    interval,
+    endDT=datetime.utcnow().strftime("%Y%m%d"),
+    workdays=False,
+    holidays=[],
+):
     """
     FUNCTION: dateBucketing
 
@@ -657,6 +2444,8 @@ def dateBucketing(startDT, interval, endDT=datetime.utcnow().strftime("%Y%m%d"))
         # startDT            | string            | start date for bucket range.
         # interval           | string            | days between start and end dates.
         # endDT              | string            | end date of bucket range. Default utcnow.
+        # workdays           | boolean           | interval in working days. Default = False
+        # holidays           | list              | Optional holidays to skip for workdays.
         # ----------------------------------------------------------------------------------
 
     RETURNS:
@@ -677,65 +2466,87 @@ def dateBucketing(startDT, interval, endDT=datetime.utcnow().strftime("%Y%m%d"))
         "4 : ("20210829", "20210830")"
     """
     # ----------------------------------------------------------------------------------
-    # set date_list & counters
+    # list of the "iter_buckets" generator
     # ----------------------------------------------------------------------------------
-    startDT = dateCleanup(startDT).strftime("%Y%m%d")
-    date_list = []
-    bucketStart = int(startDT)
-    endDT = int(dateCleanup(endDT).strftime("%Y%m%d"))
-    if bucketStart == int(datetime.utcnow().strftime("%Y%m%d")):
-        # ------------------------------------------------------------------------------
-        # set date_list if utcnow
-        # ------------------------------------------------------------------------------
-        logs.info("startDT is '{}'. Bucketing not required.".format(startDT))
-        dt_object = dateCleanup(startDT)
-        bucket = (
-            dt_object.strftime("%Y-%m-%d"),
-            datetime.utcnow().strftime("%Y-%m-%d"),
-        )
-        date_list.append(bucket)
-    else:
-        # ------------------------------------------------------------------------------
-        # loop through buckets
-        # ------------------------------------------------------------------------------
-        while bucketStart <= endDT:
-            # --------------------------------------------------------------------------
-            #  set start and end interval
-            # --------------------------------------------------------------------------
-            dt_object = dateCleanup(startDT)
-            dt_offset = dt_object + timedelta(days=interval)
-            # --------------------------------------------------------------------------
-            #  dt_offset is greater than endDT -> end on utcnow
-            # --------------------------------------------------------------------------
-            if int(dt_offset.strftime("%Y%m%d")) >= endDT:
-                logs.info(
-                    "Creating buckets of '{}' - '{}'.".format(
-                        dt_object.strftime("%Y-%m-%d"),
-                        dateCleanup(endDT).strftime("%Y-%m-%d"),
-                    )
-                )
-                bucket = (
-                    dt_object.strftime("%Y-%m-%d"),
-                    dateCleanup(endDT).strftime("%Y-%m-%d"),
-                )
-            # --------------------------------------------------------------------------
-            #  dt_offset is less than endDT -> end on dt_offset
-            # --------------------------------------------------------------------------
-            else:
-                logs.info(
-                    "Creating buckets of '{}' - '{}'.".format(
-                        dt_object.strftime("%Y-%m-%d"),
-                        dt_offset.strftime("%Y-%m-%d"),
-                    )
-                )
-                bucket = (
-                    dt_object.strftime("%Y-%m-%d"),
-                    dt_offset.strftime("%Y-%m-%d"),
-                )
-            # --------------------------------------------------------------------------
-            #  update date_list and counters
-            # --------------------------------------------------------------------------
-            date_list.append(bucket)
-            startDT = dt_offset + timedelta(days=1)
-            bucketStart = int(dateCleanup(startDT).strftime("%Y%m%d"))
+    metrics = _metrics
+    if metrics is not None:
+        started = time.perf_counter()
+    date_list = list(
+        iter_buckets(startDT, interval, endDT, workdays=workdays, holidays=holidays)
+    )
+    if metrics is not None:
+        metrics.timing("dateBucketing", time.perf_counter() - started)
+        metrics.observe("dateBucketing.buckets", len(date_list))
     return date_list
+
+
+def bucketize(timestamps, start, interval, epoch=False):
+    """
+    FUNCTION: bucketize
+
+    DESCRIPTION:
+        Returns the index of the "dateBucketing"/"iter_buckets" bucket each
+        of "timestamps" falls in, computed arithmetically: buckets hold
+        interval + 1 days starting on "start", so the index is
+        (day - start) // (interval + 1). Timestamps before "start" get
+        negative indexes. date/datetime values are used without parsing and
+        epoch=True reads epoch milliseconds.
+
+    ARGUMENTS:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES             | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # timestamps         | iterable          | event timestamps.
+        # start              | string            | start date of the first bucket.
+        # interval           | int               | days between bucket start and end dates.
+        # epoch              | boolean           | timestamps are epoch ms. Default = False
+        # ----------------------------------------------------------------------------------
+
+    RETURNS:
+        list of bucket indexes
+
+    EXAMPLES:
+        >>> bucketize(["20210801", "20210807", "20210808", "20210816"], "20210801", 6)
+        [0, 0, 1, 2]
+    """
+    startordinal = _toOrdinal(start)
+    width = interval + 1
+    return [(_toOrdinal(value, epoch) - startordinal) // width for value in timestamps]
+
+
+def bucketBounds(index, start, interval):
+    """Returns the (start, end) datetime.date of bucket "index"."""
+    bucketStart = _toOrdinal(start) + index * (interval + 1)
+    return (date.fromordinal(bucketStart), date.fromordinal(bucketStart + interval))
+
+
+def aggregate_buckets(events, start, interval, epoch=False):
+    """
+    FUNCTION: aggregate_buckets
+
+    DESCRIPTION:
+        Streams (timestamp, value) "events" into "bucketize" buckets without
+        materializing them and returns {index: {"count", "sum", "min",
+        "max"}} sorted by bucket index. "bucketBounds" gives the dates of an
+        index.
+
+    EXAMPLES:
+        >>> aggregate_buckets([("20210801", 5), ("20210803", 1)], "20210801", 6)
+        {0: {'count': 2, 'sum': 6, 'min': 1, 'max': 5}}
+    """
+    startordinal = _toOrdinal(start)
+    width = interval + 1
+    buckets = {}
+    for timestamp, value in events:
+        index = (_toOrdinal(timestamp, epoch) - startordinal) // width
+        stats = buckets.get(index)
+        if stats is None:
+            buckets[index] = {"count": 1, "sum": value, "min": value, "max": value}
+            continue
+        stats["count"] += 1
+        stats["sum"] += value
+        if value < stats["min"]:
+            stats["min"] = value
+        if value > stats["max"]:
+            stats["max"] = value
+    return dict(sorted(buckets.items()))
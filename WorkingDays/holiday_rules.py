@@ -0,0 +1,379 @@
+"""
+    Rule-based holidays: fixed dates, nth/last weekday of a month and Easter
+    relative dates, with weekend "observed" shifts. A RuleCalendar generates
+    the holidays of a year the first time a query touches it and keeps them,
+    so long horizons don't need literal holiday lists.
+
+CLASSES:
+    Fixed(month, day, observed=None, years=(None, None), name=None)
+    NthWeekday(month, weekday, n, years=(None, None), name=None)
+    LastWeekday(month, weekday, years=(None, None), name=None)
+    Easter(offset=0, years=(None, None), name=None)
+    RuleCalendar(rules, holidays=(), weekmask=None)
+
+FUNCTIONS:
+    easterSunday(year)
+
+MISC VARIABLES:
+    US_FEDERAL
+
+"""
+
+import threading
+from datetime import MAXYEAR, MINYEAR, date, timedelta
+
+from WorkingDays.date_utilities import DEFAULT_HORIZON, MON_FRI, BusinessCalendar
+
+OBSERVED = (None, "nearest", "next")
+
+
+def easterSunday(year):
+    """Returns the Gregorian Easter Sunday (datetime.date) of "year"."""
+    # -------------------------------------------------------------------------
+    # anonymous Gregorian algorithm (Meeus/Jones/Butcher)
+    # -------------------------------------------------------------------------
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7  # noqa: E741
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+class _Rule(object):
+    # -------------------------------------------------------------------------
+    # base rule: "_date(year)" returns the holiday (datetime.date) or None
+    # -------------------------------------------------------------------------
+    __slots__ = ("observed", "years", "name")
+
+    def __init__(self, observed=None, years=(None, None), name=None):
+        if observed not in OBSERVED:
+            raise ValueError("observed must be one of {}".format(OBSERVED))
+        self.observed = observed
+        self.years = tuple(years)
+        self.name = name
+
+    def _key(self):
+        return (type(self).__name__, self.observed, self.years) + self._args()
+
+    def __eq__(self, other):
+        if not isinstance(other, _Rule):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return "{}{}".format(type(self).__name__, self._args())
+
+    def applies(self, year):
+        """True when "year" is inside the rule's "years" (None = open)."""
+        first, last = self.years
+        return (first is None or year >= first) and (last is None or year <= last)
+
+    def date(self, year):
+        """Returns the holiday of "year" before any observed shift (or None)."""
+        if not self.applies(year):
+            return None
+        return self._date(year)
+
+
+class Fixed(_Rule):
+    """
+    CLASS: Fixed
+
+    DESCRIPTION:
+        Same month and day every year, e.g. Fixed(12, 25). observed="nearest"
+        moves a Saturday to Friday and a Sunday to Monday; observed="next"
+        moves a weekend holiday to the next weekday that isn't already a
+        holiday (UK style substitute days). With a calendar weekmask the
+        "weekend" is every non-working weekday and "nearest" prefers the
+        earlier working day on a tie.
+    """
+
+    __slots__ = ("month", "day")
+
+    def __init__(self, month, day, observed=None, years=(None, None), name=None):
+        _Rule.__init__(self, observed, years, name)
+        date(2000, month, day)  # validates month/day (Feb 29 included)
+        self.month = month
+        self.day = day
+
+    def _args(self):
+        return (self.month, self.day)
+
+    def _date(self, year):
+        try:
+            return date(year, self.month, self.day)
+        except ValueError:  # Feb 29 outside leap years
+            return None
+
+
+class NthWeekday(_Rule):
+    """
+    CLASS: NthWeekday
+
+    DESCRIPTION:
+        The n'th "weekday" (0=Monday .. 6=Sunday) of "month", e.g.
+        NthWeekday(11, 3, 4) is the 4th Thursday of November. Negative "n"
+        counts from the end of the month (-1 is the last one).
+    """
+
+    __slots__ = ("month", "weekday", "n")
+
+    def __init__(self, month, weekday, n, years=(None, None), name=None):
+        _Rule.__init__(self, None, years, name)
+        if not 1 <= month <= 12 or not 0 <= weekday <= 6 or n == 0 or abs(n) > 5:
+            raise ValueError("month 1-12, weekday 0-6 and n in -5..-1, 1..5")
+        self.month = month
+        self.weekday = weekday
+        self.n = n
+
+    def _args(self):
+        return (self.month, self.weekday, self.n)
+
+    def _date(self, year):
+        if self.n > 0:
+            first = date(year, self.month, 1)
+            day = first + timedelta(days=(self.weekday - first.weekday()) % 7)
+            day += timedelta(weeks=self.n - 1)
+        else:
+            nextmonth = date(year + self.month // 12, self.month % 12 + 1, 1)
+            last = nextmonth - timedelta(days=1)
+            day = last - timedelta(days=(last.weekday() - self.weekday) % 7)
+            day -= timedelta(weeks=-self.n - 1)
+        return day if day.month == self.month else None
+
+
+class LastWeekday(NthWeekday):
+    """The last "weekday" of "month", e.g. LastWeekday(5, 0) (Memorial Day)."""
+
+    __slots__ = ()
+
+    def __init__(self, month, weekday, years=(None, None), name=None):
+        NthWeekday.__init__(self, month, weekday, -1, years, name)
+
+
+class Easter(_Rule):
+    """
+    CLASS: Easter
+
+    DESCRIPTION:
+        "offset" days from Easter Sunday: Easter(-2) Good Friday, Easter(1)
+        Easter Monday, Easter(39) Ascension Day, Easter(50) Whit Monday.
+    """
+
+    __slots__ = ("offset",)
+
+    def __init__(self, offset=0, years=(None, None), name=None):
+        _Rule.__init__(self, None, years, name)
+        self.offset = offset
+
+    def _args(self):
+        return (self.offset,)
+
+    def _date(self, year):
+        return easterSunday(year) + timedelta(days=self.offset)
+
+
+def _observe(rules, year, weekmask=MON_FRI):
+    # -------------------------------------------------------------------------
+    # the holiday ordinals of "rules" for "year" after the observed shifts.
+    # Unshifted holidays are placed first so "next" substitutes skip them.
+    # -------------------------------------------------------------------------
+    isWorkday = weekmask.isWorkday
+    taken = set()
+    shifted = []
+    for rule in rules:
+        holiday = rule.date(year)
+        if holiday is None:
+            continue
+        ordinal = holiday.toordinal()
+        if rule.observed is None or isWorkday(ordinal):
+            taken.add(ordinal)
+        elif rule.observed == "nearest":
+            # Saturday -> Friday, Sunday -> Monday (for the Mon-Fri mask)
+            distance = 1
+            while not isWorkday(ordinal - distance) and not isWorkday(
+                ordinal + distance
+            ):
+                distance += 1
+            if isWorkday(ordinal - distance):
+                taken.add(ordinal - distance)
+            else:
+                taken.add(ordinal + distance)
+        else:
+            shifted.append(ordinal)
+    for ordinal in sorted(shifted):
+        while not isWorkday(ordinal) or ordinal in taken:
+            ordinal += 1
+        taken.add(ordinal)
+    return taken
+
+
+class RuleCalendar(BusinessCalendar):
+    """
+    CLASS: RuleCalendar
+
+    DESCRIPTION:
+        BusinessCalendar whose holidays come from "rules" (plus optional
+        explicit "holidays"). The holidays of a year are generated the first
+        time a query touches it and cached; every workday function and
+        BusinessCalendar method accepts it like any other calendar.
+
+        Observed shifts can cross a year end (New Year's Day on a Saturday is
+        observed Dec 31), so touching a year also loads its neighbours.
+
+        Numpy functions ("vectorized") and "saveCalendar" only see loaded
+        years: call loadYears(start, end) for the horizon first
+        ("saveCalendar" and "buildIndex" do it themselves). "bulk" workers
+        rebuild the calendar from its rules.
+
+    ARGUMENTS:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES          | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # rules              | iterable       | Fixed, NthWeekday, LastWeekday, Easter.
+        # holidays           | iterable       | Optional extra holidays (any dateCleanup).
+        # weekmask           | string         | Working weekdays, also the "weekend" of
+        #                    |                | the observed shifts. Default = "1111100"
+        # ----------------------------------------------------------------------------------
+
+    EXAMPLES:
+        >>> cal = RuleCalendar(US_FEDERAL)
+        >>> workday("20200702", 3, holidays=cal)
+        '20200708'
+        >>> cal.loadedYears()
+        [2019, 2020, 2021]
+    """
+
+    __slots__ = ("_rules", "_extra", "_years", "_lock")
+
+    def __init__(self, rules, holidays=(), weekmask=None):
+        BusinessCalendar.__init__(self, holidays, weekmask)
+        self._rules = tuple(rules)
+        for rule in self._rules:
+            if not isinstance(rule, _Rule):
+                raise TypeError("not a holiday rule: {!r}".format(rule))
+        self._extra = self._holidays
+        self._years = set()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "RuleCalendar(<{} rules, {} years loaded>)".format(
+            len(self._rules), len(self._years)
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, RuleCalendar):
+            return NotImplemented
+        return (self._rules, self._extra, self._weekmask) == (
+            other._rules,
+            other._extra,
+            other._weekmask,
+        )
+
+    def __hash__(self):
+        return hash((self._rules, self._extra, self._weekmask))
+
+    @property
+    def rules(self):
+        return self._rules
+
+    def loadedYears(self):
+        """Sorted list of the years generated so far."""
+        return sorted(self._years)
+
+    def loadYears(self, startyear, endyear):
+        """
+        Generates (and caches) the holidays of startyear..endyear. Returns
+        True when any year had to be generated.
+        """
+        years = range(max(startyear - 1, MINYEAR), min(endyear + 1, MAXYEAR) + 1)
+        missing = [year for year in years if year not in self._years]
+        if not missing:
+            return False
+        with self._lock:
+            weekmask = self._weekmask
+            holidays = set(self._holidays)
+            for year in missing:
+                if year not in self._years:
+                    holidays.update(_observe(self._rules, year, weekmask))
+            # -----------------------------------------------------------------
+            # publish the holidays before the years, so readers that see a
+            # loaded year always see its holidays
+            # -----------------------------------------------------------------
+            self._holidays = frozenset(holidays)
+            self._ordinals = weekmask.workdayOrdinals(holidays)
+            self._years.update(missing)
+        return True
+
+    def _touch(self, startordinal, endordinal):
+        # ---------------------------------------------------------------------
+        # load the years of [startordinal, endordinal] (and their neighbours,
+        # see "loadYears"); True if any year was new
+        # ---------------------------------------------------------------------
+        startyear = date.fromordinal(startordinal).year
+        endyear = date.fromordinal(endordinal).year
+        years = self._years
+        if startyear - 1 in years and endyear + 1 in years:
+            # every year in between too: loaded years can have gaps
+            if years.issuperset(range(startyear, endyear + 1)):
+                return False
+        return self.loadYears(startyear, endyear)
+
+    # -------------------------------------------------------------------------
+    # ordinal engine (lazy years on top of BusinessCalendar)
+    # -------------------------------------------------------------------------
+    def _isHoliday(self, ordinal):
+        self._touch(ordinal, ordinal)
+        return ordinal in self._holidays
+
+    def _isWorkday(self, ordinal):
+        self._touch(ordinal, ordinal)
+        return BusinessCalendar._isWorkday(self, ordinal)
+
+    def _offset(self, ordinal, offset):
+        # ---------------------------------------------------------------------
+        # the result only depends on the holidays between ordinal and the
+        # result: repeat until that span is loaded
+        # ---------------------------------------------------------------------
+        self._touch(ordinal, ordinal)
+        while True:
+            result = BusinessCalendar._offset(self, ordinal, offset)
+            if not self._touch(min(ordinal, result), max(ordinal, result)):
+                return result
+
+    def _count(self, startordinal, endordinal):
+        if startordinal < endordinal:
+            self._touch(startordinal, endordinal)
+        return BusinessCalendar._count(self, startordinal, endordinal)
+
+    def buildIndex(self, startyear=DEFAULT_HORIZON[0], endyear=DEFAULT_HORIZON[1]):
+        """Loads the horizon years, then "BusinessCalendar.buildIndex"."""
+        self.loadYears(startyear, endyear)
+        return BusinessCalendar.buildIndex(self, startyear, endyear)
+
+
+# -----------------------------------------------------------------------------
+# US federal holidays (5 U.S.C. 6103), weekend dates observed Fri/Mon
+# -----------------------------------------------------------------------------
+US_FEDERAL = (
+    Fixed(1, 1, observed="nearest", name="New Year's Day"),
+    NthWeekday(1, 0, 3, years=(1986, None), name="Martin Luther King Jr. Day"),
+    NthWeekday(2, 0, 3, name="Washington's Birthday"),
+    LastWeekday(5, 0, name="Memorial Day"),
+    Fixed(6, 19, observed="nearest", years=(2021, None), name="Juneteenth"),
+    Fixed(7, 4, observed="nearest", name="Independence Day"),
+    NthWeekday(9, 0, 1, name="Labor Day"),
+    NthWeekday(10, 0, 2, name="Columbus Day"),
+    Fixed(11, 11, observed="nearest", name="Veterans Day"),
+    NthWeekday(11, 3, 4, name="Thanksgiving Day"),
+    Fixed(12, 25, observed="nearest", name="Christmas Day"),
+)
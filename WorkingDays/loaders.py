@@ -0,0 +1,270 @@
+"""
+    Holiday file loaders (CSV, iCalendar, JSON, plain text and compiled
+    ".wdcal" files) that return a compiled BusinessCalendar.
+
+    "loadHolidays" caches the calendar by path and options and only rebuilds
+    it when the file's mtime or size changes, so a long-running service can
+    call it on every request: unchanged files cost one os.stat, updated
+    files are picked up on the next call.
+
+FILE FORMATS:
+    csv     one holiday per row in "column" (index or header name); a
+            header row is detected when its cell isn't a date
+    ics     the DTSTART (through DTEND, exclusive) days of every VEVENT;
+            RRULE recurrences are not expanded (see "holiday_rules")
+    json    a list of dates, a list of objects with a "key" field, an
+            object with a "holidays" list or an object keyed by date
+    text    one holiday per line
+    wdcal   a "calendar_file" compiled calendar
+
+FUNCTIONS:
+    loadHolidays(path, format=None, weekmask=None, **options)
+    readHolidays(path, format=None, **options)
+    cacheInfo()
+    clearCache()
+
+"""
+
+import csv
+import json
+import os
+import threading
+from datetime import date, timedelta
+
+from WorkingDays.date_utilities import (
+    BusinessCalendar,
+    dateCleanup,
+    _calendar,
+    _weekmask,
+)
+
+FORMATS = ("csv", "ics", "json", "text", "wdcal")
+_EXTENSIONS = {
+    ".csv": "csv",
+    ".tsv": "csv",
+    ".ics": "ics",
+    ".ical": "ics",
+    ".ifb": "ics",
+    ".json": "json",
+    ".wdcal": "wdcal",
+}
+
+# -----------------------------------------------------------------------------
+# compiled calendars: (path, format, weekmask bits, options) -> (stamp,
+# calendar). The counters have their own lock so a hit never waits for a load.
+# -----------------------------------------------------------------------------
+_cache = {}
+_cacheLock = threading.Lock()
+_stats = {"hits": 0, "loads": 0}
+_statsLock = threading.Lock()
+
+
+def _count(stat):
+    with _statsLock:
+        _stats[stat] += 1
+
+
+def _format(path, format):
+    if format is None:
+        format = _EXTENSIONS.get(os.path.splitext(path)[1].lower(), "text")
+    if format not in FORMATS:
+        raise ValueError("format must be one of {}, got {!r}".format(FORMATS, format))
+    return format
+
+
+def _isDate(value):
+    # anything "dateCleanup" rejects (it doesn't always raise ValueError)
+    try:
+        dateCleanup(value)
+    except Exception:
+        return False
+    return True
+
+
+def _readCSV(f, column=0, delimiter=",", header=None):
+    # -------------------------------------------------------------------------
+    # the non-empty cells of "column"; a header name implies a header row
+    # -------------------------------------------------------------------------
+    rows = csv.reader(f, delimiter=delimiter)
+    if not isinstance(column, int):
+        names = [name.strip() for name in next(rows, [])]
+        if column not in names:
+            raise ValueError("column {!r} not in the CSV header".format(column))
+        column = names.index(column)
+        header = False
+    holidays = []
+    for number, row in enumerate(rows):
+        value = row[column].strip() if column < len(row) else ""
+        if not value:
+            continue
+        if number == 0 and (header or (header is None and not _isDate(value))):
+            continue
+        holidays.append(value)
+    return holidays
+
+
+def _unfold(f):
+    # -------------------------------------------------------------------------
+    # iCalendar content lines: continuation lines start with a space or tab
+    # -------------------------------------------------------------------------
+    line = None
+    for raw in f:
+        raw = raw.rstrip("\r\n")
+        if raw[:1] in (" ", "\t") and line is not None:
+            line += raw[1:]
+            continue
+        if line is not None:
+            yield line
+        line = raw
+    if line is not None:
+        yield line
+
+
+def _icsDate(value):
+    # DATE (20201225) or DATE-TIME (20201225T000000[Z]) -> datetime.date
+    value = value.strip()
+    return date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+
+
+def _readICS(f):
+    # -------------------------------------------------------------------------
+    # every day from DTSTART up to (excluding) DTEND of each VEVENT
+    # -------------------------------------------------------------------------
+    holidays = []
+    start = end = None
+    inEvent = False
+    for line in _unfold(f):
+        name, _, value = line.partition(":")
+        name = name.split(";", 1)[0].upper()
+        if name == "BEGIN" and value.strip().upper() == "VEVENT":
+            inEvent, start, end = True, None, None
+        elif name == "END" and value.strip().upper() == "VEVENT":
+            if start is not None:
+                holidays.append(start)
+                day = start + timedelta(days=1)
+                while end is not None and day < end:
+                    holidays.append(day)
+                    day += timedelta(days=1)
+            inEvent = False
+        elif inEvent and name == "DTSTART":
+            start = _icsDate(value)
+        elif inEvent and name == "DTEND":
+            end = _icsDate(value)
+    return holidays
+
+
+def _readJSON(f, key="date"):
+    data = json.load(f)
+    if isinstance(data, dict):
+        data = data["holidays"] if "holidays" in data else list(data)
+    return [item[key] if isinstance(item, dict) else item for item in data]
+
+
+def _readText(f):
+    return [line.strip() for line in f if line.strip()]
+
+
+def readHolidays(path, format=None, **options):
+    """
+    FUNCTION: readHolidays
+
+    DESCRIPTION:
+        Returns the holidays of a CSV, iCalendar, JSON or text file as a list
+        (strings, ints or datetime.date values, unparsed). "format" defaults
+        to the file extension.
+
+    ARGUMENTS:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES          | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # path               | string         | Holiday file.
+        # format             | string         | csv, ics, json or text. Default = extension
+        # **options          |                | csv: column (index or header name),
+        #                    |                | delimiter, header (None = detect)
+        #                    |                | json: key (field of object items)
+        # ----------------------------------------------------------------------------------
+    """
+    format = _format(path, format)
+    if format == "wdcal":
+        raise ValueError("{}: compiled calendars have no holiday list".format(path))
+    with open(path, newline="" if format == "csv" else None, encoding="utf-8") as f:
+        if format == "csv":
+            return _readCSV(f, **options)
+        if format == "ics":
+            return _readICS(f, **options)
+        if format == "json":
+            return _readJSON(f, **options)
+        return _readText(f, **options)
+
+
+def _compile(path, format, weekmask, options):
+    if format == "wdcal":
+        from WorkingDays.calendar_file import loadCalendar
+
+        return _calendar(loadCalendar(path, **options), weekmask)
+    return BusinessCalendar(readHolidays(path, format, **options), weekmask)
+
+
+def loadHolidays(path, format=None, weekmask=None, **options):
+    """
+    FUNCTION: loadHolidays
+
+    DESCRIPTION:
+        Returns the compiled BusinessCalendar of a holiday file. The
+        calendar is cached by path, format, weekmask and options and only
+        rebuilt when the file's mtime or size changes, so repeated calls
+        cost one os.stat.
+
+    ARGUMENTS:
+        # ----------------------------------------------------------------------------------
+        # ARGUMENTS          | TYPES          | DESCRIPTION
+        # ----------------------------------------------------------------------------------
+        # path               | string         | Holiday file (csv, ics, json, wdcal, text).
+        # format             | string         | One of FORMATS. Default = extension
+        # weekmask           | string         | Working weekdays. Default = "1111100"
+        # **options          |                | See "readHolidays" (wdcal: verify).
+        # ----------------------------------------------------------------------------------
+
+    EXAMPLES:
+        >>> cal = loadHolidays("holidays.csv", column="date")
+        >>> workday("20200702", 3, holidays=cal)
+        '20200708'
+        >>> loadHolidays("holidays.csv", column="date") is cal   # unchanged file
+        True
+    """
+    path = os.path.abspath(os.fspath(path))
+    format = _format(path, format)
+    # any weekmask spelling (string, day names list, int) -> one hashable key
+    if weekmask is not None:
+        weekmask = _weekmask(weekmask)
+    bits = None if weekmask is None else weekmask.bits
+    key = (path, format, bits, tuple(sorted(options.items())))
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        _count("hits")
+        return cached[1]
+    with _cacheLock:
+        # another thread may have rebuilt it while this one waited
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            _count("hits")
+            return cached[1]
+        calendar = _compile(path, format, weekmask, options)
+        _cache[key] = (stamp, calendar)
+        _count("loads")
+    return calendar
+
+
+def cacheInfo():
+    """Returns the cached files and the cache hits/loads counts."""
+    with _statsLock:
+        return dict(_stats, files=len(_cache))
+
+
+def clearCache():
+    """Drops every cached calendar."""
+    with _cacheLock, _statsLock:
+        _cache.clear()
+        _stats.update(hits=0, loads=0)
@@ -0,0 +1,109 @@
+import unittest
+from datetime import date
+import WorkingDays.date_utilities as wd
+import WorkingDays.adapters as wa
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover
+    pd = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+
+
+@unittest.skipIf(pd is None, "pandas is not installed")
+class PandasAdapterTests(unittest.TestCase):
+    holidays = ["20200703", "20200706"]
+
+    def setUp(self):
+        self.series = pd.Series(
+            pd.to_datetime(["2020-07-02", None, "2020-05-15"]),
+            index=[10, 11, 12],
+            name="created",
+        )
+
+    def test_workday(self):
+        result = wa.workday_many(self.series, 3, self.holidays)
+        self.assertEqual(list(result.index), [10, 11, 12])
+        self.assertEqual(result.name, "created")
+        self.assertTrue(pd.isna(result[11]))
+        self.assertEqual(
+            [result[10].strftime("%Y%m%d"), result[12].strftime("%Y%m%d")],
+            [
+                wd.workday("20200702", 3, self.holidays),
+                wd.workday("20200515", 3, self.holidays),
+            ],
+        )
+
+    def test_nullOffsets(self):
+        result = wa.workday_start_many(self.series, pd.Series([2, 1, None]))
+        self.assertEqual(result[10].strftime("%Y%m%d"), "20200630")
+        self.assertTrue(result.isna().tolist()[1:] == [True, True])
+
+    def test_networkdays(self):
+        compare = pd.Series(pd.to_datetime(["2020-07-10"] * 3))
+        result = wa.networkdays_many(self.series, compare, self.holidays)
+        self.assertEqual(str(result.dtype), "Int64")
+        self.assertEqual(
+            result[10], wd.compareWorkingDays("20200702", "20200710", self.holidays)
+        )
+        self.assertTrue(pd.isna(result[11]))
+
+    def test_strings(self):
+        series = pd.Series(["20200702", None, "07.04.2020"])
+        result = wa.last_workday_of_month_many(series)
+        self.assertEqual(result[0].strftime("%Y%m%d"), "20200731")
+        self.assertTrue(pd.isna(result[1]))
+        self.assertEqual(result[2].strftime("%Y%m%d"), "20200430")
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class ArrowAdapterTests(unittest.TestCase):
+    holidays = ["20200703", "20200706"]
+
+    def setUp(self):
+        self.array = pa.array(
+            [date(2020, 7, 2), None, date(2020, 5, 15)], type=pa.date32()
+        )
+
+    def test_workday(self):
+        result = wa.workday_many(self.array, 3, self.holidays)
+        self.assertEqual(result.type, pa.date32())
+        self.assertEqual(
+            result.to_pylist(), [date(2020, 7, 9), None, date(2020, 5, 20)]
+        )
+
+    def test_slicedAndChunked(self):
+        result = wa.workday_many(self.array.slice(1), 3, self.holidays)
+        self.assertEqual(result.to_pylist(), [None, date(2020, 5, 20)])
+        chunked = pa.chunked_array([self.array[:1], self.array[1:]])
+        result = wa.workday_many(chunked, 1, self.holidays)
+        self.assertIsInstance(result, pa.ChunkedArray)
+        self.assertEqual(
+            result.to_pylist(), [date(2020, 7, 7), None, date(2020, 5, 18)]
+        )
+
+    def test_networkdays(self):
+        compare = pa.array([date(2020, 7, 1)] * 3, type=pa.date32())
+        result = wa.networkdays_many(self.array, compare, self.holidays, signed=True)
+        self.assertEqual(
+            result.to_pylist(),
+            [-1, None, wd.compareWorkingDays("20200515", "20200701", self.holidays)],
+        )
+
+    def test_timestampsAndStrings(self):
+        stamps = pa.array([1593727200000, None], type=pa.timestamp("ms"))
+        self.assertEqual(
+            wa.workday_many(stamps, 1).to_pylist(), [date(2020, 7, 3), None]
+        )
+        strings = pa.array(["20200702", None])
+        self.assertEqual(
+            wa.workday_many(strings, 1).to_pylist(), [date(2020, 7, 3), None]
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
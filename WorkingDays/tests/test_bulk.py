@@ -0,0 +1,133 @@
+import os
+import tempfile
+import unittest
+import WorkingDays.date_utilities as wd
+import WorkingDays.bulk as bulk
+from WorkingDays.holiday_rules import US_FEDERAL, RuleCalendar
+
+
+class BulkTransformTests(unittest.TestCase):
+    lines = ["id;date", "1;20200702", "2;2020-04-08", "", "3;07.04.2020\r", "4;bad"]
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.inpath = os.path.join(self.tmpdir.name, "in.csv")
+        self.outpath = os.path.join(self.tmpdir.name, "out.csv")
+        with open(self.inpath, "w", newline="") as f:
+            f.write("\n".join(self.lines))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def read(self):
+        with open(self.outpath, newline="") as f:
+            return f.read().split("\n")
+
+    def test_chunkRangesAlignToLines(self):
+        ranges = bulk.chunkRanges(self.inpath, 5, skipheader=True)
+        self.assertEqual(ranges[0][0], len("id;date\n"))
+        self.assertEqual(ranges[-1][1], os.path.getsize(self.inpath))
+        with open(self.inpath, "rb") as f:
+            data = f.read()
+        for start, end in ranges[:-1]:
+            self.assertEqual(data[end - 1 : end], b"\n")
+
+    def test_workdayInOrder(self):
+        stats = bulk.transformFile(
+            self.inpath,
+            self.outpath,
+            1,
+            "workday",
+            holidays=["20200703"],
+            chunksize=8,
+            workers=2,
+            header=True,
+            offset=3,
+            delimiter=";",
+            errors="keep",
+        )
+        self.assertEqual(
+            self.read(),
+            ["id;date", "1;20200708", "2;20200413", "", "3;20200410\r", "4;bad"],
+        )
+        self.assertEqual(stats["lines"], 5)
+
+    def test_appendColumn(self):
+        bulk.transformFile(
+            self.inpath,
+            self.outpath,
+            1,
+            workers=1,
+            header=True,
+            delimiter=";",
+            errors="empty",
+            append=True,
+            outformat="%Y-%m-%d",
+        )
+        self.assertEqual(self.read()[1], "1;20200702;2020-07-02")
+        self.assertEqual(self.read()[5], "4;bad;")
+
+    def test_shortLine(self):
+        with open(self.inpath, "w", newline="") as f:
+            f.write("a,20200702\nshort\n")
+        for errors in ("keep", "empty"):
+            bulk.transformFile(
+                self.inpath, self.outpath, 1, "workday", workers=1, errors=errors
+            )
+            self.assertEqual(self.read(), ["a,20200702", "short,", ""])
+
+    def test_lazyRuleCalendar(self):
+        calendar = RuleCalendar(US_FEDERAL)
+        bulk.transformFile(
+            self.inpath,
+            self.outpath,
+            1,
+            "workday",
+            holidays=calendar,
+            workers=1,
+            header=True,
+            offset=3,
+            delimiter=";",
+            errors="keep",
+        )
+        self.assertEqual(calendar.loadedYears(), [])
+        self.assertEqual(self.read()[1], "1;20200708")
+
+    def test_raiseOnBadValue(self):
+        self.assertRaises(
+            ValueError,
+            bulk.transformFile,
+            self.inpath,
+            self.outpath,
+            1,
+            workers=1,
+            header=True,
+            delimiter=";",
+        )
+
+    def test_commandLine(self):
+        holidays = os.path.join(self.tmpdir.name, "holidays.txt")
+        with open(holidays, "w") as f:
+            f.write("20200703\n")
+        bulk.main(
+            [
+                self.inpath,
+                self.outpath,
+                "--column=1",
+                "--operation=workdayStart",
+                "--offset=1",
+                "--holidays",
+                holidays,
+                "--delimiter=;",
+                "--header",
+                "--errors=keep",
+                "--workers=1",
+                "--chunk-size=1K",
+                "--quiet",
+            ]
+        )
+        self.assertEqual(self.read()[1], "1;" + wd.workdayStart("20200702", 1))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
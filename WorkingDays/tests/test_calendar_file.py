@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+import WorkingDays.date_utilities as wd
+import WorkingDays.calendar_file as cf
+
+
+class CalendarFileTests(unittest.TestCase):
+    holidays = ["20200703", "20200706", "20201226"]
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".wdcal")
+        os.close(handle)
+        cf.saveCalendar(self.holidays, self.path, 2019, 2021)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_roundTrip(self):
+        cal = cf.loadCalendar(self.path)
+        self.assertEqual(cal, wd.BusinessCalendar(self.holidays))
+        self.assertEqual(cal.indexInfo()["days"], 1096)
+        self.assertEqual(wd.workday("20200702", 3, holidays=cal), "20200709")
+        self.assertEqual(cal.workdayStart("20200707", 3), "20200630")
+        self.assertEqual(cal.compareWorkingDays("20200701", "20200708"), 3)
+
+    def test_outsideHorizon(self):
+        cal = cf.loadCalendar(self.path)
+        self.assertEqual(
+            cal.compareWorkingDays("20180101", "20230101"),
+            wd.compareWorkingDays("20180101", "20230101", self.holidays),
+        )
+
+    def test_checksum(self):
+        with open(self.path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b"\xff")
+        self.assertRaises(cf.CalendarFileError, cf.loadCalendar, self.path)
+
+    def test_weekmask(self):
+        cal = wd.BusinessCalendar(self.holidays, weekmask="1111001")
+        cf.saveCalendar(cal, self.path, 2019, 2021)
+        loaded = cf.loadCalendar(self.path)
+        self.assertEqual(loaded, cal)
+        self.assertEqual(loaded.workday("20200702", 1), "20200705")
+        self.assertEqual(
+            loaded.compareWorkingDays("20190101", "20211231"),
+            cal.compareWorkingDays("20190101", "20211231"),
+        )
+
+    def test_badMagic(self):
+        with open(self.path, "r+b") as f:
+            f.write(b"NOTACAL!")
+        self.assertRaises(cf.CalendarFileError, cf.loadCalendar, self.path)
+
+    def test_badVersion(self):
+        with open(self.path, "r+b") as f:
+            f.seek(8)
+            f.write(b"\x63\x00\x00\x00")
+        self.assertRaises(cf.CalendarFileError, cf.loadCalendar, self.path)
+
+    def test_versionOneRejected(self):
+        # version 1 had a workday bitmap and no weekmask byte
+        with open(self.path, "r+b") as f:
+            f.seek(8)
+            f.write(b"\x01\x00\x00\x00")
+        self.assertRaises(cf.CalendarFileError, cf.loadCalendar, self.path)
+
+    def test_badWeekmask(self):
+        with open(self.path, "r+b") as f:
+            f.seek(28)
+            f.write(b"\x00")
+        self.assertRaises(cf.CalendarFileError, cf.loadCalendar, self.path)
+        self.assertEqual(os.path.getsize(self.path), cf._HEADER.size + 4 * (3 + 1097))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
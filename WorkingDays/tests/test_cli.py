@@ -0,0 +1,79 @@
+import io
+import os
+import tempfile
+import unittest
+import WorkingDays.cli as cli
+
+
+class CliStreamTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.holidays = os.path.join(self.tmpdir.name, "holidays.txt")
+        with open(self.holidays, "w") as f:
+            f.write("20200703\n\n20200410\n")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_cli(self, argv, text):
+        args = cli.buildParser().parse_args(argv)
+        stdout = io.StringIO()
+        cli.stream(args, io.StringIO(text), stdout)
+        return stdout.getvalue().splitlines()
+
+    def test_jsonHolidayFile(self):
+        path = os.path.join(self.tmpdir.name, "holidays.json")
+        with open(path, "w") as f:
+            f.write('[{"date": "2020-07-03"}]')
+        output = self.run_cli(
+            ["workday", "--offset", "3", "--holidays", path], "20200702\n"
+        )
+        self.assertEqual(output, ["20200708"])
+
+    def test_workdayWithHolidayFile(self):
+        output = self.run_cli(
+            ["workday", "--offset", "3", "--holidays", self.holidays],
+            "20200702\n\n2020-04-08\n",
+        )
+        self.assertEqual(output, ["20200708", "20200414"])
+
+    def test_workdayStartEcho(self):
+        output = self.run_cli(["workdayStart", "--offset", "2", "--echo"], "20200706\n")
+        self.assertEqual(output, ["20200706\t20200702"])
+
+    def test_compareWorkingDaysSigned(self):
+        output = self.run_cli(
+            ["compareWorkingDays", "--signed", "--delimiter", ","],
+            "20200701,20200707\n20200707,20200701\n",
+        )
+        self.assertEqual(output, ["4", "-4"])
+
+    def test_lastWorkdayOfMonth(self):
+        output = self.run_cli(["lastWorkdayOfMonth"], "20200510\n")
+        self.assertEqual(output, ["20200529"])
+
+    def test_dateBucketing(self):
+        output = self.run_cli(
+            ["dateBucketing", "--interval", "6", "--end", "20210816"], "20210801\n"
+        )
+        self.assertEqual(
+            output,
+            [
+                "2021-08-01\t2021-08-07",
+                "2021-08-08\t2021-08-14",
+                "2021-08-15\t2021-08-16",
+            ],
+        )
+
+    def test_errors(self):
+        argv = ["workday", "--offset", "1", "--errors"]
+        self.assertEqual(self.run_cli(argv + ["skip"], "bad\n20200702\n"), ["20200703"])
+        self.assertEqual(
+            self.run_cli(argv + ["empty"], "bad\n20200702\n"), ["", "20200703"]
+        )
+        with self.assertRaises(ValueError):
+            self.run_cli(argv + ["raise"], "bad\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
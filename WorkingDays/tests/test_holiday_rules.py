@@ -0,0 +1,112 @@
+import unittest
+from datetime import date
+import WorkingDays.date_utilities as wd
+from WorkingDays.holiday_rules import (
+    US_FEDERAL,
+    Easter,
+    Fixed,
+    LastWeekday,
+    NthWeekday,
+    RuleCalendar,
+    easterSunday,
+)
+
+
+class HolidayRuleTests(unittest.TestCase):
+    def test_rules(self):
+        self.assertEqual(Fixed(7, 4).date(2020), date(2020, 7, 4))
+        self.assertEqual(NthWeekday(11, 3, 4).date(2020), date(2020, 11, 26))
+        self.assertEqual(NthWeekday(9, 0, 1).date(2020), date(2020, 9, 7))
+        self.assertEqual(LastWeekday(5, 0).date(2020), date(2020, 5, 25))
+        self.assertIsNone(NthWeekday(2, 0, 5).date(2021))
+        self.assertIsNone(Fixed(2, 29).date(2021))
+        self.assertIsNone(Fixed(6, 19, years=(2021, None)).date(2020))
+
+    def test_easter(self):
+        self.assertEqual(easterSunday(2000), date(2000, 4, 23))
+        self.assertEqual(easterSunday(2019), date(2019, 4, 21))
+        self.assertEqual(easterSunday(2024), date(2024, 3, 31))
+        self.assertEqual(Easter(-2).date(2024), date(2024, 3, 29))
+
+    def test_invalidRules(self):
+        self.assertRaises(ValueError, Fixed, 2, 30)
+        self.assertRaises(ValueError, Fixed, 1, 1, observed="monday")
+        self.assertRaises(ValueError, NthWeekday, 1, 7, 1)
+        self.assertRaises(TypeError, RuleCalendar, ["20200101"])
+
+
+class RuleCalendarTests(unittest.TestCase):
+    def test_lazyYears(self):
+        cal = RuleCalendar(US_FEDERAL)
+        self.assertEqual(cal.loadedYears(), [])
+        self.assertEqual(wd.workday("20200702", 3, holidays=cal), "20200708")
+        self.assertEqual(cal.loadedYears(), [2019, 2020, 2021])
+
+    def test_gapBetweenLoadedYears(self):
+        cal = RuleCalendar(US_FEDERAL)
+        cal.isHoliday("20200601")
+        cal.isHoliday("20240601")
+        self.assertTrue(cal.isHoliday("20220704"))
+        self.assertEqual(wd.workday("20220617", 30, holidays=cal), "20220802")
+        self.assertEqual(wd.compareWorkingDays("20220701", "20220706", cal), 2)
+
+    def test_observedAcrossYearEnd(self):
+        cal = RuleCalendar(US_FEDERAL)
+        # Jan 1 2022 is a Saturday, observed Friday Dec 31 2021
+        self.assertTrue(cal.isHoliday("20211231"))
+        self.assertEqual(wd.lastWorkdayOfMonth("20211201", holidays=cal), "20211230")
+
+    def test_nextSubstitute(self):
+        cal = RuleCalendar([Fixed(12, 25, observed="next"), Fixed(12, 26, "next")])
+        cal.loadYears(2021, 2021)
+        # Christmas (Sat) -> Mon 27, Boxing Day (Sun) -> Tue 28
+        self.assertEqual(
+            [d for d in cal.holidays if d.year == 2021],
+            [date(2021, 12, 27), date(2021, 12, 28)],
+        )
+
+    def test_matchesExplicitHolidays(self):
+        rules = US_FEDERAL + (Easter(-2), Easter(1))
+        lazy = RuleCalendar(rules)
+        full = RuleCalendar(rules)
+        full.loadYears(1970, 2080)
+        explicit = wd.BusinessCalendar.fromOrdinals(full._holidays)
+        for datevalue in ("19951222", "20200702", "20240328", "20501231"):
+            for offset in (1, 10, 300, 3000):
+                self.assertEqual(
+                    wd.workday(datevalue, offset, holidays=lazy),
+                    wd.workday(datevalue, offset, holidays=explicit),
+                )
+                self.assertEqual(
+                    wd.workdayStart(datevalue, offset, holidays=lazy),
+                    wd.workdayStart(datevalue, offset, holidays=explicit),
+                )
+            self.assertEqual(
+                wd.compareWorkingDays("19900101", datevalue, holidays=lazy),
+                wd.compareWorkingDays("19900101", datevalue, holidays=explicit),
+            )
+
+    def test_extraHolidaysAndIndex(self):
+        cal = RuleCalendar(US_FEDERAL, holidays=["20200706"])
+        self.assertEqual(cal.workday("20200702", 1), "20200707")
+        info = cal.buildIndex(2019, 2021)
+        self.assertEqual(info["start"], "2019-01-01")
+        self.assertEqual(cal.workday("20200702", 1), "20200707")
+
+    def test_equality(self):
+        self.assertEqual(RuleCalendar(US_FEDERAL), RuleCalendar(list(US_FEDERAL)))
+        self.assertNotEqual(RuleCalendar(US_FEDERAL), RuleCalendar(US_FEDERAL[:3]))
+        self.assertNotEqual(
+            RuleCalendar(US_FEDERAL), RuleCalendar(US_FEDERAL, weekmask="1111001")
+        )
+
+    def test_weekmaskObserved(self):
+        # Friday/Saturday weekend: Fri Dec 25 2020 -> Thu, Sat Jun 19 2021 -> Sun
+        cal = RuleCalendar(US_FEDERAL, weekmask="1111001")
+        self.assertTrue(cal.isHoliday("20201224"))
+        self.assertTrue(cal.isHoliday("20210620"))
+        self.assertEqual(cal.workday("20201223", 1), "20201227")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
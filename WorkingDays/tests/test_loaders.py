@@ -0,0 +1,123 @@
+import os
+import tempfile
+import threading
+import unittest
+from datetime import date
+import WorkingDays.date_utilities as wd
+import WorkingDays.loaders as wl
+
+ICS = """BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+DTSTART;VALUE=DATE:20200703
+DTEND;VALUE=DATE:20200704
+SUMMARY:Independence Day
+  (observed)
+END:VEVENT
+BEGIN:VEVENT
+DTSTART:20201224T000000Z
+DTEND;VALUE=DATE:
+ 20201226
+SUMMARY:Christmas
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+class LoaderTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        wl.clearCache()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        wl.clearCache()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_csv(self):
+        path = self.write(
+            "holidays.csv", "name,date\nJuly 4th,20200703\n,\nX,2020-12-25\n"
+        )
+        self.assertEqual(wl.readHolidays(path, column=1), ["20200703", "2020-12-25"])
+        self.assertEqual(
+            wl.readHolidays(path, column="date"), ["20200703", "2020-12-25"]
+        )
+        path = self.write("short.csv", "12/25\n20200703\n")
+        self.assertEqual(wl.readHolidays(path), ["20200703"])
+        path = self.write("plain.csv", "20200703\n20201225\n")
+        self.assertEqual(wl.readHolidays(path), ["20200703", "20201225"])
+        self.assertRaises(ValueError, wl.readHolidays, path, column="date")
+
+    def test_ics(self):
+        path = self.write("holidays.ics", ICS)
+        self.assertEqual(
+            wl.readHolidays(path),
+            [date(2020, 7, 3), date(2020, 12, 24), date(2020, 12, 25)],
+        )
+
+    def test_json(self):
+        shapes = [
+            '["20200703", 20201225]',
+            '[{"date": "20200703"}, {"date": "20201225", "name": "Christmas"}]',
+            '{"holidays": ["20200703", "20201225"]}',
+            '{"2020-07-03": "July 4th", "2020-12-25": "Christmas"}',
+        ]
+        expected = wd.BusinessCalendar(["20200703", "20201225"])
+        for number, text in enumerate(shapes):
+            path = self.write("holidays{}.json".format(number), text)
+            self.assertEqual(wl.loadHolidays(path), expected)
+
+    def test_cachedUntilChanged(self):
+        path = self.write("holidays.txt", "20200703\n")
+        calendar = wl.loadHolidays(path)
+        self.assertIs(wl.loadHolidays(path), calendar)
+        self.assertEqual(wd.workday("20200702", 1, holidays=calendar), "20200706")
+        # new size
+        self.write("holidays.txt", "20200703\n20200706\n")
+        reloaded = wl.loadHolidays(path)
+        self.assertIsNot(reloaded, calendar)
+        self.assertEqual(wd.workday("20200702", 1, holidays=reloaded), "20200707")
+        # same size, new mtime
+        self.write("holidays.txt", "20200703\n20200707\n")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(wl.loadHolidays(path).workday("20200702", 2), "20200708")
+        self.assertEqual(wl.cacheInfo(), {"hits": 1, "loads": 3, "files": 1})
+
+    def test_optionsAndWeekmask(self):
+        path = self.write("holidays.csv", "name,date\nJuly 4th,20200703\n")
+        calendar = wl.loadHolidays(path, column="date", weekmask="1111001")
+        self.assertEqual(calendar.weekmask, wd.Weekmask("1111001"))
+        self.assertIsNot(wl.loadHolidays(path, column="date"), calendar)
+        self.assertRaises(ValueError, wl.loadHolidays, path, format="xml")
+
+    def test_weekmaskSpellingsShareOneEntry(self):
+        path = self.write("holidays.txt", "20200703\n")
+        calendar = wl.loadHolidays(path, weekmask=["Mon", "Tue", "Wed", "Thu", "Sun"])
+        self.assertEqual(calendar.weekmask, wd.Weekmask("1111001"))
+        self.assertIs(wl.loadHolidays(path, weekmask="1111001"), calendar)
+        self.assertIsNot(wl.loadHolidays(path), calendar)
+
+    def test_concurrentHitsCounted(self):
+        path = self.write("holidays.txt", "20200703\n")
+        wl.loadHolidays(path)
+
+        def load():
+            for _ in range(500):
+                wl.loadHolidays(path)
+
+        threads = [threading.Thread(target=load) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(wl.cacheInfo(), {"hits": 2000, "loads": 1, "files": 1})
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,185 @@
+import unittest
+import WorkingDays.date_utilities as wd
+import WorkingDays.vectorized as wv
+from WorkingDays.holiday_rules import US_FEDERAL, RuleCalendar
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class WorkdayManyTests(unittest.TestCase):
+    holidays = ["20200703", "20200706"]
+    dates = ["20200702", "20200408", "11.04.2020", "20200707", "20200704"]
+    offsets = [3, 2, 3, 0, 1]
+
+    def test_matchesWorkday(self):
+        result = wv.workday_many(self.dates, self.offsets, holidays=self.holidays)
+        self.assertEqual(
+            [str(x).replace("-", "") for x in result],
+            [
+                wd.workday(d, o, holidays=self.holidays)
+                for d, o in zip(self.dates, self.offsets)
+            ],
+        )
+
+    def test_matchesWorkdayStart(self):
+        result = wv.workday_start_many(self.dates, self.offsets, self.holidays)
+        self.assertEqual(
+            [str(x).replace("-", "") for x in result],
+            [
+                wd.workdayStart(d, o, holidays=self.holidays)
+                for d, o in zip(self.dates, self.offsets)
+            ],
+        )
+
+    def test_numpyHolidays(self):
+        holidays = np.array(self.holidays)
+        self.assertEqual(wd.workday("20200702", 3, holidays=holidays), "20200709")
+        self.assertEqual(
+            wd.compareWorkingDays("20200702", "20200707", holidays),
+            wd.compareWorkingDays("20200702", "20200707", self.holidays),
+        )
+        self.assertEqual(wd.workday("20200702", 3, holidays=np.array([])), "20200707")
+        self.assertEqual(
+            str(wv.workday_many(["20200702"], 3, holidays=holidays)[0]), "2020-07-09"
+        )
+
+    def test_sparseWeekmaskRuleCalendar(self):
+        # Mondays only: 150 workdays reach about 3 years ahead
+        lazy = RuleCalendar(US_FEDERAL, weekmask="1000000")
+        result = wv.workday_many(["20200106", "20200601"], [150, -150], lazy)
+        expected = [
+            wd.workday(d, o, RuleCalendar(US_FEDERAL, weekmask="1000000"))
+            for d, o in (("20200106", 150), ("20200601", -150))
+        ]
+        self.assertEqual([str(x).replace("-", "") for x in result], expected)
+
+    def test_scalarOffset(self):
+        result = wv.workday_many(np.array(["2020-04-08"], dtype="datetime64[D]"), 2)
+        self.assertEqual(str(result[0]), "2020-04-10")
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class NetworkdaysManyTests(unittest.TestCase):
+    def test_matchesCompareWorkingDays(self):
+        result = wv.networkdays_many(
+            ["20200701", "20200408", "20200419"],
+            ["20200707", "20200410", "20200413"],
+            holidays=["20200703"],
+        )
+        self.assertEqual(result.tolist(), [3, 2, 0])
+
+    def test_signedReversed(self):
+        result = wv.networkdays_many(
+            ["20200711", "20200707"],
+            ["20200706", "20200701"],
+            holidays=["20200703"],
+            signed=True,
+        )
+        self.assertEqual(result.tolist(), [-5, -3])
+
+    def test_weekmask(self):
+        dates = ["20200702", "20200705", "20200709"]
+        cal = wd.BusinessCalendar(["20200706"], weekmask="1111001")
+        result = wv.workday_many(dates, 2, holidays=cal)
+        self.assertEqual(
+            [str(x).replace("-", "") for x in result],
+            [cal.workday(d, 2) for d in dates],
+        )
+        result = wv.networkdays_many(dates, "20200720", weekmask="1111001")
+        self.assertEqual(
+            result.tolist(),
+            [wd.compareWorkingDays(d, "20200720", weekmask="1111001") for d in dates],
+        )
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class BucketizeManyTests(unittest.TestCase):
+    def test_matchesBucketize(self):
+        timestamps = ["20210731", "20210801", "20210807", "20210808", "20210816"]
+        self.assertEqual(
+            wv.bucketize_many(timestamps, "20210801", 6).tolist(),
+            wd.bucketize(timestamps, "20210801", 6),
+        )
+
+    def test_datetime64(self):
+        timestamps = np.array(
+            ["2021-08-01T23:59", "2021-07-31T12:00"], dtype="datetime64[ns]"
+        )
+        self.assertEqual(wv.bucketize_many(timestamps, "20210801", 6).tolist(), [0, -1])
+
+    def test_epoch(self):
+        self.assertEqual(
+            wv.bucketize_many(
+                [1627776000000, 1627775999999], "20210801", 6, epoch=True
+            ).tolist(),
+            [0, -1],
+        )
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class LastWorkdayManyTests(unittest.TestCase):
+    holidays = ["20200529", "20200930", "20211231"]
+    dates = ["20200515", "20200702", "20200520", "20200915", "20211201", "20211015"]
+
+    def test_matchesLastWorkdayOfMonth(self):
+        for weekmask in (None, "1111001"):
+            result = wv.last_workday_of_month_many(
+                self.dates, self.holidays, weekmask=weekmask
+            )
+            self.assertEqual(
+                [str(x).replace("-", "") for x in result],
+                [
+                    wd.lastWorkdayOfMonth(d, self.holidays, weekmask=weekmask)
+                    for d in self.dates
+                ],
+            )
+
+    def test_matchesLastWorkdayOfQtr(self):
+        quarters = {"Q1": ["Nov", "Dec", "Jan"], "Q2": ["Feb", "Mar", "Apr"]}
+        result = wv.last_workday_of_qtr_many(self.dates, self.holidays, **quarters)
+        self.assertEqual(
+            [str(x).replace("-", "") for x in result],
+            [wd.lastWorkdayOfQtr(d, self.holidays, **quarters) for d in self.dates],
+        )
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class PeriodEndsManyTests(unittest.TestCase):
+    def test_matchesPeriodEnds(self):
+        holidays = ["20200331", "20200630"]
+        result = wv.period_ends_many("20200101", "20201231", "quarter", holidays)
+        self.assertEqual(result.dtype, np.dtype("datetime64[D]"))
+        self.assertEqual(
+            [str(x).replace("-", "") for x in result],
+            wd.period_ends("20200101", "20201231", "quarter", holidays),
+        )
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class EpochManyTests(unittest.TestCase):
+    stamps = [1571824800123, 1571875199999, 0, -1]
+
+    def test_matchesEpochSplit(self):
+        days, times = wv.epoch_split_many(self.stamps)
+        ordinals, expected = wd.epoch_split(self.stamps)
+        self.assertEqual(days.dtype, np.dtype("datetime64[D]"))
+        self.assertEqual((days.astype("int64") + wd.EPOCH_ORDINAL).tolist(), ordinals)
+        self.assertEqual(times.tolist(), expected)
+        self.assertEqual(
+            wv.epoch_days_many(self.stamps).tolist(), wd.epoch_dates(self.stamps)
+        )
+
+    def test_datetimes(self):
+        stamps = np.array(self.stamps, dtype="int64")
+        result = wv.epoch_datetimes_many(stamps)
+        self.assertEqual(result.dtype, np.dtype("datetime64[ms]"))
+        self.assertTrue(np.shares_memory(result, stamps))
+        self.assertEqual(result.tolist(), wd.epoch_datetimes(self.stamps))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -1,5 +1,7 @@
+import threading
 import unittest
 import pytest
+from datetime import date, datetime
 import WorkingDays.date_utilities as wd
 from WorkingDays.tests._test_setup import printVersion
 
@@ -25,7 +27,6 @@ class mainTests(unittest.TestCase):
         )
 
 
-
 class DateCleanupTests(unittest.TestCase):
     def test_epochFormat(self):
         self.assertEqual(
@@ -93,8 +94,43 @@ class DateCleanupTests(unittest.TestCase):
             wd.dateCleanup("20200205").strftime("%Y%m%d%H%M%S"), "20200205000000"
         )
 
+    def test_DateString_YmdH(self):
+        self.assertEqual(
+            wd.dateCleanup("2020020511").strftime("%Y%m%d%H%M%S"), "20200205110000"
+        )
+
+    def test_SlashDateFormat(self):
+        self.assertEqual(
+            wd.dateCleanup("2020/02/05").strftime("%Y%m%d%H%M%S"), "20200205000000"
+        )
+
+    def test_ISOFormatNoZone(self):
+        self.assertEqual(
+            wd.dateCleanup("2015-03-26T10:58:51").strftime("%Y%m%d%H%M%S"),
+            "20150326105851",
+        )
+
+    def test_DateWithMicroseconds(self):
+        self.assertEqual(
+            wd.dateCleanup("2020-02-28 12:30:00.123456").strftime("%Y%m%d%H%M%S"),
+            "20200228123000",
+        )
+
+    def test_FastPathFallback(self):
+        self.assertEqual(
+            wd.dateCleanup("2020-25-02").strftime("%Y%m%d%H%M%S"), "20200225000000"
+        )
+        self.assertRaises(Exception, wd.dateCleanup, "2020-02-30")
+
 
 class WorkdayTests(unittest.TestCase):
+    def test_floatOffset(self):
+        # same as the day-by-day loop: ceil(offset) steps, none for <= 0
+        self.assertEqual(wd.workday("20200702", 2.0, ["20200703"]), "20200707")
+        self.assertEqual(wd.workday("20200702", 2.5, ["20200703"]), "20200708")
+        self.assertEqual(wd.workday("20200702", -1.5), "20200702")
+        self.assertEqual(wd.workdayStart("20200707", 1.5, ["20200703"]), "20200702")
+
     def test_WorkdayWeekendBetweenOffset(self):
         self.assertEqual(wd.workday("08.04.2020", 3), "20200413")
 
@@ -118,6 +154,21 @@ class WorkdayTests(unittest.TestCase):
     def test_WorkdaySundayStart(self):
         self.assertEqual(wd.workday("11.04.2020", 3), "20200415")
 
+    def test_WorkdayLargeOffsetWithHolidays(self):
+        self.assertEqual(
+            wd.workday("20200101", 250, holidays=["20200525", "20200703", "20201225"]),
+            "20201218",
+        )
+
+    def test_WorkdayWeekendHoliday(self):
+        self.assertEqual(
+            wd.workday("20200102", 1, holidays=["20200103", "20200104"]), "20200106"
+        )
+
+    def test_WorkdayZeroAndNegativeOffset(self):
+        self.assertEqual(wd.workday("20200104", 0), "20200104")
+        self.assertEqual(wd.workday("20200104", -3), "20200104")
+
 
 class CompareWorkdayStartTests(unittest.TestCase):
     def test_workdayStartWeekendBetweenOffset(self):
@@ -137,6 +188,17 @@ class CompareWorkdayStartTests(unittest.TestCase):
             wd.workdayStart("20200703", 1, holidays=["20200702"]), "20200701"
         )
 
+    def test_workdayStartLargeOffsetWithHolidays(self):
+        self.assertEqual(
+            wd.workdayStart(
+                "20201231", 250, holidays=["20200525", "20200703", "20201225"]
+            ),
+            "20200113",
+        )
+
+    def test_workdayStartSundayStart(self):
+        self.assertEqual(wd.workdayStart("20200712", 1), "20200710")
+
 
 class CompareWorkingDaysTests(unittest.TestCase):
     def test_compareWorkingDaysWeekendBetweenOffset(self):
@@ -158,6 +220,22 @@ class CompareWorkingDaysTests(unittest.TestCase):
             wd.compareWorkingDays("20200701", "20200707", holidays=["20200703"]), 3
         )
 
+    def test_compareWorkingDaysMultiYear(self):
+        self.assertEqual(
+            wd.compareWorkingDays(
+                "20000101", "20300101", holidays=["20101225", "20200704"]
+            ),
+            7826,
+        )
+
+    def test_compareWorkingDaysSignedReversed(self):
+        self.assertEqual(
+            wd.compareWorkingDays(
+                "20200707", "20200701", holidays=["20200703"], signed=True
+            ),
+            -3,
+        )
+
 
 class CompareLastWorkdayOfMonthTests(unittest.TestCase):
     def test_lastWorkdayOfMonthFeb(self):
@@ -221,6 +299,619 @@ class CompareLastDayOfMonthTests(unittest.TestCase):
         self.assertEqual(wd.lastDayOfMonth("20200413"), "20200430")
 
 
+class BusinessCalendarTests(unittest.TestCase):
+    cal = wd.BusinessCalendar(["20200703", "20200706", "20200706", "07.04.2020"])
+
+    def test_holidaysCompiledOnce(self):
+        self.assertEqual(len(self.cal.holidays), 3)
+        self.assertTrue(self.cal.isHoliday("2020-07-06"))
+        self.assertFalse(self.cal.isHoliday("20200707"))
+
+    def test_workday(self):
+        self.assertEqual(self.cal.workday("20200702", 3), "20200709")
+
+    def test_workdayStart(self):
+        self.assertEqual(self.cal.workdayStart("20200707", 3), "20200630")
+
+    def test_compareWorkingDays(self):
+        self.assertEqual(self.cal.compareWorkingDays("20200701", "20200708"), 3)
+
+    def test_lastWorkdayOfMonth(self):
+        cal = wd.BusinessCalendar(["20200730", "20200731"])
+        self.assertEqual(cal.lastWorkdayOfMonth("20200701"), "20200729")
+
+    def test_lastWorkdayOfQtr(self):
+        cal = wd.BusinessCalendar(["20200430"])
+        self.assertEqual(
+            cal.lastWorkdayOfQtr(
+                "20200213", Q1=["Nov", "Dec", "Jan"], Q2=["Feb", "Mar", "Apr"]
+            ),
+            "20200429",
+        )
+
+    def test_denseIndex(self):
+        cal = wd.BusinessCalendar(["20200703", "20200706"])
+        self.assertIsNone(cal.indexInfo())
+        info = cal.buildIndex(2019, 2021)
+        self.assertEqual(info["days"], 1096)
+        self.assertEqual(info["bytes"], 1097 * 4)
+        self.assertEqual(cal.workday("20200702", 3), "20200709")
+        self.assertEqual(cal.workdayStart("20200707", 3), "20200630")
+        self.assertEqual(cal.compareWorkingDays("20200701", "20200708"), 3)
+
+    def test_denseIndexFallback(self):
+        cal = wd.BusinessCalendar(["20200703"])
+        cal.buildIndex(2020, 2020)
+        self.assertEqual(cal.workday("20201230", 3), "20210104")
+        self.assertEqual(cal.workdayStart("20200102", 2), "20191231")
+        self.assertEqual(cal.compareWorkingDays("20191230", "20200707"), 135)
+        cal.dropIndex()
+        self.assertEqual(cal.compareWorkingDays("20191230", "20200707"), 135)
+
+    def test_moduleFunctionsAcceptCalendar(self):
+        self.assertEqual(wd.workday("20200702", 3, holidays=self.cal), "20200709")
+
+
+class ParseCacheTests(unittest.TestCase):
+    def tearDown(self):
+        wd.disableParseCache()
+
+    def test_disabledByDefault(self):
+        self.assertIsNone(wd.parseCacheInfo())
+
+    def test_hitsAndMisses(self):
+        wd.enableParseCache(maxsize=8)
+        wd.workday("20200702", 3, holidays=["20200703"])
+        wd.workday("20200702", 3, holidays=["20200703"])
+        info = wd.parseCacheInfo()
+        self.assertEqual((info["hits"], info["misses"]), (2, 2))
+        self.assertEqual(
+            wd.dateCleanup(1571824800000, epoch=True).strftime("%Y%m%d%H%M%S"),
+            "20191023100000",
+        )
+
+    def test_lruEviction(self):
+        cache = wd.enableParseCache(maxsize=2)
+        wd.dateCleanup("20200101")
+        wd.dateCleanup("20200102")
+        wd.dateCleanup("20200101")
+        wd.dateCleanup("20200103")
+        self.assertEqual(cache.evictions, 1)
+        wd.dateCleanup("20200101")
+        self.assertEqual(cache.info()["hits"], 2)
+
+    def test_fifoEviction(self):
+        cache = wd.enableParseCache(maxsize=2, policy="fifo")
+        wd.dateCleanup("20200101")
+        wd.dateCleanup("20200102")
+        wd.dateCleanup("20200101")
+        wd.dateCleanup("20200103")
+        wd.dateCleanup("20200101")
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), (1, 4, 2))
+
+    def test_invalidPolicy(self):
+        self.assertRaises(ValueError, wd.ParseCache, policy="random")
+
+
+class ParseManyTests(unittest.TestCase):
+    def test_inferredFormat(self):
+        stream = wd.parse_many(["20200205", "2020-02-06", "20200207"])
+        self.assertEqual(
+            [d.strftime("%Y%m%d") for d in stream], ["20200205", "20200206", "20200207"]
+        )
+        self.assertEqual(stream.format, "%Y%m%d")
+        self.assertEqual(stream.fallback_rows, [1])
+
+    def test_inferredISOFormat(self):
+        stream = wd.parse_many(iter(["2015-03-26T10:58:51Z"] * 3))
+        self.assertEqual(stream.format, "%Y-%m-%dT%H:%M:%SZ")
+        self.assertEqual(
+            list(stream)[2].strftime("%Y%m%d%H%M%S"),
+            "20150326105851",
+        )
+
+    def test_formatHint(self):
+        stream = wd.parse_many(["07.04.2020", "MAR 5 2020"], format="%d.%m.%Y")
+        self.assertEqual(
+            [d.strftime("%Y%m%d") for d in stream], ["20200407", "20200305"]
+        )
+        self.assertEqual(stream.fallback_rows, [1])
+
+    def test_strptimeHint(self):
+        stream = wd.parse_many(["2020-Feb-05"], format="%Y-%b-%d")
+        self.assertEqual(next(stream).strftime("%Y%m%d"), "20200205")
+
+    def test_epochHint(self):
+        stream = wd.parse_many([1571824800000], format="epoch_ms")
+        self.assertEqual(
+            next(stream).strftime("%Y%m%d%H%M%S"),
+            "20191023100000",
+        )
+
+    def test_unknownFormat(self):
+        stream = wd.parse_many(["MAR 25 2020"])
+        self.assertIsNone(stream.format)
+        self.assertEqual(next(stream).strftime("%Y%m%d"), "20200325")
+        self.assertEqual(stream.fallback_rows, [0])
+
+
+class DateBucketingTests(unittest.TestCase):
+    def test_weeklyBuckets(self):
+        self.assertEqual(
+            wd.dateBucketing("20210801", 6, "20210816"),
+            [
+                ("2021-08-01", "2021-08-07"),
+                ("2021-08-08", "2021-08-14"),
+                ("2021-08-15", "2021-08-16"),
+            ],
+        )
+
+    def test_iterBucketsIsLazy(self):
+        buckets = wd.iter_buckets("19000101", 0, "20991231")
+        self.assertEqual(next(buckets), ("1900-01-01", "1900-01-01"))
+        self.assertEqual(next(buckets), ("1900-01-02", "1900-01-02"))
+
+    def test_iterBucketsReturns(self):
+        expected = [
+            (date(2021, 8, 1), date(2021, 8, 10)),
+            (date(2021, 8, 11), date(2021, 8, 15)),
+        ]
+        self.assertEqual(
+            list(wd.iter_buckets("20210801", 9, "20210815", returns="date")), expected
+        )
+        self.assertEqual(
+            list(wd.iter_buckets("20210801", 9, "20210815", returns="int"))[0],
+            (20210801, 20210810),
+        )
+        with self.assertWarns(DeprecationWarning):
+            buckets = wd.iter_buckets("20210801", 9, "20210815", asdate=True)
+        self.assertEqual(list(buckets), expected)
+        # checked on the call, not on the first next()
+        with self.assertRaises(ValueError):
+            wd.iter_buckets("20210801", 9, "20210815", returns="iso8601")
+
+    def test_workdayBuckets(self):
+        self.assertEqual(
+            wd.dateBucketing(
+                "20210801", 4, "20210820", workdays=True, holidays=["20210804"]
+            ),
+            [
+                ("2021-08-02", "2021-08-09"),
+                ("2021-08-10", "2021-08-16"),
+                ("2021-08-17", "2021-08-20"),
+            ],
+        )
+
+    def test_iterWorkdayBucketsMatchesWorkday(self):
+        cal = wd.BusinessCalendar(["20210906", "20211125"])
+        for start, end in wd.iter_buckets(
+            "20210801", 9, "20211231", returns="date", workdays=True, holidays=cal
+        ):
+            self.assertTrue(cal.isWorkday(start))
+            if end != date(2021, 12, 31):
+                self.assertEqual(
+                    cal.workday(start.strftime("%Y%m%d"), 9), end.strftime("%Y%m%d")
+                )
+
+    def test_startIsToday(self):
+        today = datetime.utcnow().strftime("%Y-%m-%d")
+        self.assertEqual(wd.dateBucketing(today, 6), [(today, today)])
+
+
+class BucketizeTests(unittest.TestCase):
+    def test_bucketize(self):
+        self.assertEqual(
+            wd.bucketize(
+                ["20210731", "20210801", "20210807", "20210808", "20210816"],
+                "20210801",
+                6,
+            ),
+            [-1, 0, 0, 1, 2],
+        )
+
+    def test_bucketizeMatchesDateBucketing(self):
+        buckets = wd.dateBucketing("20210801", 4, "20210830")
+        for index, (start, end) in enumerate(buckets):
+            self.assertEqual(wd.bucketize([start, end], "20210801", 4), [index] * 2)
+            self.assertEqual(
+                wd.bucketBounds(index, "20210801", 4)[0].isoformat(), start
+            )
+
+    def test_bucketizeEpoch(self):
+        self.assertEqual(
+            wd.bucketize([1627776000000, 1627775999999], "20210801", 6, epoch=True),
+            [0, -1],
+        )
+
+    def test_aggregateBuckets(self):
+        events = iter(
+            [("20210801", 5), ("20210809", 7), (date(2021, 8, 3), 1), ("20210810", 2)]
+        )
+        self.assertEqual(
+            wd.aggregate_buckets(events, "20210801", 6),
+            {
+                0: {"count": 2, "sum": 6, "min": 1, "max": 5},
+                1: {"count": 2, "sum": 9, "min": 2, "max": 7},
+            },
+        )
+
+
+class MetricsTests(unittest.TestCase):
+    def tearDown(self):
+        wd.disableMetrics()
+
+    def test_disabledByDefault(self):
+        self.assertIsNone(wd.metricsInfo())
+
+    def test_callsCountersAndHistograms(self):
+        wd.enableMetrics()
+        wd.workday("20200702", 3, holidays=["20200703", "20200706"])
+        wd.workdayStart("20200710", 2)
+        wd.dateCleanup("MAR 25 2020")
+        wd.dateBucketing("20210801", 6, "20210816")
+        info = wd.metricsInfo()
+        self.assertEqual(info["calls"]["workday"]["count"], 1)
+        self.assertEqual(info["calls"]["workdayStart"]["count"], 1)
+        self.assertEqual(info["calls"]["holidays"]["count"], 1)
+        self.assertEqual(info["counters"]["holidays.parsed"], 2)
+        self.assertEqual(info["counters"]["dateCleanup.branch.heuristic"], 1)
+        self.assertEqual(info["counters"]["dateCleanup.format.other"], 1)
+        self.assertEqual(info["counters"]["dateCleanup.format.%Y%m%d"], 6)
+        self.assertEqual(info["histograms"]["workday.iterations"], {"1": 1})
+        self.assertEqual(info["histograms"]["workdayStart.iterations"], {"0": 1})
+        self.assertEqual(info["histograms"]["dateBucketing.buckets"], {"2-3": 1})
+
+    def test_cachedEpoch(self):
+        wd.enableMetrics()
+        wd.enableParseCache()
+        try:
+            for _ in range(2):
+                self.assertEqual(
+                    wd.dateCleanup(1571824800000, epoch=True),
+                    datetime(2019, 10, 23, 10),
+                )
+        finally:
+            wd.disableParseCache()
+        info = wd.metricsInfo()
+        self.assertEqual(info["counters"]["dateCleanup.branch.cache"], 1)
+        self.assertEqual(info["counters"]["dateCleanup.format.epoch_ms"], 2)
+
+    def test_hook(self):
+        events = []
+        wd.enableMetrics(hook=lambda *event: events.append(event))
+        wd.lastWorkdayOfMonth("20200510")
+        self.assertIn(("count", "dateCleanup.branch.fast", 1), events)
+        self.assertEqual(events[-1][:2], ("timing", "lastWorkdayOfMonth"))
+
+    def test_failingHookIsIgnored(self):
+        def hook(kind, name, value):
+            raise RuntimeError("metrics backend down")
+
+        wd.enableMetrics(hook=hook)
+        with self.assertLogs(wd.logs, "WARNING"):
+            self.assertEqual(wd.compareWorkingDays("20200701", "20200707"), 4)
+
+
+class SortByDateTests(unittest.TestCase):
+    records = [
+        {"id": 1, "d": "2020-07-10", "t": "20200101"},
+        {"id": 2, "d": "07.04.2020", "t": "20200103"},
+        {"id": 3, "d": "20200702", "t": "20200102"},
+        {"id": 4, "d": "20200702120000", "t": "20200104"},
+    ]
+
+    def ids(self, records):
+        return [record["id"] for record in records]
+
+    def test_sortParsesDates(self):
+        self.assertEqual(self.ids(wd.sort_by_date(self.records, "d")), [2, 3, 4, 1])
+        self.assertEqual(
+            self.ids(wd.sort_by_date(self.records, "d", reverse=True)), [1, 4, 3, 2]
+        )
+
+    def test_keyCallableAndSequences(self):
+        rows = [(r["id"], r["d"]) for r in self.records]
+        self.assertEqual(
+            [row[0] for row in wd.sort_by_date(rows, 1)],
+            [row[0] for row in wd.sort_by_date(rows, lambda row: row[1])],
+        )
+        stamps = [{"ms": 1586217600000}, {"ms": 1571824800000}]
+        self.assertEqual(
+            wd.sort_by_date(stamps, "ms", epoch=True)[0]["ms"], 1571824800000
+        )
+
+    def test_errors(self):
+        records = self.records + [{"id": 5, "d": "not a date"}]
+        with self.assertRaises(Exception):
+            wd.sort_by_date(records, "d")
+        self.assertEqual(self.ids(wd.sort_by_date(records, "d", errors="first"))[0], 5)
+        self.assertEqual(
+            self.ids(wd.sort_by_date(records, "d", reverse=True, errors="last"))[-1], 5
+        )
+
+    def test_topErrors(self):
+        records = iter(self.records + [{"id": 5, "d": "not a date"}])
+        self.assertEqual(
+            self.ids(wd.top_n_by_date(records, "d", 2, errors="first")), [5, 1]
+        )
+        records = self.records + [{"id": 5, "d": "not a date"}]
+        self.assertEqual(
+            self.ids(wd.top_n_by_date(records, "d", 2, errors="last")), [1, 4]
+        )
+        self.assertEqual(
+            self.ids(wd.top_n_by_date(records, "d", 5, latest=False, errors="last")),
+            [2, 3, 4, 1, 5],
+        )
+        with self.assertRaises(Exception):
+            wd.top_n_by_date(records, "d", 2)
+
+    def test_concurrentKeys(self):
+        results = {}
+
+        def sortOn(key):
+            for _ in range(200):
+                results[key] = self.ids(wd.sort_by_date(self.records, key))
+
+        threads = [threading.Thread(target=sortOn, args=(k,)) for k in ("d", "t")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {"d": [2, 3, 4, 1], "t": [1, 3, 2, 4]})
+
+    def test_topAndMerge(self):
+        self.assertEqual(self.ids(wd.top_n_by_date(self.records, "d", 2)), [1, 4])
+        self.assertEqual(
+            self.ids(wd.top_n_by_date(self.records, "d", 1, latest=False)), [2]
+        )
+        first = wd.sort_by_date(self.records[:2], "d")
+        second = wd.sort_by_date(self.records[2:], "d")
+        self.assertEqual(
+            self.ids(wd.merge_by_date(first, second, key="d")), [2, 3, 4, 1]
+        )
+
+
+class PeriodEndsTests(unittest.TestCase):
+    def test_monthEnds(self):
+        self.assertEqual(
+            wd.period_ends("20200115", "20200610", holidays=["20200630"]),
+            ["20200131", "20200228", "20200331", "20200430", "20200529", "20200629"],
+        )
+
+    def test_quarterEnds(self):
+        self.assertEqual(
+            list(wd.iter_period_ends("20200101", "20201231", "quarter")),
+            ["20200331", "20200630", "20200930", "20201231"],
+        )
+
+    def test_matchesLastWorkdayFunctions(self):
+        holidays = ["20200430", "20200501", "20200731"]
+        quarters = {"Q1": ["Nov", "Dec", "Jan"], "Q2": ["Feb", "Mar", "Apr"]}
+        expected = []
+        for day in range(0, 400, 5):
+            datevalue = (datetime(2019, 10, 1) + wd.timedelta(days=day)).strftime(
+                "%Y%m%d"
+            )
+            result = wd.lastWorkdayOfQtr(datevalue, holidays, **quarters)
+            if result not in expected:
+                expected.append(result)
+        self.assertEqual(
+            wd.period_ends("20191001", "20201030", "quarter", holidays, **quarters),
+            expected,
+        )
+
+    def test_dateAndOrdinalOutput(self):
+        ends = wd.period_ends("20200101", "20200229", returns="date")
+        self.assertEqual(ends, [date(2020, 1, 31), date(2020, 2, 28)])
+        self.assertEqual(
+            list(wd.period_end_ordinals("20200101", "20200229")),
+            [d.toordinal() for d in ends],
+        )
+
+    def test_deprecatedAsdate(self):
+        with self.assertWarns(DeprecationWarning):
+            ends = wd.period_ends("20200101", "20200229", asdate=True)
+        self.assertEqual(ends, [date(2020, 1, 31), date(2020, 2, 28)])
+        with self.assertWarns(DeprecationWarning):
+            ends = list(wd.iter_period_ends("20200101", "20200229", asdate=True))
+        self.assertEqual(ends, [date(2020, 1, 31), date(2020, 2, 28)])
+
+    def test_invalidPeriod(self):
+        with self.assertRaises(ValueError):
+            wd.period_ends("20200101", "20201231", "week")
+        # checked on the call, not on the first next()
+        with self.assertRaises(ValueError):
+            wd.iter_period_ends("20200101", "20201231", "week")
+        with self.assertRaises(ValueError):
+            wd.iter_period_ends("20200101", "20201231", returns="iso")
+
+
+class FiscalCalendarTests(unittest.TestCase):
+    def test_tupleAndListKwargsCachedApart(self):
+        tuples = {"Q1": ("Nov", "Dec", "Jan"), "Q2": ("Feb", "Mar", "Apr")}
+        lists = {"Q1": ["Nov", "Dec", "Jan"], "Q2": ["Feb", "Mar", "Apr"]}
+        # tuples aren't valid quarter lists: calendar year quarters
+        self.assertEqual(wd.lastWorkdayOfQtr("20200213", **tuples), "20200331")
+        self.assertEqual(wd.lastWorkdayOfQtr("20200213", **lists), "20200430")
+
+    def test_matchesQtrKwargs(self):
+        quarters = {"Q1": ["Nov", "Dec", "Jan"], "Q2": ["Feb", "Mar", "Apr"]}
+        fiscal = wd.FiscalCalendar(**quarters)
+        for datevalue in ("20200213", "20191115", "20200105", "20200720"):
+            self.assertEqual(
+                wd.lastWorkdayOfQtr(datevalue, fiscal=fiscal),
+                wd.lastWorkdayOfQtr(datevalue, **quarters),
+            )
+        self.assertEqual(fiscal.lastWorkdayOfQtr("20200213"), "20200430")
+
+    def test_fromStartMonth(self):
+        fiscal = wd.FiscalCalendar.fromStartMonth("Oct")
+        self.assertEqual(fiscal.quarterEnd("20201115"), date(2020, 12, 31))
+        self.assertEqual(fiscal.quarterEnd("20201001"), date(2020, 12, 31))
+        self.assertEqual(fiscal.quarterEnd("20200930"), date(2020, 9, 30))
+        fiscal = wd.FiscalCalendar.fromStartMonth(2)
+        self.assertEqual(fiscal.quarterEnd("20191215"), date(2020, 1, 31))
+        self.assertRaises(ValueError, wd.FiscalCalendar.fromStartMonth, 13)
+
+    def test_retail445(self):
+        # fiscal year ends on the Saturday nearest Jan 31
+        retail = wd.FiscalCalendar.retail(yearEndMonth=1, weekday=5, method="nearest")
+        self.assertEqual(retail.quarterEnd("20200202"), date(2020, 5, 2))
+        self.assertEqual(retail.quarterEnd("20200201"), date(2020, 2, 1))
+        self.assertEqual(retail.periodEnd("20200315"), date(2020, 3, 28))
+        self.assertEqual(retail.quarterEnd("20210130"), date(2021, 1, 30))
+        self.assertEqual(
+            wd.period_ends("20200202", "20210130", "quarter", fiscal=retail),
+            ["20200501", "20200731", "20201030", "20210129"],
+        )
+
+    def test_retail53Weeks(self):
+        retail = wd.FiscalCalendar.retail(12, weekday=5, pattern=(5, 4, 4))
+        # Dec 25 2021 .. Dec 31 2022 is a 53 week year (last period 5 weeks)
+        self.assertEqual(retail.periodEnd("20220101"), date(2022, 1, 29))
+        self.assertEqual(retail.periodEnd("20221215"), date(2022, 12, 31))
+        self.assertEqual(retail.periodEnd("20221126"), date(2022, 11, 26))
+        self.assertEqual(retail.periodEnd("20231215"), date(2023, 12, 30))
+        self.assertRaises(ValueError, wd.FiscalCalendar.retail, pattern=(4, 4, 4))
+
+
+class WeekmaskTests(unittest.TestCase):
+    def test_compile(self):
+        self.assertEqual(str(wd.Weekmask()), "1111100")
+        self.assertEqual(wd.Weekmask("Sun Mon Tue Wed Thu"), wd.Weekmask("1111001"))
+        self.assertEqual(wd.Weekmask(["Mon", "Saturday"]).workdays, ("Mon", "Sat"))
+        self.assertEqual(wd.Weekmask(0b0111111).days, 6)
+        self.assertRaises(ValueError, wd.Weekmask, "0000000")
+        self.assertRaises(ValueError, wd.Weekmask, "Mon Funday")
+
+    def test_fridaySaturdayWeekend(self):
+        # Thu 20200702 -> Sun 20200705, Fri/Sat are the weekend
+        self.assertEqual(wd.workday("20200702", 1, weekmask="1111001"), "20200705")
+        self.assertEqual(wd.workdayStart("20200705", 1, weekmask="1111001"), "20200702")
+        self.assertEqual(
+            wd.compareWorkingDays("20200701", "20200708", weekmask="1111001"), 5
+        )
+        # Jul 31 2020 is a Friday -> Thursday
+        self.assertEqual(
+            wd.lastWorkdayOfMonth("20200715", weekmask="1111001"), "20200730"
+        )
+
+    def test_sixDayWeek(self):
+        cal = wd.BusinessCalendar(["20200704"], weekmask="1111110")
+        self.assertEqual(cal.workday("20200702", 2), "20200706")
+        self.assertEqual(cal.workday("20200702", 12), "20200717")
+        self.assertEqual(cal.compareWorkingDays("20200701", "20200715"), 11)
+        # Sunday May 31 2020 -> Saturday
+        self.assertEqual(cal.lastWorkdayOfMonth("20200515"), "20200530")
+        self.assertNotEqual(cal, wd.BusinessCalendar(["20200704"]))
+
+    def test_matchesDayLoop(self):
+        holidays = ["20200703", "20200709", "20200716", "20200802"]
+        for mask in ("1111100", "1111001", "1111110", "1010101", "0000001"):
+            cal = wd.BusinessCalendar(holidays, weekmask=mask)
+            day = date(2020, 7, 1)
+            for offset in range(0, 40):
+                expected, count = day, 0
+                while count < offset:
+                    expected = date.fromordinal(expected.toordinal() + 1)
+                    count += cal.isWorkday(expected.strftime("%Y%m%d"))
+                self.assertEqual(
+                    cal.workday("20200701", offset), expected.strftime("%Y%m%d")
+                )
+
+    def test_calendarConflict(self):
+        cal = wd.BusinessCalendar(weekmask="1111001")
+        self.assertEqual(wd.workday("20200702", 1, cal, weekmask="1111001"), "20200705")
+        self.assertRaises(ValueError, wd.workday, "20200702", 1, cal, "1111100")
+
+
+class ReturnTypesTests(unittest.TestCase):
+    def test_returns(self):
+        self.assertEqual(wd.workday("20200702", 3), "20200707")
+        self.assertEqual(wd.workday("20200702", 3, returns="date"), date(2020, 7, 7))
+        self.assertEqual(
+            wd.workday("20200702", 3, returns="ordinal"), date(2020, 7, 7).toordinal()
+        )
+        self.assertEqual(wd.workday("20200702", 3, returns="int"), 20200707)
+        self.assertEqual(wd.workdayStart("20200707", 3, returns="int"), 20200702)
+        self.assertEqual(wd.calendarDay("20200702", 3, returns="int"), 20200705)
+        self.assertEqual(wd.lastDayOfMonth("20200202", returns="int"), 20200229)
+        self.assertEqual(wd.lastWorkdayOfMonth("20200515", returns="int"), 20200529)
+        self.assertEqual(
+            wd.lastWorkdayOfQtr("20200213", returns="date"), date(2020, 3, 31)
+        )
+        self.assertEqual(
+            wd.period_ends("20200101", "20200630", "quarter", returns="int"),
+            [20200331, 20200630],
+        )
+        self.assertRaises(ValueError, wd.workday, "20200702", 3, returns="iso")
+
+    def test_nativeInputs(self):
+        expected = "20200707"
+        for datevalue in (
+            date(2020, 7, 2),
+            datetime(2020, 7, 2, 12, 30),
+            date(2020, 7, 2).toordinal(),
+            20200702,
+        ):
+            self.assertEqual(wd.workday(datevalue, 3), expected)
+        self.assertEqual(
+            wd.compareWorkingDays(date(2020, 7, 1), 20200708, holidays=[20200703]), 4
+        )
+        self.assertRaises(ValueError, wd.workday, 20200231, 3)
+
+    def test_intsOutsideOrdinalRange(self):
+        # years, YYYYMM and 7 digit ints aren't silently read as ordinals
+        for datevalue in (2020, 202007, 1234567):
+            self.assertRaises(Exception, wd.workday, datevalue, 1)
+        self.assertEqual(wd.workday(date(1000, 1, 1).toordinal(), 0), "10000101")
+
+    def test_chained(self):
+        holidays = wd.BusinessCalendar(["20200703"])
+        start = wd.workday(date(2020, 7, 2), 5, holidays, returns="ordinal")
+        self.assertEqual(
+            wd.lastWorkdayOfMonth(start, holidays, returns="date"), date(2020, 7, 31)
+        )
+        self.assertEqual(
+            wd.workdayStart(start, 5, holidays, returns="date"), date(2020, 7, 2)
+        )
+
+
+class EpochBatchTests(unittest.TestCase):
+    stamps = [1571824800123, 1571875199999, 0, -1]
+
+    def test_exactMilliseconds(self):
+        self.assertEqual(
+            wd.dateCleanup(1571824800123, epoch=True),
+            datetime(2019, 10, 23, 10, 0, 0, 123000),
+        )
+        self.assertEqual(
+            wd.dateCleanup(-1, epoch=True), datetime(1969, 12, 31, 23, 59, 59, 999000)
+        )
+
+    def test_epochDatetimes(self):
+        self.assertEqual(
+            wd.epoch_datetimes(self.stamps),
+            [wd.dateCleanup(stamp, epoch=True) for stamp in self.stamps],
+        )
+
+    def test_epochDates(self):
+        expected = [date(2019, 10, 23), date(2019, 10, 23)]
+        expected += [date(1970, 1, 1), date(1969, 12, 31)]
+        self.assertEqual(wd.epoch_dates(self.stamps), expected)
+        self.assertEqual(
+            wd.epoch_dates(self.stamps, returns="ordinal"),
+            [day.toordinal() for day in expected],
+        )
+        self.assertEqual(wd.epoch_dates(self.stamps[:1], returns="str"), ["20191023"])
+        self.assertRaises(ValueError, wd.epoch_dates, self.stamps, returns="iso")
+
+    def test_epochSplit(self):
+        ordinals, times = wd.epoch_split(self.stamps)
+        self.assertEqual(ordinals, wd.epoch_dates(self.stamps, returns="ordinal"))
+        self.assertEqual(times, [36000123, 86399999, 0, 86399999])
+
+
 if __name__ == "__main__":  # pragma: no cover
     main()
 
@@ -234,6 +925,18 @@ tests = [
     CompareLastWorkdayOfMonthTests,
     CompareLastWorkDayOfQtrTests,
     CompareLastDayOfMonthTests,
+    BusinessCalendarTests,
+    ParseCacheTests,
+    ParseManyTests,
+    DateBucketingTests,
+    BucketizeTests,
+    MetricsTests,
+    SortByDateTests,
+    PeriodEndsTests,
+    FiscalCalendarTests,
+    WeekmaskTests,
+    ReturnTypesTests,
+    EpochBatchTests,
 ]
 for test_class in tests:  # pragma: no cover
     suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
@@ -0,0 +1,324 @@
+"""
+    NumPy batch versions of the "date_utilities" workday functions.
+
+    NumPy is an optional dependency; it is only imported by this module and
+    every function raises ImportError when it is not installed.
+
+FUNCTIONS:
+    toDays(datevalues)
+    workday_many(datevalues, offsets, holidays=[], weekmask=None)
+    workday_start_many(datevalues, offsets, holidays=[], weekmask=None)
+    networkdays_many(datevalues, comparedates, holidays=[], signed=False,
+                     weekmask=None)
+    last_workday_of_month_many(datevalues, holidays=[], weekmask=None)
+    last_workday_of_qtr_many(datevalues, holidays=[], weekmask=None, **kwargs)
+    bucketize_many(timestamps, start, interval, epoch=False)
+    epoch_days_many(timestamps)
+    epoch_split_many(timestamps)
+    epoch_datetimes_many(timestamps)
+    period_ends_many(startDT, endDT, period="month", holidays=[], **kwargs)
+
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+from functools import lru_cache
+
+from WorkingDays.date_utilities import (
+    EPOCH_ORDINAL,
+    MS_PER_DAY,
+    period_end_ordinals,
+    _calendar,
+    _fiscal,
+    _rollBackOrdinal,
+    _toOrdinal,
+    _MAX_ORDINAL,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def _requireNumpy():
+    if np is None:
+        raise ImportError("numpy is required for WorkingDays.vectorized")
+
+
+@lru_cache(maxsize=32)
+def _compileHolidays(ordinals, weekmask="1111100"):
+    # -------------------------------------------------------------------------
+    # compile the working-weekday holiday ordinals and the weekmask into a
+    # numpy busdaycalendar once
+    # -------------------------------------------------------------------------
+    holidays = np.array(ordinals, dtype="int64") - EPOCH_ORDINAL
+    return np.busdaycalendar(
+        weekmask=weekmask, holidays=holidays.astype("datetime64[D]")
+    )
+
+
+def _busdaycalendar(calendar, days=None, offsets=0):
+    # -------------------------------------------------------------------------
+    # lazy calendars ("RuleCalendar") first load the years "days" can reach
+    # -------------------------------------------------------------------------
+    loadYears = getattr(calendar, "loadYears", None)
+    if loadYears is not None and days is not None and days.size:
+        # ---------------------------------------------------------------------
+        # each skipped workday (offset or holiday) spans 7 / workdays-per-week
+        # calendar days; widen until the window holds no unseen holidays
+        # ---------------------------------------------------------------------
+        skipped = int(np.abs(offsets).max(initial=0))
+        perweek = max(calendar._weekmask.days, 1)
+        start = int(days.min().astype("int64")) + EPOCH_ORDINAL
+        end = int(days.max().astype("int64")) + EPOCH_ORDINAL
+        holidays = 0
+        while True:
+            pad = -(-(skipped + holidays) * 7 // perweek) + 31
+            first = max(start - pad, 1)
+            last = min(end + pad, _MAX_ORDINAL)
+            loadYears(date.fromordinal(first).year, date.fromordinal(last).year)
+            ordinals = calendar._ordinals
+            count = bisect_right(ordinals, last) - bisect_left(ordinals, first)
+            if count <= holidays:
+                break
+            holidays = count
+    return _compileHolidays(calendar._ordinals, str(calendar._weekmask))
+
+
+def toDays(datevalues):
+    """
+    FUNCTION: toDays
+
+    DESCRIPTION:
+        Returns a numpy datetime64[D] array of "datevalues". datetime64 arrays
+        are converted without parsing; anything else passes through
+        "_toOrdinal" one value at a time (date/datetime values and ints are
+        converted without parsing, anything else through "dateCleanup").
+    """
+    _requireNumpy()
+    if isinstance(datevalues, np.ndarray) and datevalues.dtype.kind == "M":
+        return datevalues.astype("datetime64[D]")
+    ordinals = np.array(
+        [_toOrdinal(value) for value in np.atleast_1d(datevalues).tolist()],
+        dtype="int64",
+    )
+    return (ordinals - EPOCH_ORDINAL).astype("datetime64[D]")
+
+
+def workday_many(datevalues, offsets, holidays=[], weekmask=None):
+    """
+    FUNCTION: workday_many
+
+    DESCRIPTION:
+        Vectorized "workday": returns a datetime64[D] array with the
+        offset'th working day after each of "datevalues". "offsets" can be a
+        single int or an array broadcast against "datevalues".
+
+    EXAMPLES:
+        >>> workday_many(["20200702", "20200408"], [3, 2], holidays=["20200703"])
+        array(['2020-07-08', '2020-04-10'], dtype='datetime64[D]')
+    """
+    _requireNumpy()
+    days = toDays(datevalues)
+    offsets = np.asarray(offsets, dtype="int64")
+    busdaycal = _busdaycalendar(_calendar(holidays, weekmask), days, offsets)
+    # -------------------------------------------------------------------------
+    # rolling a non-working start date back keeps "workday" semantics: the
+    # start date itself is never counted, offsets <= 0 return the start date
+    # -------------------------------------------------------------------------
+    forward = offsets > 0
+    result = np.busday_offset(
+        days, np.where(forward, offsets, 0), roll="backward", busdaycal=busdaycal
+    )
+    return np.where(forward, result, days)
+
+
+def workday_start_many(datevalues, offsets, holidays=[], weekmask=None):
+    """
+    FUNCTION: workday_start_many
+
+    DESCRIPTION:
+        Vectorized "workdayStart": returns a datetime64[D] array with the
+        offset'th working day before each of "datevalues".
+    """
+    _requireNumpy()
+    days = toDays(datevalues)
+    offsets = np.asarray(offsets, dtype="int64")
+    busdaycal = _busdaycalendar(_calendar(holidays, weekmask), days, offsets)
+    backward = offsets > 0
+    result = np.busday_offset(
+        days, np.where(backward, -offsets, 0), roll="forward", busdaycal=busdaycal
+    )
+    return np.where(backward, result, days)
+
+
+def networkdays_many(
+    datevalues, comparedates, holidays=[], signed=False, weekmask=None
+):
+    """
+    FUNCTION: networkdays_many
+
+    DESCRIPTION:
+        Vectorized "compareWorkingDays": returns an int64 array with the
+        working days from each of "datevalues" up to (excluding) the matching
+        "comparedates". Reversed ranges return 0 unless signed=True.
+    """
+    _requireNumpy()
+    startdates = toDays(datevalues)
+    comparedates = toDays(comparedates)
+    busdaycal = _busdaycalendar(
+        _calendar(holidays, weekmask), np.concatenate([startdates, comparedates])
+    )
+    # -------------------------------------------------------------------------
+    # numpy counts a reversed range as (end, begin], so count the swapped
+    # range [comparedate, datevalue) to match "compareWorkingDays"
+    # -------------------------------------------------------------------------
+    low = np.minimum(startdates, comparedates)
+    high = np.maximum(startdates, comparedates)
+    networkdays = np.busday_count(low, high, busdaycal=busdaycal).astype("int64")
+    reversed_ = comparedates < startdates
+    if signed:
+        return np.where(reversed_, -networkdays, networkdays)
+    return np.where(reversed_, 0, networkdays)
+
+
+def _rollBackMany(lastdays, calendar):
+    # -------------------------------------------------------------------------
+    # roll the (few distinct) period end ordinals back one at a time with the
+    # "lastWorkdayOfMonth" rules, as a datetime64[D] array
+    # -------------------------------------------------------------------------
+    isHoliday = calendar._isHoliday
+    weekmask = calendar._weekmask
+    rolled = [_rollBackOrdinal(o, isHoliday, weekmask) for o in lastdays]
+    return (np.array(rolled, dtype="int64") - EPOCH_ORDINAL).astype("datetime64[D]")
+
+
+def last_workday_of_month_many(datevalues, holidays=[], weekmask=None):
+    """
+    FUNCTION: last_workday_of_month_many
+
+    DESCRIPTION:
+        Vectorized "lastWorkdayOfMonth": returns a datetime64[D] array with
+        the last working day of the month of each of "datevalues". Every
+        distinct month is rolled back once.
+
+    EXAMPLES:
+        >>> last_workday_of_month_many(["20200515", "20200702", "20200520"])
+        array(['2020-05-29', '2020-07-31', '2020-05-29'], dtype='datetime64[D]')
+    """
+    _requireNumpy()
+    days = toDays(datevalues)
+    months, inverse = np.unique(days.astype("datetime64[M]"), return_inverse=True)
+    lastdays = ((months + 1).astype("datetime64[D]") - 1).astype("int64")
+    rolled = _rollBackMany(
+        (lastdays + EPOCH_ORDINAL).tolist(), _calendar(holidays, weekmask)
+    )
+    return rolled[inverse.reshape(days.shape)]
+
+
+def last_workday_of_qtr_many(datevalues, holidays=[], weekmask=None, **kwargs):
+    """
+    FUNCTION: last_workday_of_qtr_many
+
+    DESCRIPTION:
+        Vectorized "lastWorkdayOfQtr" (same Q1-Q4 / fiscal= kwargs): returns
+        a datetime64[D] array with the last working day of the quarter of
+        each of "datevalues". Every distinct day is resolved once.
+    """
+    _requireNumpy()
+    days = toDays(datevalues)
+    unique, inverse = np.unique(days, return_inverse=True)
+    quarterEnd = _fiscal(kwargs)._quarterEndOrdinal
+    lastdays = [
+        quarterEnd(o) for o in (unique.astype("int64") + EPOCH_ORDINAL).tolist()
+    ]
+    rolled = _rollBackMany(lastdays, _calendar(holidays, weekmask))
+    return rolled[inverse.reshape(days.shape)]
+
+
+def bucketize_many(timestamps, start, interval, epoch=False):
+    """
+    FUNCTION: bucketize_many
+
+    DESCRIPTION:
+        Vectorized "bucketize": returns an int64 array with the bucket index
+        of each of "timestamps" (datetime64 arrays, dates or epoch ms when
+        epoch=True) for buckets of interval + 1 days starting on "start".
+    """
+    _requireNumpy()
+    if epoch:
+        days = np.floor_divide(np.asarray(timestamps, dtype="int64"), MS_PER_DAY)
+    else:
+        days = toDays(timestamps).astype("int64")
+    startday = _toOrdinal(start) - EPOCH_ORDINAL
+    return np.floor_divide(days - startday, interval + 1)
+
+
+def _epochMs(timestamps):
+    # int64 epoch milliseconds (no copy for an int64 array)
+    return np.asarray(timestamps, dtype="int64")
+
+
+def epoch_days_many(timestamps):
+    """
+    FUNCTION: epoch_days_many
+
+    DESCRIPTION:
+        Returns the (UTC) days of the epoch milliseconds "timestamps" as a
+        datetime64[D] array (integer floor division, correct before 1970).
+
+    EXAMPLES:
+        >>> epoch_days_many([1571824800000, -1])
+        array(['2019-10-23', '1969-12-31'], dtype='datetime64[D]')
+    """
+    _requireNumpy()
+    return np.floor_divide(_epochMs(timestamps), MS_PER_DAY).astype("datetime64[D]")
+
+
+def epoch_split_many(timestamps):
+    """
+    FUNCTION: epoch_split_many
+
+    DESCRIPTION:
+        Vectorized "epoch_split": returns the datetime64[D] days and the
+        int64 milliseconds since midnight of the epoch milliseconds
+        "timestamps".
+
+    EXAMPLES:
+        >>> days, ms = epoch_split_many([1571824800000])
+        >>> days, ms
+        (array(['2019-10-23'], dtype='datetime64[D]'), array([36000000]))
+    """
+    _requireNumpy()
+    days, ms = np.divmod(_epochMs(timestamps), MS_PER_DAY)
+    return days.astype("datetime64[D]"), ms
+
+
+def epoch_datetimes_many(timestamps):
+    """
+    FUNCTION: epoch_datetimes_many
+
+    DESCRIPTION:
+        Returns the epoch milliseconds "timestamps" as a datetime64[ms]
+        array. An int64 input is reinterpreted without a copy.
+    """
+    _requireNumpy()
+    return _epochMs(timestamps).view("datetime64[ms]")
+
+
+def period_ends_many(startDT, endDT, period="month", holidays=[], **kwargs):
+    """
+    FUNCTION: period_ends_many
+
+    DESCRIPTION:
+        "iter_period_ends" as a datetime64[D] array.
+
+    EXAMPLES:
+        >>> period_ends_many("20200101", "20200331")
+        array(['2020-01-31', '2020-02-28', '2020-03-31'], dtype='datetime64[D]')
+    """
+    _requireNumpy()
+    ordinals = period_end_ordinals(startDT, endDT, period, holidays, **kwargs)
+    days = np.frombuffer(ordinals, dtype=np.int32).astype("int64") - EPOCH_ORDINAL
+    return days.astype("datetime64[D]")
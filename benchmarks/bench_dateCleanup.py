@@ -0,0 +1,63 @@
+"""
+    Micro-benchmark of "dateCleanup" per input format: the fast path
+    dispatcher against the full heuristic parser.
+
+USAGE:
+    python benchmarks/bench_dateCleanup.py [--number N]
+
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import WorkingDays.date_utilities as wd  # noqa: E402
+
+FORMATS = {
+    "YYYYMMDD": "20200205",
+    "YYYYMMDDhhmmss": "20200205110000",
+    "ISO date": "2020-02-05",
+    "ISO datetime": "2020-02-28 12:30:00",
+    "ISO T/Z": "2015-03-26T10:58:51Z",
+    "German": "07.04.2020",
+    "German with time": "07.04.2020 12:12:12",
+    "alpha (fallback)": "MAR 25 2020",
+}
+
+
+def run(number):
+    results = []
+    for name, value in FORMATS.items():
+        heuristic = min(
+            timeit.repeat(lambda: wd._heuristicParse(value), number=number, repeat=3)
+        )
+        fast = min(
+            timeit.repeat(lambda: wd.dateCleanup(value), number=number, repeat=3)
+        )
+        results.append((name, value, heuristic, fast))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args(argv)
+    row = "{:<18} {:<22} {:>12} {:>12} {:>8}"
+    print(row.format("format", "value", "heuristic", "dateCleanup", "speedup"))
+    for name, value, heuristic, fast in run(args.number):
+        print(
+            row.format(
+                name,
+                value,
+                "{:.2f}us".format(heuristic / args.number * 1e6),
+                "{:.2f}us".format(fast / args.number * 1e6),
+                "{:.1f}x".format(heuristic / fast),
+            )
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
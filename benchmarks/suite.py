@@ -0,0 +1,290 @@
+"""
+    Benchmark suite of the public "date_utilities" functions across offset
+    sizes, holiday-list sizes, "dateCleanup" input formats and bucket counts.
+
+    Every case is timed with "timeit" (best of --repeat runs, autoranged
+    loop count) and its peak allocation is measured with "tracemalloc"
+    over a single call. Results are written as JSON and compared with a
+    stored baseline; cases slower than --threshold times the baseline are
+    reported as regressions and the runner exits with status 1.
+
+USAGE:
+    python benchmarks/suite.py                              # print results
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --baseline benchmarks/baseline.json
+    python benchmarks/suite.py --save-baseline benchmarks/baseline.json
+    python benchmarks/suite.py --filter workday --repeat 3
+
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import WorkingDays.date_utilities as wd  # noqa: E402
+from WorkingDays._version import version  # noqa: E402
+
+OFFSETS = (1, 10, 100, 1000, 10000)
+HOLIDAY_SIZES = (0, 10, 100, 1000, 5000)
+BUCKET_COUNTS = (10, 100, 1000)
+EVENT_COUNTS = (1000, 100000)
+FORMATS = {
+    "YYYYMMDD": "20200205",
+    "YYYYMMDDhhmmss": "20200205110000",
+    "ISO_date": "2020-02-05",
+    "ISO_datetime": "2020-02-28 12:30:00",
+    "ISO_TZ": "2015-03-26T10:58:51Z",
+    "ISO_micro": "2020-04-07T12:12:12.000000",
+    "German": "07.04.2020",
+    "German_time": "07.04.2020 12:12:12",
+    "alpha": "MAR 25 2020",
+    "epoch_ms": 1586217600000,
+}
+START = "20200702"
+
+
+def makeHolidays(count):
+    """
+    FUNCTION: makeHolidays
+
+    DESCRIPTION:
+        Returns "count" distinct "%Y%m%d" holidays, every third weekday
+        from 1990-01-01 on, so large lists span the whole offset range.
+    """
+    holidays = []
+    day = date(1990, 1, 1)
+    while len(holidays) < count:
+        if day.weekday() < 5:
+            holidays.append(day.strftime("%Y%m%d"))
+            day += timedelta(days=3)
+        else:
+            day += timedelta(days=1)
+    return holidays
+
+
+def buildCases():
+    """
+    FUNCTION: buildCases
+
+    DESCRIPTION:
+        Returns [(name, group, params, callable)] of every benchmark case.
+    """
+    cases = []
+
+    def add(group, params, fn):
+        name = group + "[" + ",".join("{}={}".format(*i) for i in params.items()) + "]"
+        cases.append((name, group, params, fn))
+
+    for fmt, value in FORMATS.items():
+        epoch = fmt == "epoch_ms"
+        add(
+            "dateCleanup",
+            {"format": fmt},
+            lambda value=value, epoch=epoch: wd.dateCleanup(value, epoch=epoch),
+        )
+    holidayLists = {size: makeHolidays(size) for size in HOLIDAY_SIZES}
+    for size, holidays in holidayLists.items():
+        for offset in OFFSETS:
+            params = {"offset": offset, "holidays": size}
+            add(
+                "workday",
+                params,
+                lambda o=offset, h=holidays: wd.workday(START, o, holidays=h),
+            )
+            add(
+                "workdayStart",
+                params,
+                lambda o=offset, h=holidays: wd.workdayStart(START, o, holidays=h),
+            )
+        for days in (7, 365, 3650):
+            end = (datetime(2020, 7, 2) + timedelta(days=days)).strftime("%Y%m%d")
+            add(
+                "compareWorkingDays",
+                {"days": days, "holidays": size},
+                lambda e=end, h=holidays: wd.compareWorkingDays(START, e, holidays=h),
+            )
+        add(
+            "lastWorkdayOfMonth",
+            {"holidays": size},
+            lambda h=holidays: wd.lastWorkdayOfMonth(START, holidays=h),
+        )
+        add(
+            "lastWorkdayOfQtr",
+            {"holidays": size},
+            lambda h=holidays: wd.lastWorkdayOfQtr(START, holidays=h),
+        )
+    for offset in OFFSETS:
+        add(
+            "calendarDay", {"offset": offset}, lambda o=offset: wd.calendarDay(START, o)
+        )
+    add("lastDayOfMonth", {}, lambda: wd.lastDayOfMonth(START))
+    for count in BUCKET_COUNTS:
+        end = (datetime(2000, 1, 1) + timedelta(days=7 * count - 1)).strftime("%Y%m%d")
+        add(
+            "dateBucketing",
+            {"buckets": count},
+            lambda e=end: wd.dateBucketing("20000101", 6, e),
+        )
+        add(
+            "dateBucketing",
+            {"buckets": count, "workdays": True},
+            lambda e=end: wd.dateBucketing("20000101", 4, e, workdays=True),
+        )
+    for count in EVENT_COUNTS:
+        events = [
+            date(2000, 1, 1) + timedelta(days=(i * 7919) % 7300) for i in range(count)
+        ]
+        add(
+            "bucketize",
+            {"events": count},
+            lambda e=events: wd.bucketize(e, date(2000, 1, 1), 6),
+        )
+        records = [{"date": d.strftime("%Y%m%d")} for d in events[:10000]]
+        add(
+            "dateSort",
+            {"records": len(records)},
+            lambda r=records: sorted(r, key=wd.dateSort),
+        )
+    return cases
+
+
+def measure(fn, repeat):
+    """
+    FUNCTION: measure
+
+    DESCRIPTION:
+        Returns (seconds per call, loops per run, peak bytes of one call).
+    """
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return seconds, number, peak
+
+
+def run(pattern=None, repeat=5, progress=None):
+    """
+    FUNCTION: run
+
+    DESCRIPTION:
+        Runs every case whose name contains "pattern" and returns the JSON
+        document (dict with "meta" and "results").
+    """
+    wd.setSortValue("date")
+    results = {}
+    for name, group, params, fn in buildCases():
+        if pattern and pattern not in name:
+            continue
+        seconds, number, peak = measure(fn, repeat)
+        results[name] = {
+            "group": group,
+            "params": params,
+            "seconds": seconds,
+            "number": number,
+            "peak_bytes": peak,
+        }
+        if progress is not None:
+            progress(name, results[name])
+    return {
+        "meta": {
+            "version": version,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold=1.25):
+    """
+    FUNCTION: compare
+
+    DESCRIPTION:
+        Returns [(name, baseline seconds, seconds, ratio)] of the cases that
+        are more than "threshold" times slower than "baseline". Cases that
+        are missing from either side are ignored.
+    """
+    regressions = []
+    for name, result in results["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None or not previous["seconds"]:
+            continue
+        ratio = result["seconds"] / previous["seconds"]
+        if ratio > threshold:
+            regressions.append((name, previous["seconds"], result["seconds"], ratio))
+    return regressions
+
+
+def _printResult(name, result):
+    print(
+        "{:<60} {:>12} {:>12}".format(
+            name,
+            "{:.3f}us".format(result["seconds"] * 1e6),
+            "{:,}B".format(result["peak_bytes"]),
+        )
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the WorkingDays date_utilities functions."
+    )
+    parser.add_argument("--filter", help="only cases whose name contains FILTER")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the JSON results to OUTPUT")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--save-baseline", help="write the results as new baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="flag cases slower than THRESHOLD x baseline (default 1.25)",
+    )
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    results = run(args.filter, args.repeat, None if args.quiet else _printResult)
+    if not args.quiet:
+        print(
+            "{} cases in {:.1f}s".format(
+                len(results["results"]), time.perf_counter() - started
+            )
+        )
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after, ratio in regressions:
+            print(
+                "REGRESSION {}: {:.3f}us -> {:.3f}us ({:.2f}x)".format(
+                    name, before * 1e6, after * 1e6, ratio
+                )
+            )
+        if regressions:
+            return 1
+        print("no regressions against {} ({}x)".format(args.baseline, args.threshold))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -27,5 +27,11 @@ setuptools.setup(
     license="GNU General Public License v3.0",
     packages=setuptools.find_packages(),
     install_requires=[],
+    extras_require={
+        "numpy": ["numpy"],
+        "pandas": ["numpy", "pandas"],
+        "arrow": ["numpy", "pyarrow"],
+    },
+    entry_points={"console_scripts": ["workingdays=WorkingDays.cli:main"]},
     include_package_data=True,
     zip_safe=False)